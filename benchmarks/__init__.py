@@ -0,0 +1 @@
+"""Benchmarks of the Whist-Server. Run them with 'python -m benchmarks.<name>'."""
@@ -0,0 +1,59 @@
+"""
+Compares the size of room documents and the time of their BSON round trip with cards stored as
+dictionaries and with cards stored as codes and masks while playing a complete rubber.
+"""
+import time
+from typing import Any
+
+import bson
+
+from benchmarks.rubber import create_room, play_rubber
+from benchmarks.save_payload import _with_str_keys
+from whist_server.database.card_codec import decode_cards, encode_cards
+
+
+def _timed(function, *args) -> tuple[Any, float]:
+    """
+    Calls a function and measures the seconds it takes.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _bson_round_trip(document: dict) -> dict:
+    return bson.decode(bson.encode(document))
+
+
+def main():
+    """
+    Encodes the room after every move of a rubber and prints the sizes and times.
+    """
+    states = 0
+    plain_bytes, encoded_bytes = 0, 0
+    plain_seconds, encoded_seconds, codec_seconds = 0.0, 0.0, 0.0
+    last_plain, last_encoded = 0, 0
+    for room in play_rubber(create_room()):
+        document = _with_str_keys(room.dict())
+        encoded, encode_seconds = _timed(encode_cards, document)
+        last_plain = len(bson.encode(document))
+        last_encoded = len(bson.encode(encoded))
+        plain_bytes += last_plain
+        encoded_bytes += last_encoded
+        plain_seconds += _timed(_bson_round_trip, document)[1]
+        loaded, seconds = _timed(_bson_round_trip, encoded)
+        encoded_seconds += seconds
+        codec_seconds += encode_seconds + _timed(decode_cards, loaded)[1]
+        states += 1
+
+    print(f'room states: {states}')
+    print(f'card dicts: {plain_bytes // states:>8,} bytes average, last {last_plain:,}, '
+          f'{plain_seconds / states * 1e6:>6.0f} us per BSON round trip')
+    print(f'card codes: {encoded_bytes // states:>8,} bytes average, last {last_encoded:,}, '
+          f'{encoded_seconds / states * 1e6:>6.0f} us per BSON round trip, '
+          f'{codec_seconds / states * 1e6:>6.0f} us to encode and decode the cards')
+    print(f'size ratio: {plain_bytes / encoded_bytes:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Compares how long the healthy clients of a room wait for an event, and how long notifying the
+room takes, while thousands of rooms have clients. The former side channels shared their clients
+between all rooms and sent to one after another, or sent to the clients of a room concurrently
+and waited for all of them. The current side channel queues the event for every client.
+It also compares the CPU time spent encoding an event for one notification when it is encoded
+for every client and when it is encoded once and the same frame is sent to every client.
+"""
+import asyncio
+import time
+import timeit
+
+from whist_core.cards.card import Card, Rank, Suit
+from whist_core.user.player import Player
+
+from whist_server.web_socket.events.event import CardPlayedEvent, Event, PlayerJoinedEvent
+from whist_server.web_socket.side_channel import SideChannel
+from whist_server.web_socket.subscriber import Subscriber
+
+ROOMS = 2000
+CLIENTS_PER_ROOM = 4
+NOTIFICATIONS = 20
+SLOW_CLIENT_DELAY = 0.05
+ENCODING_SUBSCRIBERS = (1, 4, 16, 64)
+ENCODING_REPETITIONS = 2000
+
+
+class _Connection:
+    """
+    Websocket of a client that takes a while to receive a message.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received_at = 0.0
+
+    async def send_text(self, _: str) -> None:
+        """
+        Receives a message.
+        """
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
+        self.received_at = time.perf_counter()
+
+
+class _SharedSequentialChannel:
+    """
+    The former side channel: every instance shares one list of clients and sends in turn.
+    """
+    subscriber = []
+
+    def attach(self, subscriber: Subscriber) -> None:
+        """
+        Adds a client to all channels.
+        """
+        self.subscriber.append(subscriber)
+
+    async def notify(self, event: Event) -> None:
+        """
+        Sends an event to every client of every room one after another.
+        """
+        for subscriber in self.subscriber:
+            await subscriber.send(event)
+
+
+class _ConcurrentChannel(SideChannel):
+    """
+    The former per-room side channel: it sends to all clients concurrently and waits for them.
+    """
+
+    async def notify(self, event: Event) -> None:
+        """
+        Sends an event to every client of the room concurrently.
+        """
+        frame = event.encode().decode()
+        await asyncio.gather(*[subscriber.send_frame(frame) for subscriber in self._subscribers])
+
+
+async def _latency(channel_type, slow_client: bool) -> tuple[float, float]:
+    """
+    Creates the rooms and measures the average time until the healthy clients of a room have
+    received an event and until the notification returns in milliseconds.
+    """
+    channels = []
+    for room in range(ROOMS):
+        channel = channel_type()
+        connections = [_Connection() for _ in range(CLIENTS_PER_ROOM)]
+        if slow_client and room == ROOMS // 2:
+            connections[0].delay = SLOW_CLIENT_DELAY
+        subscribers = [Subscriber(connection) for connection in connections]
+        for subscriber in subscribers:
+            channel.attach(subscriber)
+        channels.append((channel, [subscriber for subscriber, connection
+                                   in zip(subscribers, connections) if connection.delay == 0],
+                         [connection for connection in connections if connection.delay == 0]))
+    event = PlayerJoinedEvent(player=Player(username='player', rating=1200))
+    channel, healthy_subscribers, healthy = channels[ROOMS // 2]
+    # Lets the writers of all clients start before measuring.
+    await asyncio.sleep(0)
+    received, notified = 0.0, 0.0
+    for _ in range(NOTIFICATIONS):
+        start = time.perf_counter()
+        await channel.notify(event)
+        notified += time.perf_counter() - start
+        for subscriber in healthy_subscribers:
+            await subscriber.flush()
+        received += max(connection.received_at for connection in healthy) - start
+    _SharedSequentialChannel.subscriber = []
+    return received / NOTIFICATIONS * 1e3, notified / NOTIFICATIONS * 1e3
+
+
+def _encoding_time(subscribers: int) -> tuple[float, float]:
+    """
+    Measures the CPU time spent encoding a played card for one notification in microseconds,
+    encoding it for every client like 'Subscriber.send' and once like 'SideChannel.notify'.
+    """
+    event = CardPlayedEvent(card=Card(suit=Suit.HEARTS, rank=Rank.Q),
+                            player=Player(username='player', rating=1200))
+
+    def per_client():
+        for _ in range(subscribers):
+            event.encode().decode()
+
+    def once():
+        frame = event.encode().decode()
+        for _ in range(subscribers):
+            _ = frame
+
+    seconds = [timeit.timeit(function, number=ENCODING_REPETITIONS) for function in
+               (per_client, once)]
+    return seconds[0] / ENCODING_REPETITIONS * 1e6, seconds[1] / ENCODING_REPETITIONS * 1e6
+
+
+def main():
+    """
+    Prints the latencies of notifying a room with healthy clients and with one slow client and
+    the encoding time of one notification with encoding per client and encoding once.
+    """
+    print(f'{ROOMS} rooms with {CLIENTS_PER_ROOM} clients each, times in ms')
+    print(f'{"room":<16}{"channel":<22}{"received":>10}{"notified":>10}')
+    for slow_client in (False, True):
+        label = 'one slow client' if slow_client else 'healthy clients'
+        for name, channel_type in (('shared sequential', _SharedSequentialChannel),
+                                   ('per room concurrent', _ConcurrentChannel),
+                                   ('per client queues', SideChannel)):
+            received, notified = asyncio.run(_latency(channel_type, slow_client))
+            print(f'{label:<16}{name:<22}{received:>10.2f}{notified:>10.2f}')
+    print()
+    print(f'{"clients":<10}{"encode per client":>20}{"encode once":>14}  (us per notification)')
+    for subscribers in ENCODING_SUBSCRIBERS:
+        per_client, once = _encoding_time(subscribers)
+        print(f'{subscribers:<10}{per_client:>20.1f}{once:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares the time to get a room from the room service when it is resident in the room cache and
+when it has to be loaded from the database, while playing a complete rubber. A cached room
+costs a query of its version instead of transferring the whole room. Run it against a mongodb,
+the memory backend decodes the whole document even for the version. The rubber is played until
+the first hand has been scored:
+python -m benchmarks.room_cache
+"""
+import asyncio
+import time
+
+import bson.errors
+
+from benchmarks.rubber import create_room, play_rubber
+from whist_server.services.room_db_service import RoomDatabaseService
+
+REPETITIONS = 20
+SAMPLE_EVERY = 10
+
+
+async def _time_get(service: RoomDatabaseService, room_id: str, resident: bool) -> float:
+    """
+    Average time of 'get' in milliseconds.
+    """
+    elapsed = 0.0
+    for _ in range(REPETITIONS):
+        if not resident:
+            service._cache.invalidate(room_id)  # pylint: disable=protected-access
+        start = time.perf_counter()
+        _ = await service.get(room_id)
+        elapsed += time.perf_counter() - start
+    return elapsed / REPETITIONS * 1e3
+
+
+async def _main():
+    service = RoomDatabaseService()
+    room = create_room()
+    room.id = None
+    room_id = await service.add(room)
+    for move, played in enumerate(play_rubber(await service.get(room_id))):
+        try:
+            await service.save(played)
+        except bson.errors.InvalidDocument:
+            # Whist-Core keys the hand scores by team objects, which BSON cannot encode.
+            return
+        if move % SAMPLE_EVERY:
+            continue
+        loaded = await _time_get(service, room_id, resident=False)
+        cached = await _time_get(service, room_id, resident=True)
+        print(f'move {move:>5}: loaded {loaded:>8.2f} ms, cached {cached:>8.2f} ms, '
+              f'{loaded / cached:.1f}x')
+
+
+def main():
+    """
+    Saves the room after every move and prints the get times at a few points of the rubber.
+    """
+    asyncio.run(_main())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compares the time to load a room from its database document with full validation and with the
+load path of the room service, trusted construction without serializing the room again, while
+playing a complete rubber.
+"""
+import datetime
+import timeit
+
+from benchmarks.rubber import create_room, play_rubber
+from whist_server.database.card_codec import decode_cards
+from whist_server.database.room import RoomInDb
+from whist_server.services.room_db_service import RoomDatabaseService
+
+REPETITIONS = 20
+SAMPLES = 5
+
+
+def _without_scores(document: dict) -> dict:
+    """
+    Whist-Core cannot validate the scores it has written, so they are left out of the rooms.
+    """
+    for rubber in document['table']['rubbers']:
+        for game in rubber['games']:
+            game['score_card'] = {'hands': []}
+    return document
+
+
+def _stored(room: RoomInDb) -> dict:
+    """
+    The document of the room as the room service stores it.
+    """
+    # pylint: disable=protected-access
+    document = RoomDatabaseService._document(room, exclude={'id'})
+    document['_id'] = room.id
+    document[RoomDatabaseService._ACTIVITY] = datetime.datetime.utcnow()
+    return document
+
+
+def main():
+    """
+    Loads the room at a few points of a rubber and prints the load times.
+    """
+    rooms = [_without_scores(room.dict()) for room in play_rubber(create_room())]
+    step = max(1, (len(rooms) - 1) // (SAMPLES - 1))
+    for move in range(0, len(rooms), step):
+        document = _stored(RoomInDb(**rooms[move]))
+        validated = timeit.timeit(lambda: RoomInDb(**decode_cards(document)),
+                                  number=REPETITIONS) / REPETITIONS * 1e3
+        trusted = timeit.timeit(lambda: RoomDatabaseService._load(document),
+                                number=REPETITIONS) / REPETITIONS * 1e3
+        print(f'move {move:>5}: validated {validated:>8.2f} ms, trusted {trusted:>8.2f} ms, '
+              f'{validated / trusted:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
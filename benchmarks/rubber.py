@@ -0,0 +1,55 @@
+"""Plays a complete rubber to feed benchmarks with realistic rooms."""
+from typing import Iterator
+
+from bson import ObjectId
+from whist_core.game.legal_checker import LegalChecker
+from whist_core.session.matcher import RoundRobinMatcher
+from whist_core.user.player import Player
+
+from whist_server.database.room import RoomInDb
+from whist_server.services.room_db_service import RoomDatabaseService
+
+TRICKS_PER_HAND = 13
+
+
+def create_room() -> RoomInDb:
+    """
+    Creates a room with four ready players.
+    """
+    players = [Player(username=f'player_{number}', rating=1200) for number in range(4)]
+    room = RoomDatabaseService.create_with_pwd(room_name='benchmark', creator=players[0])
+    room.id = ObjectId()
+    for player in players[1:]:
+        room.join(player)
+    for player in players:
+        room.ready_player(player)
+    return room
+
+
+def play_rubber(room: RoomInDb) -> Iterator[RoomInDb]:
+    """
+    Starts the room and plays legal cards until the rubber is done.
+    :param room: with four ready players
+    :return: Yields the room after the start and after every move.
+    """
+    room.start(room.creator, RoundRobinMatcher)
+    room.next_hand()
+    yield room
+    rubber = room.current_rubber
+    while True:
+        game = rubber.current_game()
+        trick = room.current_trick()
+        if not trick.done:
+            player = game.get_player(trick.play_order[len(trick.stack)].player)
+            card = next(card for card in player.hand
+                        if LegalChecker.check_legal(player.hand, card, trick.stack.first))
+            trick.play_card(player, card)
+        elif len(game.current_hand.tricks) < TRICKS_PER_HAND:
+            room.next_trick()
+        else:
+            room.next_hand()
+            if game.done:
+                if rubber.done:
+                    return
+                rubber.next_game().next_hand()
+        yield room
@@ -0,0 +1,54 @@
+"""
+Compares the bytes sent to the database for full document saves and partial (delta) saves while
+playing a complete rubber.
+"""
+from typing import Any
+
+import bson
+
+from benchmarks.rubber import create_room, play_rubber
+from whist_server.database.diff import diff_document
+
+
+def _with_str_keys(value: Any) -> Any:
+    """
+    Whist-Core keys the hand scores by team objects, which BSON cannot encode.
+    """
+    if isinstance(value, dict):
+        return {str(key): _with_str_keys(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_with_str_keys(item) for item in value]
+    return value
+
+
+def main():
+    """
+    Saves the room after every move of a rubber and prints the payload sizes.
+    """
+    room = create_room()
+    persisted = _with_str_keys(room.dict())
+    saves = 0
+    full_bytes = 0
+    delta_bytes = 0
+    first_full, last_full, first_delta, last_delta = 0, 0, 0, 0
+    for room in play_rubber(room):
+        document = _with_str_keys(room.dict())
+        last_full = len(bson.encode({'$set': document}))
+        last_delta = len(bson.encode(diff_document(persisted, document)))
+        if saves == 0:
+            first_full, first_delta = last_full, last_delta
+        full_bytes += last_full
+        delta_bytes += last_delta
+        saves += 1
+        persisted = document
+
+    print(f'saves: {saves}')
+    print(f'full saves:  {full_bytes:>12,} bytes total, {full_bytes // saves:>8,} bytes average, '
+          f'first {first_full:,}, last {last_full:,}')
+    print(f'delta saves: {delta_bytes:>12,} bytes total, {delta_bytes // saves:>8,} bytes average, '
+          f'first {first_delta:,}, last {last_delta:,}')
+    print(f'ratio: {full_bytes / delta_bytes:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
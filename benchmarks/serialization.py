@@ -0,0 +1,68 @@
+"""
+Compares the time to serialize large responses and websocket events with the standard JSON
+encoder and with orjson. Responses are serialized the way FastAPI serializes returned values, with
+the JSON and the orjson response class, and the way 'model_response' does.
+"""
+import json
+import timeit
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from whist_core.cards.card import Card
+from whist_core.cards.card_container import UnorderedCardContainer
+from whist_core.user.player import Player
+
+from whist_server.api.util import model_response
+from whist_server.web_socket.events.event import CardPlayedEvent, Event
+
+REPETITIONS = 200
+SUBSCRIBERS = 4
+
+
+def _microseconds(function: Callable[[], Any]) -> float:
+    return timeit.timeit(function, number=REPETITIONS) / REPETITIONS * 1e6
+
+
+def _response(name: str, payload: Any) -> None:
+    """
+    Serializes a response before and after switching to orjson.
+    """
+    standard = _microseconds(lambda: JSONResponse(jsonable_encoder(payload)))
+    fast = _microseconds(lambda: ORJSONResponse(jsonable_encoder(payload)))
+    direct = _microseconds(lambda: model_response(payload))
+    print(f'{name:<20} json {standard:>8.1f} us, orjson {fast:>8.1f} us, '
+          f'model_response {direct:>8.1f} us')
+
+
+def _fanout(event: Event) -> None:
+    """
+    Encodes an event for every subscriber of a room like 'send_json' did and like
+    'Subscriber.send' does.
+    """
+    def standard():
+        for _ in range(SUBSCRIBERS):
+            json.dumps({'name': event.name, 'event': event.dict()})
+
+    def fast():
+        for _ in range(SUBSCRIBERS):
+            event.encode().decode()
+
+    print(f'{event.name + " x" + str(SUBSCRIBERS):<20} json {_microseconds(standard):>8.1f} us, '
+          f'orjson {_microseconds(fast):>8.1f} us')
+
+
+def main():
+    """
+    Prints the serialization times of the trick hand, the leaderboard and an event fanout.
+    """
+    hand = UnorderedCardContainer.with_cards(*list(Card.all_cards())[:13])
+    players = [Player(username=f'player_{number}', rating=1200 + number)
+               for number in range(1000)]
+    _response('/room/trick/hand', hand)
+    _response('/leaderboard/', players)
+    _fanout(CardPlayedEvent(card=hand.cards[0], player=players[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,7 +15,7 @@ class GithubAuthTestCase(TestCase):
         self.gh_service = AsyncMock(get_github_username=AsyncMock(return_value='test'),
                                     get_github_id=AsyncMock(return_value='123'))
         user_mock = MagicMock(username='test')
-        self.user_service = AsyncMock(get_from_github=MagicMock(return_value=user_mock))
+        self.user_service = AsyncMock(get_from_github=AsyncMock(return_value=user_mock))
         app.dependency_overrides[GitHubAPIService] = lambda: self.gh_service
         app.dependency_overrides[UserDatabaseService] = lambda: self.user_service
         self.client = TestClient(app)
@@ -38,7 +38,7 @@ class GithubAuthTestCase(TestCase):
         self.assertEqual(expected_token, token)
 
     def test_device_swap_create_user(self):
-        self.user_service.get_from_github = MagicMock(side_effect=UserNotFoundError)
+        self.user_service.get_from_github = AsyncMock(side_effect=UserNotFoundError)
         expected_token = AccessToken(access_token='abc', token_type='Bearer')
         with patch('whist_server.services.authentication.create_access_token',
                    MagicMock(return_value=expected_token.access_token)):
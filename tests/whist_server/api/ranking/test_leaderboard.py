@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from fastapi import status
 from starlette.testclient import TestClient
@@ -29,14 +29,14 @@ class LeaderboardTestCase(TestCaseWithToken):
 
     def test_login_required(self):
         self.app.dependency_overrides = {}
-        self.ranking_service_mock.select = MagicMock(return_value=self.users_desc)
+        self.ranking_service_mock.select = AsyncMock(return_value=self.users_desc)
         user_service = MagicMock(get=MagicMock(side_effect=UserNotFoundError))
         self.app.dependency_overrides[UserDatabaseService] = lambda: user_service
         response = self.client.get(url='/leaderboard/?order=descending&start=0&amount=0')
         self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
 
     def test_correct_des_order(self):
-        self.ranking_service_mock.select = MagicMock(return_value=self.users_desc)
+        self.ranking_service_mock.select = AsyncMock(return_value=self.users_desc)
         response = self.client.get(url='/leaderboard/?order=descending&start=0&amount=0')
         players = [Player(**player) for player in response.json()]
         self.assertEqual(response.status_code, 200, msg=response.content)
@@ -44,7 +44,7 @@ class LeaderboardTestCase(TestCaseWithToken):
         self.assertEqual(self.users_desc, players)
 
     def test_correct_des_order_no_param(self):
-        self.ranking_service_mock.select = MagicMock(return_value=self.users_desc)
+        self.ranking_service_mock.select = AsyncMock(return_value=self.users_desc)
         response = self.client.get(url='/leaderboard/?order=descending')
         players = [Player(**player) for player in response.json()]
         self.assertEqual(response.status_code, 200, msg=response.content)
@@ -52,7 +52,7 @@ class LeaderboardTestCase(TestCaseWithToken):
         self.assertEqual(self.users_desc, players)
 
     def test_correct_asc_order(self):
-        self.ranking_service_mock.select = MagicMock(return_value=self.users_asc)
+        self.ranking_service_mock.select = AsyncMock(return_value=self.users_asc)
         response = self.client.get(url='/leaderboard/?order=ascending&start=0&amount=0',
                                    headers=self.headers)
         players = [Player(**player) for player in response.json()]
@@ -61,7 +61,7 @@ class LeaderboardTestCase(TestCaseWithToken):
         self.assertEqual(self.users_asc, players)
 
     def test_correct_asc_order_limited(self):
-        self.ranking_service_mock.select = MagicMock(return_value=[self.user.to_player()])
+        self.ranking_service_mock.select = AsyncMock(return_value=[self.user.to_player()])
         response = self.client.get(url='/leaderboard/?order=ascending&start=0&amount=1',
                                    headers=self.headers)
         players = [Player(**player) for player in response.json()]
@@ -70,7 +70,7 @@ class LeaderboardTestCase(TestCaseWithToken):
         self.assertEqual([self.user.to_player()], players)
 
     def test_correct_asc_order_index(self):
-        self.ranking_service_mock.select = MagicMock(return_value=[self.second_user.to_player()])
+        self.ranking_service_mock.select = AsyncMock(return_value=[self.second_user.to_player()])
         response = self.client.get(url='/leaderboard/?order=ascending&start=1&amount=0',
                                    headers=self.headers)
         players = [Player(**player) for player in response.json()]
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from tests.whist_server.base_token_case import TestCaseWithToken
 from whist_server.database.room import RoomInDb
@@ -11,7 +11,7 @@ class CreateGameTestCase(TestCaseWithToken):
         self.prefix = 'room'
         self.game_in_db_mock = MagicMock(create_with_pwd=MagicMock())
         self.app.dependency_overrides[RoomInDb] = lambda: self.game_in_db_mock
-        self.room_service_mock.add = MagicMock(return_value=1)
+        self.room_service_mock.add = AsyncMock(return_value=1)
         self.app.dependency_overrides[PasswordService] = lambda: MagicMock(
             hash=MagicMock(return_value='abc'))
 
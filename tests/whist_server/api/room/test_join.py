@@ -1,14 +1,20 @@
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from starlette.testclient import TestClient
+from whist_core.error.table_error import TableFullError
+from whist_core.user.player import Player
 
 from tests.whist_server.api.room.base_created_case import BaseCreateGameTestCase
+from tests.whist_server.drop_collections import drop_collections
 from whist_server import app
-from whist_server.database import db
+from whist_server.database.command import JoinCommand
 from whist_server.database.error import PlayerNotJoinedError
 from whist_server.database.warning import PlayerAlreadyJoinedWarning
+from whist_server.services.channel_service import ChannelService
+from whist_server.services.room_actor_service import RoomActorService
+from whist_server.services.room_db_service import RoomDatabaseService
 
 
 class JoinGameTestCase(BaseCreateGameTestCase):
@@ -65,6 +71,38 @@ class JoinGameTestCase(BaseCreateGameTestCase):
         self.room_mock.leave.assert_called_once()
         self.assertEqual(403, response.status_code, msg=response.content)
 
+    def test_quick_join(self):
+        self.room_service_mock.find_open = AsyncMock(return_value='1')
+        response = self.client.post(url='/room/quick_join', headers=self.headers)
+        self.assertEqual(200, response.status_code, msg=response.content)
+        self.assertEqual({'status': 'joined', 'room_id': '1'}, response.json())
+        self.room_mock.join.assert_called_once()
+
+    def test_quick_join_full_room(self):
+        self.room_service_mock.find_open = AsyncMock(side_effect=['1', '2'])
+        self.room_mock.join = MagicMock(side_effect=[TableFullError, True])
+        response = self.client.post(url='/room/quick_join', headers=self.headers)
+        self.assertEqual({'status': 'joined', 'room_id': '2'}, response.json())
+        self.room_service_mock.find_open.assert_awaited_with(exclude=['1'], player=ANY)
+
+    def test_quick_join_already_joined_room(self):
+        self.room_service_mock.find_open = AsyncMock(side_effect=['1', '2'])
+        self.room_mock.join = MagicMock(side_effect=[PlayerAlreadyJoinedWarning, True])
+        response = self.client.post(url='/room/quick_join', headers=self.headers)
+        self.assertEqual({'status': 'joined', 'room_id': '2'}, response.json())
+
+    def test_quick_join_all_rooms_full(self):
+        self.room_service_mock.find_open = AsyncMock(side_effect=['1', '2', '3'])
+        self.room_mock.join = MagicMock(side_effect=TableFullError)
+        response = self.client.post(url='/room/quick_join', headers=self.headers)
+        self.assertEqual(404, response.status_code, msg=response.content)
+        self.assertEqual(3, self.room_mock.join.call_count)
+
+    def test_quick_join_no_room(self):
+        self.room_service_mock.find_open = AsyncMock(return_value=None)
+        response = self.client.post(url='/room/quick_join', headers=self.headers)
+        self.assertEqual(404, response.status_code, msg=response.content)
+
 
 class IntegrationTestJoinGame(TestCase):
     def create_and_auth_user(self, user: str, password):
@@ -75,12 +113,10 @@ class IntegrationTestJoinGame(TestCase):
 
     def setUp(self) -> None:
         self.client = TestClient(app)
-        db.user.drop()
-        db.room.drop()
+        drop_collections('user', 'room')
 
     def tearDown(self) -> None:
-        db.user.drop()
-        db.room.drop()
+        drop_collections('user', 'room')
 
     @pytest.mark.integtest
     def test_join_no_pwd(self):
@@ -93,3 +129,46 @@ class IntegrationTestJoinGame(TestCase):
                                     headers=headers_joiner, json={})
         self.assertEqual(200, response.status_code, msg=response.content)
         self.assertEqual('joined', response.json()['status'])
+
+    @pytest.mark.integtest
+    def test_quick_join(self):
+        headers_creator = self.create_and_auth_user('miles', 'abc')
+        headers_joiner = self.create_and_auth_user('marcel', 'abc')
+        response = self.client.post(url='/room/create', json={'room_name': 'test'},
+                                    headers=headers_creator)
+        room_id = response.json()['room_id']
+        response = self.client.post(url='/room/quick_join', headers=headers_joiner)
+        self.assertEqual(200, response.status_code, msg=response.content)
+        self.assertEqual({'status': 'joined', 'room_id': room_id}, response.json())
+
+    @pytest.mark.integtest
+    def test_quick_join_skips_joined_room(self):
+        headers_creator = self.create_and_auth_user('miles', 'abc')
+        self.client.post(url='/room/create', json={'room_name': 'test'}, headers=headers_creator)
+        response = self.client.post(url='/room/quick_join', headers=headers_creator)
+        self.assertEqual(404, response.status_code, msg=response.content)
+
+    @pytest.mark.integtest
+    def test_quick_join_room_filled_meanwhile(self):
+        headers_creator = self.create_and_auth_user('miles', 'abc')
+        headers_joiner = self.create_and_auth_user('marcel', 'abc')
+        response = self.client.post(url='/room/create', json={'room_name': 'test',
+                                                              'max_player': 2},
+                                    headers=headers_creator)
+        room_id = response.json()['room_id']
+        find_open = RoomDatabaseService.find_open
+
+        async def find_and_fill(**kwargs):
+            found = await find_open(**kwargs)
+            if found is not None:
+                racer = JoinCommand(player=Player(username='racer', rating=1200))
+                await RoomActorService().submit(found, racer, RoomDatabaseService(),
+                                                ChannelService())
+            return found
+
+        with patch.object(RoomDatabaseService, 'find_open', side_effect=find_and_fill):
+            response = self.client.post(url='/room/quick_join', headers=headers_joiner)
+        self.assertEqual(404, response.status_code, msg=response.content)
+        players = self.client.get(url=f'/room/info/{room_id}', headers=headers_creator)
+        self.assertEqual(['miles', 'racer'],
+                         [player['username'] for player in players.json()['players']])
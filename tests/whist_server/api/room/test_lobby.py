@@ -0,0 +1,42 @@
+from unittest.mock import AsyncMock
+
+from tests.whist_server.api.room.base_created_case import BaseCreateGameTestCase
+from whist_server.database.room import LobbyFilter, LobbyRoom
+from whist_server.services.error import RoomNotFoundError
+
+
+class LobbyTestCase(BaseCreateGameTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.lobby_room = LobbyRoom(id='1', name='test', password=False, rubber_number=0,
+                                    game_number=0, hand_number=0, trick_number=0, min_player=4,
+                                    max_player=4, players=[])
+
+    def test_lobby(self):
+        self.room_service_mock.lobby = AsyncMock(return_value=[self.lobby_room])
+        response = self.client.get('/room/lobby?open_seats=true&no_password=true&max_player=4')
+        self.assertEqual(200, response.status_code, msg=response.content)
+        self.assertEqual(['1'], [room['id'] for room in response.json()['rooms']])
+        self.assertIsNone(response.json()['next'])
+        self.room_service_mock.lobby.assert_awaited_once_with(
+            LobbyFilter(open_seats=True, no_password=True, max_player=4), after=None, limit=20)
+
+    def test_lobby_next_page(self):
+        self.room_service_mock.lobby = AsyncMock(return_value=[self.lobby_room])
+        response = self.client.get('/room/lobby?after=0&limit=1')
+        self.assertEqual('1', response.json()['next'])
+        self.room_service_mock.lobby.assert_awaited_once_with(LobbyFilter(), after='0', limit=1)
+
+    def test_lobby_invalid_after(self):
+        self.room_service_mock.lobby = AsyncMock(side_effect=RoomNotFoundError('0'))
+        response = self.client.get('/room/lobby?after=0')
+        self.assertEqual(400, response.status_code, msg=response.content)
+
+    def test_lobby_limit(self):
+        response = self.client.get('/room/lobby?limit=101')
+        self.assertEqual(422, response.status_code, msg=response.content)
+
+    def test_lobby_require_login(self):
+        self.app.dependency_overrides = {}
+        response = self.client.get('/room/lobby')
+        self.assertEqual(401, response.status_code, msg=response.content)
@@ -0,0 +1,22 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from whist_server import app
+from whist_server.services.metrics_service import MetricsService
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.metrics_service = MetricsService()
+        self.metrics_service.reset()
+
+    def tearDown(self) -> None:
+        self.metrics_service.reset()
+
+    def test_read_metrics(self):
+        self.metrics_service.increment('room_saves')
+        response = self.client.get('/metrics')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'room_saves': 1}, response.json()['counters'])
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from whist_server.services.error import UserExistsError
 
@@ -41,7 +41,7 @@ class UserTestCase(TestCaseWithToken):
         Tests the user can be created only once.
         """
         data = {'username': 'test', 'password': 'abc'}
-        self.user_service_mock.add = MagicMock(side_effect=UserExistsError())
+        self.user_service_mock.add = AsyncMock(side_effect=UserExistsError())
         response = self.client.post(url='/user/create', json=data)
         self.assertEqual(response.status_code, 400, msg=response.content)
         self.user_service_mock.add.assert_called_once()
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from whist_core.cards.card import Card, Rank, Suit
+from whist_core.cards.card_container import OrderedCardContainer, UnorderedCardContainer
+
+from whist_server.database.card_codec import decode_card, decode_cards, encode_card, \
+    encode_cards
+
+
+class CardCodecTestCase(TestCase):
+    def test_card(self):
+        for card in Card.all_cards():
+            self.assertEqual(card.dict(), decode_card(encode_card(card.dict())))
+        self.assertEqual(0, encode_card(Card(suit=Suit.CLUBS, rank=Rank.NUM_2).dict()))
+        self.assertEqual(51, encode_card(Card(suit=Suit.SPADES, rank=Rank.A).dict()))
+
+    def test_hand_as_mask(self):
+        hand = UnorderedCardContainer.with_cards(Card(suit=Suit.CLUBS, rank=Rank.NUM_2),
+                                                 Card(suit=Suit.CLUBS, rank=Rank.NUM_4))
+        document = {'hand': hand.dict()}
+        self.assertEqual({'hand': {'cards': 0b101}}, encode_cards(document))
+        decoded = decode_cards(encode_cards(document))
+        self.assertEqual(hand, UnorderedCardContainer(**decoded['hand']))
+
+    def test_stack_as_codes(self):
+        stack = OrderedCardContainer.with_cards(Card(suit=Suit.SPADES, rank=Rank.A),
+                                                Card(suit=Suit.CLUBS, rank=Rank.NUM_2))
+        document = {'stacks': [stack.dict()]}
+        self.assertEqual({'stacks': [{'cards': [51, 0]}]}, encode_cards(document))
+        decoded = decode_cards(encode_cards(document))
+        self.assertEqual(stack, OrderedCardContainer(**decoded['stacks'][0]))
+
+    def test_empty_container(self):
+        document = {'stack': OrderedCardContainer.empty().dict()}
+        self.assertEqual({'stack': {'cards': []}}, decode_cards(encode_cards(document)))
+
+    def test_decode_unencoded(self):
+        document = {'hand': UnorderedCardContainer.full().dict(), 'rating': 1200}
+        self.assertEqual(document, decode_cards(document))
@@ -0,0 +1,85 @@
+from whist_core.error.table_error import PlayerNotJoinedError
+from whist_core.user.player import Player
+
+from tests.whist_server.base_player_test_case import BasePlayerTestCase
+from whist_server.database.command import JoinCommand, LeaveCommand, NextHandCommand, \
+    PlayCardCommand, ReadyCommand, RoomCommand, StartCommand, UnreadyCommand
+from whist_server.database.room import RoomInDb
+from whist_server.web_socket.events.event import CardPlayedEvent, HandDealtEvent, \
+    PlayerJoinedEvent, PlayerLeftEvent, RoomStartedEvent
+
+
+class RoomCommandTestCase(BasePlayerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.room = RoomInDb(**RoomInDb.create('test', self.player, 2, 2).dict())
+        self.second_player = Player(username='2', rating=1200)
+
+    def start(self):
+        JoinCommand(player=self.second_player).apply(self.room)
+        ReadyCommand(player=self.player).apply(self.room)
+        ReadyCommand(player=self.second_player).apply(self.room)
+        StartCommand(player=self.player, matcher_type='robin').apply(self.room)
+
+    def test_join(self):
+        command = JoinCommand(player=self.second_player)
+        self.assertTrue(command.apply(self.room))
+        self.assertIn(self.second_player, self.room.players)
+        self.assertEqual([PlayerJoinedEvent(sequence=1, player=self.second_player)],
+                         command.events)
+        self.assertEqual([(1, command)], self.room.pending_log)
+
+    def test_leave(self):
+        JoinCommand(player=self.second_player).apply(self.room)
+        command = LeaveCommand(player=self.second_player)
+        self.assertTrue(command.apply(self.room))
+        self.assertNotIn(self.second_player, self.room.players)
+        self.assertEqual([PlayerLeftEvent(sequence=2, player=self.second_player)],
+                         command.events)
+
+    def test_ready_not_joined(self):
+        command = ReadyCommand(player=self.second_player)
+        with self.assertRaises(PlayerNotJoinedError):
+            command.apply(self.room)
+        self.assertEqual([], command.events)
+        self.assertEqual(0, self.room.log_sequence)
+        self.assertEqual(0, self.room.event_sequence)
+
+    def test_unready(self):
+        ReadyCommand(player=self.player).apply(self.room)
+        UnreadyCommand(player=self.player).apply(self.room)
+        self.assertFalse(self.room.table.ready)
+
+    def test_start(self):
+        JoinCommand(player=self.second_player).apply(self.room)
+        ReadyCommand(player=self.player).apply(self.room)
+        ReadyCommand(player=self.second_player).apply(self.room)
+        command = StartCommand(player=self.player, matcher_type='robin')
+        self.assertTrue(command.apply(self.room))
+        self.assertEqual(RoomStartedEvent(sequence=2), command.events[0])
+        self.assertEqual(26, len(self.room.get_player(self.player).hand))
+        hands = {event.recipient: event for event in command.events[1:]}
+        self.assertEqual({self.player.username, self.second_player.username}, set(hands))
+        for player in [self.player, self.second_player]:
+            self.assertIsInstance(hands[player.username], HandDealtEvent)
+            self.assertEqual(self.room.get_player(player).hand, hands[player.username].hand)
+
+    def test_play_card(self):
+        self.start()
+        trick = self.room.current_trick()
+        player = trick.play_order[0]
+        card = next(iter(player.hand))
+        command = PlayCardCommand(player=player.player, card=card)
+        stack = command.apply(self.room)
+        self.assertEqual([card], list(stack))
+        self.assertEqual([CardPlayedEvent(sequence=5, card=card, player=player.player)],
+                         command.events)
+
+    def test_next_hand_not_done(self):
+        self.start()
+        with self.assertRaises(Exception):
+            NextHandCommand().apply(self.room)
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            RoomCommand()
@@ -0,0 +1,42 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from whist_server.database.connection import Collection, get_database
+
+
+class DatabaseTestCase(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.database = get_database('localhost')
+
+    def tearDown(self) -> None:
+        self.database.close()
+
+    def test_not_connected_on_creation(self):
+        self.assertFalse(self.database.connected)
+        self.assertIsInstance(self.database.room, Collection)
+        self.assertFalse(self.database.connected)
+
+    async def test_connect(self):
+        self.database.connect()
+        self.assertTrue(self.database.connected)
+        options = self.database._client.options
+        self.assertEqual(100, options.pool_options.max_pool_size)
+        self.assertIn(self.database.pool_listener, options.event_listeners)
+
+    async def test_connect_on_first_use(self):
+        self.assertEqual('room', self.database.room.current().name)
+        self.assertTrue(self.database.connected)
+
+    async def test_close(self):
+        self.database.connect()
+        self.database.close()
+        self.assertFalse(self.database.connected)
+
+    def test_reconnect_on_new_loop(self):
+        async def client():
+            self.database.room.current()
+            return self.database._client
+
+        first = asyncio.run(client())
+        second = asyncio.run(client())
+        self.assertIsNot(first, second)
@@ -0,0 +1,51 @@
+import unittest
+
+from whist_server.database.diff import diff_document
+
+
+class DiffDocumentTestCase(unittest.TestCase):
+    def test_equal(self):
+        document = {'a': 1, 'b': {'c': [1, 2]}}
+        self.assertEqual({}, diff_document(document, {'a': 1, 'b': {'c': [1, 2]}}))
+
+    def test_set_nested(self):
+        old = {'table': {'rubbers': [{'games': [{'score': 1}]}]}}
+        new = {'table': {'rubbers': [{'games': [{'score': 2}]}]}}
+        self.assertEqual({'$set': {'table.rubbers.0.games.0.score': 2}},
+                         diff_document(old, new))
+
+    def test_new_key(self):
+        self.assertEqual({'$set': {'b': {'c': 1}}},
+                         diff_document({'a': 1}, {'a': 1, 'b': {'c': 1}}))
+
+    def test_removed_key(self):
+        self.assertEqual({'$unset': {'b': ''}}, diff_document({'a': 1, 'b': 2}, {'a': 1}))
+
+    def test_push(self):
+        old = {'tricks': [{'stack': [1]}]}
+        new = {'tricks': [{'stack': [1]}, {'stack': []}]}
+        self.assertEqual({'$push': {'tricks': {'$each': [{'stack': []}]}}},
+                         diff_document(old, new))
+
+    def test_push_tuple(self):
+        self.assertEqual({'$push': {'cards': {'$each': [2, 3]}}},
+                         diff_document({'cards': (1,)}, {'cards': (1, 2, 3)}))
+
+    def test_append_and_modify(self):
+        old = {'tricks': [{'stack': [1]}]}
+        new = {'tricks': [{'stack': [1, 2]}, {'stack': []}]}
+        expected = {'$push': {'tricks.0.stack': {'$each': [2]}},
+                    '$set': {'tricks.1': {'stack': []}}}
+        self.assertEqual(expected, diff_document(old, new))
+
+    def test_shrink(self):
+        self.assertEqual({'$set': {'hand': [1, 3]}},
+                         diff_document({'hand': [1, 2, 3]}, {'hand': [1, 3]}))
+
+    def test_dotted_key(self):
+        old = {'users': {'a.b': {'ready': False}}}
+        new = {'users': {'a.b': {'ready': True}}}
+        self.assertEqual({'$set': {'users': new['users']}}, diff_document(old, new))
+
+    def test_type_change(self):
+        self.assertEqual({'$set': {'a': [1]}}, diff_document({'a': None}, {'a': [1]}))
@@ -0,0 +1,157 @@
+from unittest import IsolatedAsyncioTestCase
+
+import pymongo
+from pymongo.errors import DuplicateKeyError
+
+from whist_server.database import create_database
+from whist_server.database.indexes import Index
+from whist_server.database.memory import MemoryDatabase, apply_update, matches
+
+
+class MemoryCollectionTestCase(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.database = MemoryDatabase([Index(collection='user', keys=[('username', 1)]),
+                                        Index(collection='user', keys=[('rating', -1)])])
+        self.users = self.database.user
+
+    async def test_insert_and_find(self):
+        user = {'username': 'marcel', 'rating': 1200}
+        result = await self.users.insert_one(user)
+        self.assertEqual(result.inserted_id, user['_id'])
+        found = await self.users.find_one({'username': 'marcel'})
+        self.assertEqual(user, found)
+        self.assertEqual(user, await self.users.find_one(result.inserted_id))
+        self.assertIsNone(await self.users.find_one({'username': 'other'}))
+
+    async def test_documents_are_copied(self):
+        user = {'username': 'marcel', 'games': []}
+        await self.users.insert_one(user)
+        user['games'].append(1)
+        found = await self.users.find_one({'username': 'marcel'})
+        found['username'] = 'other'
+        self.assertEqual({'username': 'marcel', 'games': [], '_id': user['_id']},
+                         await self.users.find_one(user['_id']))
+
+    async def test_duplicate_id(self):
+        user = {'username': 'marcel'}
+        await self.users.insert_one(user)
+        with self.assertRaises(DuplicateKeyError):
+            await self.users.insert_one(user)
+
+    async def test_unique_index(self):
+        await self.users.create_index('email', unique=True)
+        await self.users.insert_one({'email': 'a@b.c'})
+        with self.assertRaises(DuplicateKeyError):
+            await self.users.insert_one({'email': 'a@b.c'})
+        user = {'email': 'd@e.f'}
+        await self.users.insert_one(user)
+        with self.assertRaises(DuplicateKeyError):
+            await self.users.update_one({'_id': user['_id']}, {'$set': {'email': 'a@b.c'}})
+        self.assertEqual(2, await self.users.count_documents({}))
+
+    async def test_sort_by_index(self):
+        for rating in [1200, 1500, 900]:
+            await self.users.insert_one({'rating': rating})
+        ascending = self.users.find(sort=[('rating', pymongo.ASCENDING)])
+        self.assertEqual([900, 1200, 1500], [user['rating'] async for user in ascending])
+        descending = self.users.find().sort('rating', pymongo.DESCENDING).skip(1).limit(1)
+        self.assertEqual([1200], [user['rating'] for user in await descending.to_list(None)])
+
+    async def test_sort_by_index_prefix(self):
+        database = MemoryDatabase([Index(collection='room', keys=[('open', 1), ('seats', 1)])])
+        for open_room, seats in [(True, 3), (False, 1), (True, 2)]:
+            await database.room.insert_one({'open': open_room, 'seats': seats})
+        room = await database.room.find_one({'open': True, 'seats': {'$gt': 0}},
+                                            sort=[('seats', pymongo.ASCENDING)])
+        self.assertEqual(2, room['seats'])
+        self.assertEqual({'open_1_seats_1': 1}, await database.room.index_usage())
+
+    async def test_sort_without_index(self):
+        for name, score in [('a', 2), ('b', 1), ('c', 2)]:
+            await self.users.insert_one({'name': name, 'score': score})
+        cursor = self.users.find(sort=[('score', pymongo.DESCENDING), ('name', pymongo.ASCENDING)])
+        self.assertEqual(['a', 'c', 'b'], [user['name'] for user in await cursor.to_list(None)])
+
+    async def test_index_follows_updates(self):
+        user = {'username': 'marcel'}
+        await self.users.insert_one(user)
+        await self.users.update_one({'_id': user['_id']}, {'$set': {'username': 'other'}})
+        self.assertIsNone(await self.users.find_one({'username': 'marcel'}))
+        self.assertIsNotNone(await self.users.find_one({'username': 'other'}))
+        await self.users.delete_one({'username': 'other'})
+        self.assertIsNone(await self.users.find_one({'username': 'other'}))
+
+    async def test_update_one(self):
+        result = await self.users.update_one({'username': 'marcel'}, {'$set': {'rating': 1}})
+        self.assertEqual(0, result.matched_count)
+        result = await self.users.update_one({'username': 'marcel'}, {'$set': {'rating': 1}},
+                                             upsert=True)
+        self.assertIsNotNone(result.upserted_id)
+        result = await self.users.update_one({'username': 'marcel'}, {'$set': {'rating': 1}})
+        self.assertEqual((1, 0), (result.matched_count, result.modified_count))
+        result = await self.users.update_one({'username': 'marcel'}, {'$inc': {'rating': 1}})
+        self.assertEqual(1, result.modified_count)
+        self.assertEqual(2, (await self.users.find_one({'username': 'marcel'}))['rating'])
+
+    async def test_update_many(self):
+        await self.users.insert_many([{'username': 'marcel', 'rating': 1},
+                                      {'username': 'miles', 'rating': 2},
+                                      {'username': 'other', 'rating': 2}])
+        result = await self.users.update_many({'rating': 2}, {'$set': {'rating': 3}})
+        self.assertEqual((2, 2), (result.matched_count, result.modified_count))
+        self.assertEqual(2, await self.users.count_documents({'rating': 3}))
+        self.assertEqual(1, await self.users.count_documents({'rating': 1}))
+
+    async def test_projection(self):
+        await self.users.insert_one({'username': 'marcel', 'games': [1],
+                                     'table': {'name': 'a', 'size': 4}})
+        found = await self.users.find_one({}, {'_id': 0, 'games': 1, 'table.name': 1})
+        self.assertEqual({'games': [1], 'table': {'name': 'a'}}, found)
+        found = await self.users.find_one({}, {'table': 0})
+        self.assertEqual({'_id', 'username', 'games'}, set(found))
+
+    async def test_drop_keeps_declared_indexes(self):
+        await self.users.insert_one({'username': 'marcel'})
+        await self.users.create_index('email')
+        await self.users.drop()
+        self.assertEqual(0, await self.users.estimated_document_count())
+        self.assertIn('username_1', self.users.index_names())
+        self.assertNotIn('email_1', self.users.index_names())
+
+    async def test_index_usage(self):
+        await self.users.find_one({'username': 'marcel'})
+        usage = await self.users.index_usage()
+        self.assertEqual(1, usage['username_1'])
+        self.assertEqual(0, usage['rating_-1'])
+        information = await self.users.index_information()
+        self.assertEqual([('username', 1)], information['username_1']['key'])
+
+    async def test_declared_indexes(self):
+        database = MemoryDatabase([Index(collection='room', keys=[('table.name', 1)])])
+        self.assertEqual(['table.name_1'], database.room.index_names())
+        self.assertEqual([], database.user.index_names())
+
+
+class MemoryQueryTestCase(IsolatedAsyncioTestCase):
+    def test_matches(self):
+        document = {'a': 1, 'b': {'c': [1, 2]}, 'd': [{'e': 'x'}, {'e': 'y'}]}
+        self.assertTrue(matches(document, {'a': 1, 'b.c': 2, 'd.e': 'y'}))
+        self.assertTrue(matches(document, {'a': {'$gte': 1, '$lt': 2}, 'f': None}))
+        self.assertTrue(matches(document, {'$or': [{'a': 2}, {'b.c': {'$in': [2, 3]}}]}))
+        self.assertTrue(matches(document, {'f': {'$exists': False}, 'd.1.e': 'y'}))
+        self.assertFalse(matches(document, {'a': {'$ne': 1}}))
+        self.assertFalse(matches(document, {'a': {'$gt': 'z'}}))
+
+    def test_apply_update(self):
+        document = {'a': {'b': [1, 2]}, 'c': 1}
+        apply_update(document, {'$set': {'a.b.1': 3, 'd.e': 4}, '$unset': {'c': ''},
+                                '$push': {'a.b': {'$each': [5, 6]}}})
+        self.assertEqual({'a': {'b': [1, 3, 5, 6]}, 'd': {'e': 4}}, document)
+
+
+class CreateDatabaseTestCase(IsolatedAsyncioTestCase):
+    def test_backends(self):
+        self.assertIsInstance(create_database('memory', 'localhost'), MemoryDatabase)
+        self.assertIn('pool', create_database('mongo', 'localhost').stats)
+        with self.assertRaises(ValueError):
+            create_database('redis', 'localhost')
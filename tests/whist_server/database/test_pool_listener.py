@@ -0,0 +1,41 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from whist_server.database.pool_listener import PoolListener
+
+
+class PoolListenerTestCase(TestCase):
+    def setUp(self) -> None:
+        self.listener = PoolListener()
+        self.event = MagicMock()
+
+    @patch('time.perf_counter', side_effect=[1.0, 1.25])
+    def test_checkout_wait(self, _):
+        self.listener.connection_check_out_started(self.event)
+        self.listener.connection_checked_out(self.event)
+        stats = self.listener.stats
+        self.assertEqual(1, stats['checkouts'])
+        self.assertEqual(1, stats['checked_out'])
+        self.assertEqual(250, stats['checkout_wait_ms_avg'])
+        self.assertEqual(250, stats['checkout_wait_ms_max'])
+
+    def test_checkout_failed(self):
+        self.listener.connection_check_out_started(self.event)
+        self.listener.connection_check_out_failed(self.event)
+        self.assertEqual(1, self.listener.stats['checkout_failures'])
+        self.assertEqual(0, self.listener.stats['checkouts'])
+
+    def test_checked_in(self):
+        self.listener.connection_check_out_started(self.event)
+        self.listener.connection_checked_out(self.event)
+        self.listener.connection_checked_in(self.event)
+        self.assertEqual(0, self.listener.stats['checked_out'])
+
+    def test_open_connections(self):
+        self.listener.connection_created(self.event)
+        self.listener.connection_created(self.event)
+        self.listener.connection_closed(self.event)
+        self.assertEqual(1, self.listener.stats['open'])
+
+    def test_no_checkouts(self):
+        self.assertEqual(0, self.listener.stats['checkout_wait_ms_avg'])
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from bson import ObjectId
+from pydantic import ValidationError
+from whist_core.cards.card import Suit
+from whist_core.error.player_error import NegativeRatingError
+from whist_core.session.matcher import RoundRobinMatcher
+from whist_core.user.player import Player
+
+from tests.whist_server.base_player_test_case import BasePlayerTestCase
+from whist_server.database.card_codec import decode_cards, encode_cards
+from whist_server.database.room import RoomInDb
+from whist_server.database.trusted import construct
+from whist_server.database.user import UserInDb
+
+
+class TrustedTestCase(BasePlayerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.room = RoomInDb.create('test', self.player, 2, 2)
+        self.room = RoomInDb(**self.room.dict(), hashed_password='abc')
+        second_player = Player(username='second', rating=1200)
+        self.room.join(second_player)
+        self.room.ready_player(self.player)
+        self.room.ready_player(second_player)
+        self.room.start(self.player, RoundRobinMatcher)
+        self.room.next_hand()
+        game = self.room.current_rubber.current_game()
+        trick = self.room.current_trick()
+        player = game.get_player(trick.play_order[0].player)
+        trick.play_card(player, player.hand.cards[0])
+
+    def test_room(self):
+        document = decode_cards(encode_cards({**self.room.dict(), '_id': str(ObjectId())}))
+        room = construct(RoomInDb, document)
+        self.assertEqual(RoomInDb(**document), room)
+        self.assertIsInstance(room.id, ObjectId)
+        self.assertEqual(self.room.table, room.table)
+
+    def test_nested_models(self):
+        room = construct(RoomInDb, self.room.dict())
+        trick = room.current_trick()
+        self.assertIsInstance(trick.trump, Suit)
+        player = room.current_rubber.current_game().get_player(self.player)
+        self.assertIn(player.hand.cards[0], player.hand)
+        self.assertIsInstance(player.hand.cards, tuple)
+
+    def test_extra_fields_ignored(self):
+        user = construct(UserInDb, {'_id': ObjectId(), 'username': 'test', 'rating': 1000,
+                                    'games': 2, 'hashed_password': 'abc'})
+        self.assertEqual(UserInDb(username='test', rating=1000, games=2, hashed_password='abc'),
+                         user)
+        self.assertEqual(Player(username='test', rating=1000, games=2),
+                         construct(Player, user.dict()))
+
+    def test_missing_field_validated(self):
+        with self.assertRaises(ValidationError):
+            construct(Player, {'username': 'test'})
+        user = construct(UserInDb, {'username': 'test', 'hashed_password': 'abc'})
+        self.assertEqual(1200, user.rating)
+
+    def test_validation_switch(self):
+        document = {'username': 'test', 'rating': 'high'}
+        with self.assertRaises(ValidationError):
+            construct(Player, document)
+        document = {'username': 'test', 'rating': -1, 'games': 0}
+        self.assertEqual(-1, construct(Player, document).rating)
+        with patch('whist_server.database.trusted.VALIDATE_DOCUMENTS', True):
+            with self.assertRaises(NegativeRatingError):
+                construct(Player, document)
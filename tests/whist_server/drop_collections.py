@@ -0,0 +1,14 @@
+import asyncio
+
+from whist_server.database import db
+
+
+def drop_collections(*names: str) -> None:
+    """
+    Drops collections from synchronous test code.
+    """
+    async def drop():
+        for name in names:
+            await db[name].drop()
+
+    asyncio.run(drop())
@@ -1,10 +1,14 @@
 import asyncio
 import unittest
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from whist_core.user.player import Player
 
 from whist_server.services.channel_service import ChannelService
 from whist_server.services.error import ChannelNotFoundError, ChannelAlreadyExistsError
-from whist_server.web_socket.events.event import Event
+from whist_server.web_socket.backplane import FakeBackplane, MemoryBackplane
+from whist_server.web_socket.events.event import CommandAckEvent, Event, PlayerJoinedEvent, \
+    RoomArchivedEvent
 
 
 class ChannelServiceTestCase(unittest.TestCase):
@@ -22,13 +26,42 @@ class ChannelServiceTestCase(unittest.TestCase):
         self.service.add('2', self.channel)
         self.service.remove('2')
         event = Event()
-        with self.assertRaises(ChannelNotFoundError):
-            asyncio.run(self.service.notify('2', event))
+        asyncio.run(self.service.notify('2', event))
+        self.channel.notify.assert_not_called()
 
     def test_notify_not_added(self):
         event = Event()
+        asyncio.run(self.service.notify('3', event))
+        self.channel.notify.assert_not_called()
+
+    def test_attach_not_added(self):
+        subscriber = MagicMock()
+        self.service.attach('5', subscriber)
+        event = Event()
+        asyncio.run(self.service.notify('5', event))
+        subscriber.put.assert_called_once_with(event.encode().decode(), event.name)
+        self.service.remove('5')
+
+    def test_notify_other_process(self):
+        other_process = AsyncMock()
+        backplane = FakeBackplane(self.service.deliver)
+        backplane.join(other_process)
+        asyncio.run(self.service.start(backplane))
+        self.service.add('6', self.channel)
+        event = PlayerJoinedEvent(player=Player(username='test', rating=1200))
+        asyncio.run(self.service.notify('6', event))
+        self.channel.notify.assert_called_once_with(event)
+        other_process.assert_called_once_with('6', event)
+        self.assertEqual([('6', event)], backplane.published)
+        asyncio.run(self.service.start(MemoryBackplane(self.service.deliver)))
+
+    def test_close(self):
+        self.service.add('close', self.channel)
+        asyncio.run(self.service.close('close'))
+        self.channel.notify.assert_called_once_with(RoomArchivedEvent())
+        self.channel.close.assert_called_once_with(1001)
         with self.assertRaises(ChannelNotFoundError):
-            asyncio.run(self.service.notify('3', event))
+            self.service.remove('close')
 
     def test_remove_not_added(self):
         with self.assertRaises(ChannelNotFoundError):
@@ -38,3 +71,63 @@ class ChannelServiceTestCase(unittest.TestCase):
         self.service.add('4', self.channel)
         with self.assertRaises(ChannelAlreadyExistsError):
             self.service.add('4', self.channel)
+
+    def test_stats(self):
+        before = self.service.stats()
+        self.service.add('stats', MagicMock(queue_depths=MagicMock(return_value=[2, 5])))
+        after = self.service.stats()
+        self.service.remove('stats')
+        self.assertEqual(before['channels'] + 1, after['channels'])
+        self.assertEqual(before['subscribers'] + 2, after['subscribers'])
+        self.assertEqual(before['queued_frames'] + 7, after['queued_frames'])
+        self.assertEqual(5, after['max_queue_depth'])
+
+    def test_detach(self):
+        subscriber = MagicMock()
+        self.service.attach('detach', subscriber)
+        self.service.detach('detach', subscriber)
+        asyncio.run(self.service.notify('detach', Event()))
+        subscriber.put.assert_not_called()
+        subscriber.close.assert_called_once()
+
+    def test_resume_without_channel(self):
+        subscriber = MagicMock()
+        self.assertTrue(self.service.resume('resume', subscriber, 3, 3))
+        self.assertFalse(self.service.resume('resume', subscriber, 2, 3))
+
+    def test_acknowledge_without_channel(self):
+        subscriber = MagicMock()
+        ack = CommandAckEvent(request_id='1', ok=True)
+        self.service.acknowledge('ack', subscriber, ack, 3)
+        subscriber.put.assert_called_once_with(ack.encode().decode(), ack.name)
+
+    def test_acknowledge_after_delivery(self):
+        subscriber = MagicMock()
+        subscriber.receives.return_value = True
+        self.service.attach('delivery', subscriber)
+        ack = CommandAckEvent(request_id='1', ok=True)
+        event = PlayerJoinedEvent(sequence=1, player=Player(username='test', rating=1200))
+
+        async def execute():
+            self.service.acknowledge('delivery', subscriber, ack, 1)
+            subscriber.put.assert_not_called()
+            await self.service.deliver('delivery', event)
+
+        asyncio.run(execute())
+        self.assertEqual([event.name, ack.name],
+                         [call.args[1] for call in subscriber.put.call_args_list])
+        self.service.remove('delivery')
+
+    def test_acknowledge_timeout(self):
+        subscriber = MagicMock()
+        self.service.attach('timeout', subscriber)
+        ack = CommandAckEvent(request_id='1', ok=True)
+
+        async def execute():
+            with patch('whist_server.services.channel_service.CHANNEL_ACK_TIMEOUT', 0):
+                self.service.acknowledge('timeout', subscriber, ack, 1)
+            await asyncio.sleep(0.01)
+
+        asyncio.run(execute())
+        subscriber.put.assert_called_once_with(ack.encode().decode(), ack.name)
+        self.service.remove('timeout')
@@ -0,0 +1,50 @@
+from unittest import IsolatedAsyncioTestCase
+
+import pytest
+
+from whist_server.database import db
+from whist_server.database.indexes import Index
+from whist_server.services.error import IndexNotCreatedError
+from whist_server.services.index_service import IndexService
+
+
+@pytest.mark.integtest
+class IndexServiceTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await db.index_test.drop()
+        self.service = IndexService()
+        self.indexes = [Index(collection='index_test', keys=[('email', 1)], unique=True)]
+
+    async def asyncTearDown(self) -> None:
+        await db.index_test.drop()
+
+    async def test_ensure(self):
+        await db.index_test.insert_one({'email': 'a@b.c'})
+        report = await self.service.report(self.indexes)
+        self.assertEqual(['index_test.email_1'], report.missing)
+        self.assertEqual(['index_test.email_1'], await self.service.ensure(self.indexes))
+        self.assertEqual(['index_test.email_1'], await self.service.ensure(self.indexes))
+        report = await self.service.report(self.indexes)
+        self.assertEqual([], report.missing)
+        self.assertEqual(['index_test.email_1'], report.unused)
+
+    async def test_used_index(self):
+        await self.service.ensure(self.indexes)
+        await db.index_test.find_one({'email': 'a@b.c'})
+        report = await self.service.report(self.indexes)
+        self.assertEqual([], report.unused)
+
+    async def test_ensure_failure_skipped(self):
+        await db.index_test.insert_many([{'email': 'a@b.c'}, {'email': 'a@b.c'}])
+        self.assertEqual([], await self.service.ensure(self.indexes))
+
+    async def test_ensure_unique(self):
+        indexes = self.indexes + [Index(collection='index_test', keys=[('name', 1)])]
+        self.assertEqual(['index_test.email_1'], await self.service.ensure_unique(indexes))
+        report = await self.service.report(indexes)
+        self.assertEqual(['index_test.name_1'], report.missing)
+
+    async def test_ensure_unique_failure(self):
+        await db.index_test.insert_many([{'email': 'a@b.c'}, {'email': 'a@b.c'}])
+        with self.assertRaises(IndexNotCreatedError):
+            await self.service.ensure_unique(self.indexes)
@@ -0,0 +1,28 @@
+import unittest
+
+from whist_server.services.metrics_service import MetricsService
+
+
+class MetricsServiceTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = MetricsService()
+        self.service.reset()
+
+    def tearDown(self) -> None:
+        self.service.reset()
+
+    def test_increment(self):
+        self.service.increment('saves')
+        self.service.increment('saves', 2)
+        self.assertEqual(3, self.service.counter('saves'))
+
+    def test_counter_unknown(self):
+        self.assertEqual(0, self.service.counter('unknown'))
+
+    def test_gauge(self):
+        self.service.set_gauge('connections', 4)
+        self.assertEqual({'connections': 4}, self.service.collect()['gauges'])
+
+    def test_collector(self):
+        self.service.register('test_collector', lambda: {'size': 1})
+        self.assertEqual({'size': 1}, self.service.collect()['test_collector'])
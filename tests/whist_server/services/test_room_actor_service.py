@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from whist_core.error.table_error import PlayerNotJoinedError
+from whist_core.user.player import Player
+
+from whist_server.database.command import JoinCommand, ReadyCommand
+from whist_server.services.error import RoomVersionConflictError
+from whist_server.services.room_actor_service import RoomActorService
+from whist_server.web_socket.events.event import PlayerJoinedEvent
+
+
+class RoomActorServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.service = RoomActorService()
+        self.service.clear()
+        self.player = Player(username='marcel', rating=2000)
+        self.room = MagicMock(join=MagicMock(return_value=True))
+        self.room_service = MagicMock(get=AsyncMock(return_value=self.room), save=AsyncMock())
+        self.channel_service = MagicMock(notify=AsyncMock())
+
+    async def submit(self, command):
+        return await self.service.submit('1', command, self.room_service, self.channel_service)
+
+    async def test_submit(self):
+        result = await self.submit(JoinCommand(player=self.player))
+        self.assertTrue(result)
+        self.room.join.assert_called_once_with(self.player)
+        self.room_service.save.assert_awaited_once_with(self.room)
+        self.channel_service.notify.assert_awaited_once_with(
+            '1', PlayerJoinedEvent(player=self.player))
+
+    async def test_room_stays_loaded(self):
+        await self.submit(JoinCommand(player=self.player))
+        await self.submit(ReadyCommand(player=self.player))
+        self.room_service.get.assert_awaited_once_with('1')
+        self.assertEqual(2, self.room_service.save.call_count)
+
+    async def test_batch_saved_once(self):
+        commands = [ReadyCommand(player=self.player) for _ in range(5)]
+        await asyncio.gather(*[self.submit(command) for command in commands])
+        self.assertEqual(5, self.room.ready_player.call_count)
+        self.assertEqual(1, self.room_service.save.call_count)
+
+    async def test_failed_command(self):
+        self.room.ready_player = MagicMock(side_effect=PlayerNotJoinedError)
+        with self.assertRaises(PlayerNotJoinedError):
+            await self.submit(ReadyCommand(player=self.player))
+        self.room_service.save.assert_not_awaited()
+        self.channel_service.notify.assert_not_awaited()
+
+    async def test_failed_command_in_batch(self):
+        self.room.ready_player = MagicMock(side_effect=PlayerNotJoinedError)
+        results = await asyncio.gather(self.submit(JoinCommand(player=self.player)),
+                                       self.submit(ReadyCommand(player=self.player)),
+                                       return_exceptions=True)
+        self.assertTrue(results[0])
+        self.assertIsInstance(results[1], PlayerNotJoinedError)
+        self.room_service.save.assert_awaited_once()
+
+    async def test_conflict_replayed(self):
+        self.room_service.save = AsyncMock(side_effect=[RoomVersionConflictError('1'), None])
+        await self.submit(JoinCommand(player=self.player))
+        self.assertEqual(2, self.room_service.get.call_count)
+        self.assertEqual(2, self.room.join.call_count)
+        self.channel_service.notify.assert_awaited_once()
+
+    async def test_conflict_exhausted(self):
+        self.room_service.save = AsyncMock(side_effect=RoomVersionConflictError('1'))
+        with self.assertRaises(RoomVersionConflictError):
+            await self.submit(JoinCommand(player=self.player))
+        self.channel_service.notify.assert_not_awaited()
+
+    async def test_save_error_reloads_room(self):
+        self.room_service.save = AsyncMock(side_effect=[ValueError, None])
+        with self.assertRaises(ValueError):
+            await self.submit(JoinCommand(player=self.player))
+        await self.submit(JoinCommand(player=self.player))
+        self.assertEqual(2, self.room_service.get.call_count)
+
+    async def wait_queued(self):
+        while not self.service._actors['1']._mailbox:
+            await asyncio.sleep(0.001)
+
+    async def test_submit_from_other_event_loop(self):
+        gate = threading.Event()
+
+        async def save(_):
+            await asyncio.get_running_loop().run_in_executor(None, gate.wait, 5)
+
+        self.room_service.save = AsyncMock(side_effect=save)
+        first = asyncio.ensure_future(self.submit(JoinCommand(player=self.player)))
+        await asyncio.sleep(0.01)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(
+            asyncio.run(self.submit(ReadyCommand(player=self.player)))))
+        thread.start()
+        await self.wait_queued()
+        gate.set()
+        self.assertTrue(await first)
+        await asyncio.get_running_loop().run_in_executor(None, thread.join, 5)
+        self.assertEqual(1, len(results))
+        self.room.ready_player.assert_called_once_with(self.player)
+        self.assertEqual(2, self.room_service.save.call_count)
+
+    async def test_hand_over_when_event_loop_stops(self):
+        saving = threading.Event()
+
+        async def save(_):
+            if not saving.is_set():
+                saving.set()
+                await asyncio.Event().wait()
+
+        self.room_service.save = AsyncMock(side_effect=save)
+        other_loop = asyncio.new_event_loop()
+        errors = []
+
+        def submit_in_other_loop():
+            try:
+                other_loop.run_until_complete(self.submit(JoinCommand(player=self.player)))
+            except RuntimeError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=submit_in_other_loop)
+        thread.start()
+        await asyncio.get_running_loop().run_in_executor(None, saving.wait, 5)
+        second = asyncio.ensure_future(self.submit(ReadyCommand(player=self.player)))
+        await self.wait_queued()
+        other_loop.call_soon_threadsafe(self.service._actors['1']._task.cancel)
+        await asyncio.wait_for(second, 5)
+        await asyncio.get_running_loop().run_in_executor(None, thread.join, 5)
+        other_loop.close()
+        self.assertEqual(1, len(errors))
+        self.room.ready_player.assert_called_once_with(self.player)
+
+    async def test_reap_idle(self):
+        await self.submit(JoinCommand(player=self.player))
+        self.assertEqual({'actors': 1}, self.service.stats())
+        self.assertEqual(0, self.service.reap_idle(timeout=60))
+        self.assertEqual(1, self.service.reap_idle(timeout=0))
+        self.assertEqual({'actors': 0}, self.service.stats())
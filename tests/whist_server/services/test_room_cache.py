@@ -0,0 +1,63 @@
+from bson import ObjectId
+
+from tests.whist_server.base_player_test_case import BasePlayerTestCase
+from whist_server.services.room_cache import RoomCache
+from whist_server.services.room_db_service import RoomDatabaseService
+
+
+class RoomCacheTestCase(BasePlayerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = RoomCache(max_size=2)
+        self.room = self._create_room('test')
+
+    def _create_room(self, name):
+        room = RoomDatabaseService.create_with_pwd(room_name=name, creator=self.player)
+        room.id = ObjectId()
+        return room
+
+    def _put(self, room):
+        self.cache.put(str(room.id), room.dict())
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get(str(self.room.id)))
+        self.assertEqual(1, self.cache.misses)
+
+    def test_hit(self):
+        self._put(self.room)
+        self.assertEqual(self.room.dict(), self.cache.get(str(self.room.id)))
+        self.assertEqual(1, self.cache.hits)
+
+    def test_shared_document(self):
+        document = self.room.dict()
+        self.cache.put(str(self.room.id), document)
+        self.assertIs(document, self.cache.get(str(self.room.id)))
+
+    def test_eviction(self):
+        second_room = self._create_room('second')
+        third_room = self._create_room('third')
+        self._put(self.room)
+        self._put(second_room)
+        _ = self.cache.get(str(self.room.id))
+        self._put(third_room)
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual(1, self.cache.evictions)
+        self.assertIn(str(self.room.id), self.cache)
+        self.assertNotIn(str(second_room.id), self.cache)
+
+    def test_invalidate(self):
+        self._put(self.room)
+        self.cache.invalidate(str(self.room.id))
+        self.assertIsNone(self.cache.get(str(self.room.id)))
+
+    def test_disabled(self):
+        cache = RoomCache(max_size=0)
+        cache.put(str(self.room.id), self.room.dict())
+        self.assertEqual(0, len(cache))
+
+    def test_stats(self):
+        self._put(self.room)
+        _ = self.cache.get(str(self.room.id))
+        _ = self.cache.get('1' * 24)
+        self.assertEqual({'size': 1, 'max_size': 2, 'hits': 1, 'misses': 1, 'evictions': 0},
+                         self.cache.stats)
@@ -0,0 +1,95 @@
+import asyncio
+import datetime
+import json
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from whist_core.user.player import Player
+
+from whist_server.database import db
+from whist_server.services.channel_service import ChannelService
+from whist_server.services.error import ChannelNotFoundError, RoomNotFoundError
+from whist_server.services.room_collector_service import RoomCollectorService
+from whist_server.services.room_db_service import RoomDatabaseService
+from whist_server.web_socket.subscriber import Subscriber
+
+
+@pytest.mark.integtest
+class RoomCollectorServiceTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        for name in ['room', 'room_archive', 'room_events', 'room_snapshots']:
+            await db[name].drop()
+        self.room_service = RoomDatabaseService()
+        self.service = RoomCollectorService()
+        self.player = Player(username='marcel', rating=1200)
+        room = self.room_service.create_with_pwd(room_name='test', creator=self.player)
+        self.room_id = await self.room_service.add(room)
+        self.now = datetime.datetime.utcnow()
+
+    async def asyncTearDown(self) -> None:
+        for name in ['room', 'room_archive', 'room_events', 'room_snapshots']:
+            await db[name].drop()
+
+    async def test_active_room_kept(self):
+        self.assertEqual(0, await self.service.collect(self.now))
+        self.assertEqual(1, await db.room.count_documents({}))
+
+    async def test_idle_room_archived(self):
+        channel_service = ChannelService()
+        connection = MagicMock(send_text=AsyncMock(), close=AsyncMock())
+        subscriber = Subscriber(connection, self.player)
+        channel_service.attach(self.room_id, subscriber)
+        later = self.now + datetime.timedelta(days=2)
+        self.assertEqual(1, await self.service.collect(later))
+        with self.assertRaises(RoomNotFoundError):
+            await self.room_service.get(self.room_id)
+        archived = await db.room_archive.find_one(ObjectId(self.room_id))
+        self.assertEqual('test', archived['room_summary']['name'])
+        self.assertEqual(0, await db.room_snapshots.count_documents({'room_id': self.room_id}))
+        with self.assertRaises(ChannelNotFoundError):
+            channel_service.remove(self.room_id)
+        await asyncio.sleep(0.01)
+        self.assertEqual('RoomArchivedEvent',
+                         json.loads(connection.send_text.await_args.args[0])['name'])
+        connection.close.assert_awaited_once_with(code=1001)
+        self.assertTrue(subscriber.closed)
+
+    async def test_empty_room_archived(self):
+        room = await self.room_service.get(self.room_id)
+        room.leave(self.player)
+        await self.room_service.save(room)
+        later = self.now + datetime.timedelta(hours=1)
+        self.assertEqual(1, await self.service.collect(later))
+
+    async def test_archive_purged(self):
+        await self.service.collect(self.now + datetime.timedelta(days=2))
+        await self.service.collect(self.now + datetime.timedelta(days=40))
+        self.assertEqual(0, await db.room_archive.count_documents({}))
+
+    async def test_modified_room_kept(self):
+        stale = await self.room_service.stale(self.now + datetime.timedelta(days=2),
+                                              self.now, 10)
+        room = await self.room_service.get(self.room_id)
+        room.table.min_player = 3
+        await self.room_service.save(room)
+        self.assertFalse(await self.room_service.archive(stale[0]))
+        self.assertEqual(1, await db.room.count_documents({}))
+        self.assertEqual(0, await db.room_archive.count_documents({}))
+
+    async def test_concurrent_archivers(self):
+        later = self.now + datetime.timedelta(days=2)
+        first = await self.room_service.stale(later, self.now, 10)
+        second = await self.room_service.stale(later, self.now, 10)
+        self.assertTrue(await self.room_service.archive(first[0]))
+        self.assertFalse(await self.room_service.archive(second[0]))
+        self.assertEqual(0, await db.room.count_documents({}))
+        self.assertEqual(1, await db.room_archive.count_documents({}))
+
+    async def test_legacy_room_without_activity(self):
+        await db.room.update_one({'_id': ObjectId(self.room_id)},
+                                 {'$unset': {'last_activity': ''}})
+        self.assertEqual(0, await self.service.collect(self.now))
+        self.assertEqual(0, await self.service.collect(self.now + datetime.timedelta(hours=1)))
+        self.assertEqual(1, await self.service.collect(self.now + datetime.timedelta(days=2)))
@@ -1,3 +1,5 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
 from unittest.mock import patch
 
 import pytest
@@ -7,71 +9,242 @@ from whist_core.user.player import Player
 
 from tests.whist_server.base_player_test_case import BasePlayerTestCase
 from whist_server.database import db
-from whist_server.services.error import RoomNotFoundError, RoomNotUpdatedError
+from whist_server.database.command import JoinCommand
+from whist_server.database.room import LobbyFilter
+from whist_server.services.error import RoomNotFoundError, RoomNotUpdatedError, \
+    RoomVersionConflictError
+from whist_server.services.index_service import IndexService
 from whist_server.services.room_db_service import RoomDatabaseService
 
 
 @pytest.mark.integtest
-class RoomDdServiceTestCase(BasePlayerTestCase):
-    def setUp(self) -> None:
-        db.room.drop()
-        super().setUp()
+class RoomDdServiceTestCase(BasePlayerTestCase, IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await db.room.drop()
+        await db.room_events.drop()
+        await db.room_snapshots.drop()
+        await IndexService().ensure()
         self.service = RoomDatabaseService()
         self.room = self.service.create_with_pwd(room_name='test', hashed_password='abc',
                                                  creator=self.player)
 
-    def test_add(self):
-        game_id = self.service.add(self.room)
+    async def test_add(self):
+        game_id = await self.service.add(self.room)
         self.room.id = ObjectId(game_id)
-        self.assertEqual(self.room, self.service.get(game_id))
-        self.assertEqual(1, db.room.count_documents({}))
+        self.assertEqual(self.room, await self.service.get(game_id))
+        self.assertEqual(1, await db.room.count_documents({}))
 
-    def test_add_duplicate(self):
-        game_id_first = self.service.add(self.room)
-        game_id_second = self.service.add(self.room)
+    async def test_add_duplicate(self):
+        game_id_first = await self.service.add(self.room)
+        game_id_second = await self.service.add(self.room)
         self.assertEqual(game_id_first, game_id_second)
 
-    def test_not_existing(self):
+    async def test_add_duplicate_concurrent(self):
+        room_ids = await asyncio.gather(*[self.service.add(self.room) for _ in range(5)])
+        self.assertEqual(1, len(set(room_ids)))
+        self.assertEqual(1, await db.room.count_documents({}))
+
+    async def test_not_existing(self):
         game_id = '1' * 24
         error_msg = f'Room with id "{game_id}" not found.'
         with self.assertRaisesRegex(RoomNotFoundError, error_msg):
-            self.service.get(game_id)
+            await self.service.get(game_id)
 
-    def test_get_invalid_room_id(self):
+    async def test_get_invalid_room_id(self):
         room_id = '1'
         error_msg = f'Room with id "{room_id}" not found.'
         with self.assertRaisesRegex(RoomNotFoundError, error_msg):
-            self.service.get(room_id)
-    def test_get_by_name(self):
-        game_id = self.service.add(self.room)
+            await self.service.get(room_id)
+    async def test_get_cached(self):
+        game_id = await self.service.add(self.room)
+        _ = await self.service.get(game_id)
+        hits = self.service.cache_stats()['hits']
+        self.assertEqual(game_id, str((await self.service.get(game_id)).id))
+        self.assertEqual(hits + 1, self.service.cache_stats()['hits'])
+
+    async def test_get_cached_independent(self):
+        game_id = await self.service.add(self.room)
+        room = await self.service.get(game_id)
+        room.table.min_player = 1
+        self.assertEqual(4, (await self.service.get(game_id)).table.min_player)
+
+    async def test_get_cached_saved_by_other_process(self):
+        game_id = await self.service.add(self.room)
+        _ = await self.service.get(game_id)
+        await db.room.update_one({'_id': ObjectId(game_id)},
+                                 {'$set': {'table.min_player': 3, 'version': 1}})
+        room = await self.service.get(game_id)
+        self.assertEqual(3, room.table.min_player)
+        self.assertEqual(1, room.version)
+
+    async def test_get_cached_after_save(self):
+        game_id = await self.service.add(self.room)
+        room = await self.service.get(game_id)
+        room.table.min_player = 3
+        await self.service.save(room)
+        hits = self.service.cache_stats()['hits']
+        cached = await self.service.get(game_id)
+        self.assertEqual(hits + 1, self.service.cache_stats()['hits'])
+        self.assertEqual(room, cached)
+        self.assertIsNot(room, cached)
+
+    async def test_save_unchanged_after_load(self):
+        game_id = await self.service.add(self.room)
+        self.service._cache.invalidate(game_id)
+        room = await self.service.get(game_id)
+        await self.service.save(room)
+        self.assertEqual(0, room.version)
+
+    async def test_save_after_load_sends_changes_only(self):
+        game_id = await self.service.add(self.room)
+        self.service._cache.invalidate(game_id)
+        room = await self.service.get(game_id)
+        room.table.min_player = 3
+        with patch.object(db.room, 'update_one', wraps=db.room.update_one) as update_mock:
+            await self.service.save(room)
+        self.assertEqual({'$set'}, update_mock.call_args.args[1].keys())
+        self.assertIn('table.min_player', update_mock.call_args.args[1]['$set'])
+        self.assertNotIn('id', await db.room.find_one(ObjectId(game_id)))
+
+    async def test_get_by_name(self):
+        game_id = await self.service.add(self.room)
         self.room.id = ObjectId(game_id)
-        self.assertEqual(self.room, self.service.get_by_name('test'))
+        self.assertEqual(self.room, await self.service.get_by_name('test'))
 
-    def test_save(self):
-        game_id = self.service.add(self.room)
+    async def test_save(self):
+        game_id = await self.service.add(self.room)
         self.room.id = game_id
         self.room.table.min_player = 3
-        self.service.save(self.room)
-        game = self.service.get(game_id)
+        await self.service.save(self.room)
+        game = await self.service.get(game_id)
         self.assertEqual(3, game.table.min_player)
 
-    def test_save_wrong_id(self):
-        _ = self.service.add(self.room)
+    async def test_ids(self):
+        game_id = await self.service.add(self.room)
+        self.assertEqual([game_id], await self.service.ids())
+
+    async def test_info_from_summary(self):
+        game_id = await self.service.add(self.room)
+        self.assertEqual(self.room.get_info(), await self.service.info(game_id))
+
+    async def test_info_not_existing(self):
+        with self.assertRaises(RoomNotFoundError):
+            await self.service.info('1' * 24)
+        with self.assertRaises(RoomNotFoundError):
+            await self.service.info('1')
+
+    async def test_save_updates_summary(self):
+        game_id = await self.service.add(self.room)
+        room = await self.service.get(game_id)
+        room.join(Player(username='second', rating=1200))
+        await self.service.save(room)
+        document = await db.room.find_one(ObjectId(game_id))
+        self.assertEqual(2, document['room_summary']['seats_taken'])
+
+    async def test_lobby(self):
+        first_id = await self.service.add(self.room)
+        open_room = self.service.create_with_pwd(room_name='open', creator=self.player,
+                                                 max_player=2)
+        open_id = await self.service.add(open_room)
+        rooms = await self.service.lobby(LobbyFilter())
+        self.assertEqual([first_id, open_id], [room.id for room in rooms])
+        rooms = await self.service.lobby(LobbyFilter(no_password=True, open_seats=True,
+                                                     not_started=True, max_player=2))
+        self.assertEqual([open_id], [room.id for room in rooms])
+        self.assertEqual([], await self.service.lobby(LobbyFilter(min_player=5)))
+
+    async def test_lobby_pages(self):
+        first_id = await self.service.add(self.room)
+        second_room = self.service.create_with_pwd(room_name='second', creator=self.player)
+        second_id = await self.service.add(second_room)
+        first_page = await self.service.lobby(LobbyFilter(), limit=1)
+        self.assertEqual([first_id], [room.id for room in first_page])
+        second_page = await self.service.lobby(LobbyFilter(), after=first_id, limit=1)
+        self.assertEqual([second_id], [room.id for room in second_page])
+        self.assertEqual([], await self.service.lobby(LobbyFilter(), after=second_id))
+        with self.assertRaises(RoomNotFoundError):
+            await self.service.lobby(LobbyFilter(), after='1')
+
+    async def test_lobby_pages_without_summary(self):
+        legacy_id = await self.service.add(self.room)
+        await db.room.update_one({'_id': ObjectId(legacy_id)}, {'$unset': {'room_summary': ''}})
+        second_room = self.service.create_with_pwd(room_name='second', creator=self.player)
+        second_id = await self.service.add(second_room)
+        rooms = await self.service.lobby(LobbyFilter(), limit=1)
+        self.assertEqual([second_id], [room.id for room in rooms])
+
+    async def test_find_open(self):
+        await self.service.add(self.room)
+        small_room = self.service.create_with_pwd(room_name='small', creator=self.player,
+                                                  max_player=2)
+        small_id = await self.service.add(small_room)
+        large_room = self.service.create_with_pwd(room_name='large', creator=self.player)
+        large_id = await self.service.add(large_room)
+        self.assertEqual(small_id, await self.service.find_open())
+        self.assertEqual(large_id, await self.service.find_open(exclude=[small_id]))
+        self.assertIsNone(await self.service.find_open(exclude=[small_id, large_id]))
+        self.assertIsNone(await self.service.find_open(player=self.player))
+
+    async def test_save_wrong_id(self):
+        _ = await self.service.add(self.room)
         self.room.id = '1' * 24
         self.room.table.min_player = 3
         with self.assertRaises(RoomNotFoundError):
-            self.service.save(self.room)
+            await self.service.save(self.room)
 
     @patch('pymongo.results.UpdateResult.modified_count', return_value=1)
-    def test_save_update_error(self, result_mock):
-        game_id = self.service.add(self.room)
+    async def test_save_update_error(self, result_mock):
+        game_id = await self.service.add(self.room)
         self.room.id = game_id
         self.room.table.min_player = 3
         with self.assertRaises(RoomNotUpdatedError):
-            self.service.save(self.room)
+            await self.service.save(self.room)
+
+    async def test_save_increments_version(self):
+        game_id = await self.service.add(self.room)
+        room = await self.service.get(game_id)
+        room.table.min_player = 3
+        await self.service.save(room)
+        self.assertEqual(1, room.version)
+        self.assertEqual(1, (await self.service.get(game_id)).version)
+
+    async def test_save_appends_event_log(self):
+        game_id = await self.service.add(self.room)
+        room = await self.service.get(game_id)
+        JoinCommand(player=Player(username='2', rating=1200)).apply(room)
+        await self.service.save(room)
+        self.assertEqual(1, await db.room_events.count_documents({'room_id': game_id}))
+        rebuilt = await self.service._log.rebuild(game_id)
+        self.assertEqual(room.players, rebuilt.players)
+
+    async def test_save_event_log_failure(self):
+        game_id = await self.service.add(self.room)
+        room = await self.service.get(game_id)
+        JoinCommand(player=Player(username='2', rating=1200)).apply(room)
+        with patch.object(self.service._log, 'append', side_effect=ConnectionError()), \
+                self.assertLogs('whist_server.services.room_db_service', level='ERROR'):
+            await self.service.save(room)
+        self.assertEqual(1, room.version)
+        self.assertEqual(1, len(room.pending_log))
+        cached = await self.service.get(game_id)
+        self.assertEqual(1, cached.version)
+        self.assertEqual(room.players, cached.players)
+        self.assertEqual(1, (await db.room.find_one(ObjectId(game_id)))['version'])
+        self.assertEqual(0, await db.room_events.count_documents({'room_id': game_id}))
+
+    async def test_save_version_conflict(self):
+        game_id = await self.service.add(self.room)
+        first = await self.service.get(game_id)
+        second = await self.service.get(game_id)
+        first.table.min_player = 3
+        await self.service.save(first)
+        second.table.min_player = 2
+        with self.assertRaises(RoomVersionConflictError):
+            await self.service.save(second)
+        self.assertEqual(3, (await self.service.get(game_id)).table.min_player)
 
-    def test_save_started_table(self):
-        game_id = self.service.add(self.room)
+    async def test_save_started_table(self):
+        game_id = await self.service.add(self.room)
         self.room.id = game_id
         self.room.table.min_player = 2
         self.room.ready_player(self.player)
@@ -79,13 +252,13 @@ class RoomDdServiceTestCase(BasePlayerTestCase):
         self.room.join(second_player)
         self.room.ready_player(second_player)
         self.room.start(self.player, RandomMatcher)
-        self.service.save(self.room)
-        db_game = self.service.get(game_id)
+        await self.service.save(self.room)
+        db_game = await self.service.get(game_id)
         self.assertTrue(self.room.table.started)
         self.assertTrue(db_game.table.started)
 
-    def test_save_play_card(self):
-        game_id = self.service.add(self.room)
+    async def test_save_play_card(self):
+        game_id = await self.service.add(self.room)
         self.room.id = game_id
         self.room.table.min_player = 2
         self.room.ready_player(self.player)
@@ -93,16 +266,16 @@ class RoomDdServiceTestCase(BasePlayerTestCase):
         self.room.join(second_player)
         self.room.ready_player(second_player)
         self.room.start(self.player, RoundRobinMatcher)
-        self.service.save(self.room)
+        await self.service.save(self.room)
         game = self.room.table.current_rubber.current_game()
         player = game.get_player(self.player)
         trick = game.next_hand().current_trick
         trick.play_card(player, player.hand.cards[0])
-        self.service.save(self.room)
+        await self.service.save(self.room)
 
-    def test_all(self):
-        game_id = self.service.add(self.room)
+    async def test_all(self):
+        game_id = await self.service.add(self.room)
         self.room.id = game_id
-        all_games = self.service.all()
+        all_games = await self.service.all()
         self.assertEqual(1, len(all_games))
         self.assertEqual(game_id, str(all_games[0].id))
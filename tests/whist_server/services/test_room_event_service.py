@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bson import ObjectId
+from whist_core.user.player import Player
+
+from whist_server.const import ROOM_SNAPSHOT_INTERVAL
+from whist_server.database.command import JoinCommand, LeaveCommand, ReadyCommand, StartCommand
+from whist_server.database.room import RoomInDb
+from whist_server.services.room_event_service import RoomEventService
+
+
+class RoomEventServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.service = RoomEventService()
+        self.player = Player(username='marcel', rating=2000)
+        self.second_player = Player(username='2', rating=1200)
+        room = RoomInDb.create('test', self.player, 2, 2)
+        self.room = RoomInDb(_id=ObjectId(), **room.dict(exclude={'id'}))
+        self.events = MagicMock(insert_many=AsyncMock())
+        self.snapshots = MagicMock(insert_one=AsyncMock())
+        patcher = patch.multiple(RoomEventService, _events=self.events,
+                                 _snapshots=self.snapshots)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def snapshot_document(self) -> dict:
+        return {'room_id': str(self.room.id), 'sequence': self.room.log_sequence,
+                'room': self.room.dict(exclude={'id', 'version'})}
+
+    async def test_append(self):
+        JoinCommand(player=self.second_player).apply(self.room)
+        ReadyCommand(player=self.player).apply(self.room)
+        await self.service.append(self.room)
+        entries = self.events.insert_many.call_args.args[0]
+        self.assertEqual([1, 2], [entry['sequence'] for entry in entries])
+        self.assertEqual(['JoinCommand', 'ReadyCommand'], [entry['command'] for entry in entries])
+        self.snapshots.insert_one.assert_not_called()
+        self.assertEqual([], self.room.pending_log)
+
+    async def test_append_nothing(self):
+        await self.service.append(self.room)
+        self.events.insert_many.assert_not_called()
+
+    async def test_snapshot_interval(self):
+        for _ in range(ROOM_SNAPSHOT_INTERVAL):
+            JoinCommand(player=self.second_player).apply(self.room)
+            LeaveCommand(player=self.second_player).apply(self.room)
+            await self.service.append(self.room)
+        self.assertEqual(2, self.snapshots.insert_one.call_count)
+        snapshot = self.snapshots.insert_one.call_args.args[0]
+        self.assertEqual(2 * ROOM_SNAPSHOT_INTERVAL, snapshot['sequence'])
+
+    async def test_snapshot_interval_single_commands(self):
+        for _ in range(ROOM_SNAPSHOT_INTERVAL):
+            JoinCommand(player=self.second_player).apply(self.room)
+            await self.service.append(self.room)
+            LeaveCommand(player=self.second_player).apply(self.room)
+            await self.service.append(self.room)
+        self.assertEqual(2, self.snapshots.insert_one.call_count)
+        sequences = [call.args[0]['sequence'] for call in self.snapshots.insert_one.call_args_list]
+        self.assertEqual([ROOM_SNAPSHOT_INTERVAL, 2 * ROOM_SNAPSHOT_INTERVAL], sequences)
+
+    async def test_snapshot_after_start(self):
+        JoinCommand(player=self.second_player).apply(self.room)
+        ReadyCommand(player=self.player).apply(self.room)
+        ReadyCommand(player=self.second_player).apply(self.room)
+        StartCommand(player=self.player, matcher_type='robin').apply(self.room)
+        await self.service.append(self.room)
+        snapshot = self.snapshots.insert_one.call_args.args[0]
+        self.assertEqual(4, snapshot['sequence'])
+
+    def test_replay(self):
+        snapshot = self.snapshot_document()
+        commands = [JoinCommand(player=self.second_player), ReadyCommand(player=self.player),
+                    ReadyCommand(player=self.second_player)]
+        events = []
+        for command in commands:
+            command.apply(self.room)
+            sequence, _ = self.room.pending_log[-1]
+            events.append({'sequence': sequence, 'command': command.name,
+                           'data': command.dict()})
+        room = self.service.replay(snapshot, events)
+        self.assertEqual(self.room.dict(), room.dict())
+        self.assertEqual([], room.pending_log)
+
+    async def test_rebuild(self):
+        JoinCommand(player=self.second_player).apply(self.room)
+        self.snapshots.find_one = AsyncMock(return_value=self.snapshot_document())
+        cursor = MagicMock(to_list=AsyncMock(return_value=[
+            {'sequence': 2, 'command': 'ReadyCommand', 'data': {'player': self.player.dict()}}]))
+        self.events.find = MagicMock(return_value=cursor)
+        room = await self.service.rebuild(str(self.room.id))
+        ReadyCommand(player=self.player).apply(self.room)
+        self.assertEqual(self.room.dict(), room.dict())
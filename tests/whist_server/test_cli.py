@@ -2,12 +2,13 @@ import os
 from multiprocessing import Process
 from time import sleep
 from unittest import TestCase
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 import httpx
 import pytest
 
-from whist_server.cli import main
+from whist_server.cli import indexes, main
+from whist_server.services.index_service import IndexReport
 
 
 @pytest.mark.integtest
@@ -32,3 +33,21 @@ class CliTestCase(TestCase):
         response = httpx.get('http://0.0.0.0:8080')
         thread_start.terminate()
         self.assertEqual(200, response.status_code)
+
+
+class CliIndexesTestCase(TestCase):
+    @patch('sys.argv', ['whist-server', 'indexes'])
+    @patch('whist_server.cli.IndexService')
+    def test_missing_indexes(self, index_service):
+        index_service.return_value = MagicMock(
+            report=AsyncMock(return_value=IndexReport(missing=['user.username_1'])))
+        with self.assertRaises(SystemExit) as context:
+            main()
+        self.assertEqual(1, context.exception.code)
+
+    @patch('whist_server.cli.IndexService')
+    def test_ensure(self, index_service):
+        service = MagicMock(ensure=AsyncMock(), report=AsyncMock(return_value=IndexReport()))
+        index_service.return_value = service
+        self.assertEqual(0, indexes(['--ensure']))
+        service.ensure.assert_awaited_once()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock
+
+from whist_core.cards.card import Card, Rank, Suit
+from whist_core.user.player import Player
+
+from whist_server.web_socket.backplane import FakeBackplane, MemoryBackplane, \
+    UnixSocketBackplane, create_backplane, decode_message, encode_message
+from whist_server.web_socket.events.event import CardPlayedEvent, RoomStartedEvent
+
+
+class BackplaneTestCase(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.event = CardPlayedEvent(card=Card(suit=Suit.HEARTS, rank=Rank.Q),
+                                     player=Player(username='test', rating=1200))
+
+    def test_message(self):
+        room_id, event = decode_message(encode_message('1', self.event))
+        self.assertEqual('1', room_id)
+        self.assertEqual(self.event, event)
+        self.assertIsInstance(event, CardPlayedEvent)
+
+    async def test_memory(self):
+        deliver = AsyncMock()
+        await MemoryBackplane(deliver).publish('1', self.event)
+        deliver.assert_awaited_once_with('1', self.event)
+
+    async def test_fake(self):
+        first_deliver, second_deliver = AsyncMock(), AsyncMock()
+        first = FakeBackplane(first_deliver)
+        second = first.join(second_deliver)
+        await second.publish('1', self.event)
+        first_deliver.assert_awaited_once_with('1', self.event)
+        second_deliver.assert_awaited_once_with('1', self.event)
+        self.assertEqual([('1', self.event)], second.published)
+        await second.stop()
+        await first.publish('2', RoomStartedEvent())
+        self.assertEqual(1, second_deliver.await_count)
+
+
+class CreateBackplaneTestCase(TestCase):
+    def test_create(self):
+        deliver = AsyncMock()
+        self.assertIsInstance(create_backplane('memory', deliver, ''), MemoryBackplane)
+        self.assertIsInstance(create_backplane('unix', deliver, '/tmp/test.sock'),
+                              UnixSocketBackplane)
+        with self.assertRaises(ValueError):
+            create_backplane('redis', deliver, '')
+
+
+class UnixSocketBackplaneTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'backplane.sock')
+        self.received = [[], [], []]
+        self.processes = [UnixSocketBackplane(self._deliver(received), self.path)
+                          for received in self.received]
+        for process in self.processes:
+            await process.start()
+
+    async def asyncTearDown(self) -> None:
+        for process in self.processes:
+            await process.stop()
+        self.directory.cleanup()
+
+    @staticmethod
+    def _deliver(received: list):
+        async def deliver(room_id, event):
+            received.append((room_id, event))
+        return deliver
+
+    @staticmethod
+    async def _wait(condition) -> None:
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+
+    async def test_one_relay(self):
+        self.assertEqual([True, False, False], [process.relay for process in self.processes])
+
+    async def test_publish_reaches_all_processes(self):
+        event = RoomStartedEvent()
+        await self.processes[1].publish('1', event)
+        await self.processes[1].publish('2', event)
+        await self.processes[0].publish('3', event)
+        for received in self.received:
+            await self._wait(lambda: len(received) == 3)
+            self.assertEqual(['1', '2'], [room_id for room_id, _ in received if room_id != '3'])
+            self.assertIn(('3', event), received)
+
+    async def test_relay_taken_over(self):
+        await self.processes[0].stop()
+        remaining = self.processes[1:]
+        await self._wait(lambda: any(process.relay and process._peers for process in remaining))
+        event = RoomStartedEvent()
+        await self.processes[2].publish('1', event)
+        for received in self.received[1:]:
+            await self._wait(lambda: received)
+            self.assertEqual([('1', event)], received)
+        self.assertEqual([], self.received[0])
+        self.assertEqual(1, [process.relay for process in self.processes[1:]].count(True))
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from whist_core.cards.card import Card, Rank, Suit
+from whist_core.user.player import Player
+
+from whist_server.database.command import NextHandCommand, PlayCardCommand, ReadyCommand, \
+    UnreadyCommand
+from whist_server.web_socket.client_request import ClientRequest, PlayCardRequest, \
+    parse_request
+
+
+class ClientRequestTestCase(TestCase):
+    def setUp(self) -> None:
+        self.player = Player(username='test', rating=1200)
+
+    def test_play_card(self):
+        request = parse_request('{"type": "play_card", "request_id": "1", '
+                                '"card": {"suit": "hearts", "rank": "queen"}}')
+        self.assertIsInstance(request, PlayCardRequest)
+        self.assertEqual('1', request.request_id)
+        card = Card(suit=Suit.HEARTS, rank=Rank.Q)
+        self.assertEqual(PlayCardCommand(player=self.player, card=card),
+                         request.command(self.player))
+
+    def test_commands(self):
+        for request_type, command in [('ready', ReadyCommand(player=self.player)),
+                                      ('unready', UnreadyCommand(player=self.player)),
+                                      ('next_hand', NextHandCommand())]:
+            request = parse_request(f'{{"type": "{request_type}", "request_id": "2"}}')
+            self.assertEqual(command, request.command(self.player))
+
+    def test_invalid(self):
+        for message in ['ready', '[]', '{"type": "shuffle", "request_id": "3"}',
+                        '{"type": "ready"}', '{"type": "play_card", "request_id": "4"}',
+                        '{"type": [], "request_id": "6"}', '{"type": {}, "request_id": "7"}']:
+            with self.assertRaises(ValueError):
+                parse_request(message)
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            ClientRequest(type='ready', request_id='5')
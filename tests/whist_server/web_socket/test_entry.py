@@ -1,5 +1,5 @@
 from unittest import skip
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from tests.whist_server.base_token_case import TestCaseWithToken
 from whist_server import app
@@ -28,7 +28,7 @@ class EntryTestCase(TestCaseWithToken):
     @skip('Probably bug in Test Client')
     def test_subscribe(self):
         self.game_mock.has_joined = MagicMock(return_value=True)
-        self.room_service_mock.get = MagicMock(return_value=self.game_mock)
+        self.room_service_mock.get = AsyncMock(return_value=self.game_mock)
         app.dependency_overrides[RoomDatabaseService] = lambda: self.room_service_mock
         with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
             websocket.send_text(self.token)
@@ -38,7 +38,7 @@ class EntryTestCase(TestCaseWithToken):
 
     @skip('Probably bug in Test Client')
     def test_subscribe_room_not_exists(self):
-        self.room_service_mock.get = MagicMock(side_effect=RoomNotFoundError)
+        self.room_service_mock.get = AsyncMock(side_effect=RoomNotFoundError)
         app.dependency_overrides[RoomDatabaseService] = lambda: self.room_service_mock
         with self.client.websocket_connect(f'/room/{self.room_id}1') as websocket:
             websocket.send_text(self.token)
@@ -49,7 +49,7 @@ class EntryTestCase(TestCaseWithToken):
     @skip('Probably bug in Test Client')
     def test_subscribe_not_joined(self):
         self.game_mock.has_joined = MagicMock(return_value=False)
-        self.room_service_mock.get = MagicMock(return_value=self.game_mock)
+        self.room_service_mock.get = AsyncMock(return_value=self.game_mock)
         app.dependency_overrides[RoomDatabaseService] = lambda: self.room_service_mock
         with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
             websocket.send_text(self.token)
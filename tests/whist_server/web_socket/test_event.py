@@ -1,9 +1,11 @@
+import json
 from unittest import TestCase
 
 from whist_core.cards.card import Card, Suit, Rank
 from whist_core.user.player import Player
+from whist_server.database.room import RoomInDb
 from whist_server.web_socket.events.event import PlayerJoinedEvent, RoomStartedEvent, \
-    CardPlayedEvent
+    CardPlayedEvent, RoomSnapshotEvent, HeartbeatEvent
 
 
 class EventTestCase(TestCase):
@@ -30,3 +32,22 @@ class EventTestCase(TestCase):
     def test_card_played_name(self):
         event = CardPlayedEvent(card=self.card, player=self.player)
         self.assertEqual('CardPlayedEvent', event.name)
+
+    def test_card_played_encode(self):
+        event = CardPlayedEvent(sequence=3, card=self.card, player=self.player)
+        self.assertEqual({'name': 'CardPlayedEvent', 'sequence': 3,
+                          'event': json.loads(event.json(exclude={'sequence', 'recipient'}))},
+                         json.loads(event.encode()))
+
+    def test_heartbeat_encode(self):
+        self.assertEqual({'name': 'HeartbeatEvent', 'sequence': 0, 'event': {}},
+                         json.loads(HeartbeatEvent().encode()))
+
+    def test_room_snapshot(self):
+        room = RoomInDb(**RoomInDb.create('test', self.player, 1, 4).dict())
+        room.event_sequence = 7
+        event = RoomSnapshotEvent.from_room(room, self.player)
+        self.assertEqual(7, event.sequence)
+        self.assertEqual(room.get_info(), event.room)
+        self.assertIsNone(event.stack)
+        self.assertIsNone(event.hand)
@@ -1,16 +1,20 @@
+import json
 from threading import Thread
 from time import sleep
 from unittest import TestCase
 from unittest.mock import patch, PropertyMock
 
 import pytest
+from starlette import status
 from starlette.testclient import TestClient
 from whist_core.cards.card_container import UnorderedCardContainer
 
+from tests.whist_server.drop_collections import drop_collections
 from whist_server import app
-from whist_server.database import db
+from whist_server.services.channel_service import ChannelService
 from whist_server.web_socket.events.event import PlayerJoinedEvent, CardPlayedEvent, \
     RoomStartedEvent, TrickDoneEvent
+from whist_server.web_socket.side_channel import SideChannel
 
 
 class NotificationTestCase(TestCase):
@@ -20,8 +24,7 @@ class NotificationTestCase(TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
-        db.user.drop()
-        db.room.drop()
+        drop_collections('user', 'room')
         cls.client = TestClient(app)
         cls.token = cls.create_and_auth_user('ws_user', '123')
         cls.headers = cls.create_and_auth_user('miles', 'abc')
@@ -34,13 +37,13 @@ class NotificationTestCase(TestCase):
         return {'Authorization': f'Bearer {token}'}
 
     def setUp(self) -> None:
-        db.room.drop()
+        drop_collections('room')
         data = {'room_name': 'test', 'password': 'abc', 'min_player': 1}
         response = self.client.post(url='/room/create', json=data, headers=self.token)
         self.room_id = response.json()['room_id']
 
     def tearDown(self) -> None:
-        db.room.drop()
+        drop_collections('room')
 
     @pytest.mark.integtest
     def test_join_notification(self):
@@ -119,6 +122,7 @@ class NotificationTestCase(TestCase):
         def call_noti(results):
             _ = websocket.receive_json()  # player joined
             _ = websocket.receive_json()  # room started
+            _ = websocket.receive_json()  # hand dealt
             notification = websocket.receive_json()
             results.append(notification)
 
@@ -160,6 +164,7 @@ class NotificationTestCase(TestCase):
         def call_noti(results):
             _ = websocket.receive_json()  # player joined
             _ = websocket.receive_json()  # room started
+            _ = websocket.receive_json()  # hand dealt
             card_played = websocket.receive_json()
             done_not = websocket.receive_json()
             results.append(card_played)
@@ -200,3 +205,127 @@ class NotificationTestCase(TestCase):
             self.assertIsInstance(event, CardPlayedEvent)
             event = TrickDoneEvent(**notification[1]['event'])
             self.assertIsInstance(event, TrickDoneEvent)
+
+    @pytest.mark.integtest
+    def test_ping(self):
+        with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
+            websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+            assert '200' == websocket.receive_text()
+            websocket.send_text('ping')
+            self.assertEqual('HeartbeatEvent', websocket.receive_json()['name'])
+
+    @pytest.mark.integtest
+    def test_disconnect_detached(self):
+        with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
+            websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+            assert '200' == websocket.receive_text()
+            connections = ChannelService.stats()['subscribers_per_room']
+            self.assertEqual(1, connections[self.room_id])
+        for _ in range(100):
+            if self.room_id not in ChannelService.stats()['subscribers_per_room']:
+                break
+            sleep(0.01)
+        self.assertNotIn(self.room_id, ChannelService.stats()['subscribers_per_room'])
+
+    @pytest.mark.integtest
+    def test_idle_timeout(self):
+        with patch('whist_server.web_socket.entry.WEBSOCKET_HEARTBEAT_INTERVAL', 0.05), \
+                patch('whist_server.web_socket.entry.WEBSOCKET_IDLE_TIMEOUT', 0.2):
+            with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
+                websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+                assert '200' == websocket.receive_text()
+                self.assertEqual('HeartbeatEvent', websocket.receive_json()['name'])
+                message = websocket.receive()
+                while message['type'] != 'websocket.close':
+                    self.assertEqual('HeartbeatEvent', json.loads(message['text'])['name'])
+                    message = websocket.receive()
+                self.assertEqual(status.WS_1001_GOING_AWAY, message['code'])
+
+    @pytest.mark.integtest
+    def test_heartbeat_answered(self):
+        with patch('whist_server.web_socket.entry.WEBSOCKET_HEARTBEAT_INTERVAL', 0.05), \
+                patch('whist_server.web_socket.entry.WEBSOCKET_IDLE_TIMEOUT', 0.2):
+            with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
+                websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+                assert '200' == websocket.receive_text()
+                for _ in range(10):
+                    self.assertEqual('HeartbeatEvent', websocket.receive_json()['name'])
+                    websocket.send_text('pong')
+                self.assertEqual(1, ChannelService.stats()['subscribers_per_room'][self.room_id])
+
+    @pytest.mark.integtest
+    def test_resume(self):
+        self.client.post(url=f'/room/join/{self.room_id}', json={'password': 'abc'},
+                         headers=self.headers)
+        with self.client.websocket_connect(f'/room/{self.room_id}?last_sequence=0') as websocket:
+            websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+            assert '200' == websocket.receive_text()
+            notification = websocket.receive_json()
+            self.assertEqual('PlayerJoinedEvent', notification['name'])
+            self.assertEqual(1, notification['sequence'])
+
+    @pytest.mark.integtest
+    def test_resume_snapshot(self):
+        self.client.post(url=f'/room/join/{self.room_id}', json={'password': 'abc'},
+                         headers=self.headers)
+        url = f'/room/{self.room_id}?last_sequence=0'
+        with patch.object(SideChannel, 'resume', return_value=False), \
+                self.client.websocket_connect(url) as websocket:
+            websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+            assert '200' == websocket.receive_text()
+            notification = websocket.receive_json()
+            self.assertEqual('RoomSnapshotEvent', notification['name'])
+            self.assertEqual(1, notification['sequence'])
+            self.assertEqual(2, len(notification['event']['room']['players']))
+
+    @pytest.mark.integtest
+    def test_commands(self):
+        self.client.post(url=f'/room/join/{self.room_id}', json={'password': 'abc'},
+                         headers=self.headers)
+        with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
+            websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+            assert '200' == websocket.receive_text()
+            websocket.send_json({'type': 'ready', 'request_id': '1'})
+            ack = websocket.receive_json()
+            self.assertEqual({'request_id': '1', 'ok': True, 'result': None, 'error': None},
+                             ack['event'])
+            self.client.post(url=f'/room/action/ready/{self.room_id}', headers=self.headers)
+            self.client.post(url=f'/room/action/start/{self.room_id}', headers=self.token,
+                             json={'matcher_type': 'robin'})
+            self.assertEqual('RoomStartedEvent', websocket.receive_json()['name'])
+            dealt = websocket.receive_json()
+            self.assertEqual('HandDealtEvent', dealt['name'])
+            card = UnorderedCardContainer(**dealt['event']['hand']).cards[0]
+            websocket.send_json({'type': 'play_card', 'request_id': '2', 'card': card.dict()})
+            event = websocket.receive_json()
+            self.assertEqual('CardPlayedEvent', event['name'])
+            ack = websocket.receive_json()
+            self.assertEqual('CommandAckEvent', ack['name'])
+            self.assertTrue(ack['event']['ok'])
+            self.assertEqual([card.dict()], ack['event']['result']['cards'])
+            websocket.send_json({'type': 'play_card', 'request_id': '3', 'card': card.dict()})
+            ack = websocket.receive_json()
+            self.assertEqual({'request_id': '3', 'ok': False, 'result': None,
+                              'error': 'NotPlayersTurnError'}, ack['event'])
+            websocket.send_text('shuffle')
+            self.assertEqual('InvalidRequest', websocket.receive_json()['event']['error'])
+
+    @pytest.mark.integtest
+    def test_hand_dealt(self):
+        self.client.post(url=f'/room/join/{self.room_id}', json={'password': 'abc'},
+                         headers=self.headers)
+        self.client.post(url=f'/room/action/ready/{self.room_id}', headers=self.headers)
+        self.client.post(url=f'/room/action/ready/{self.room_id}', headers=self.token)
+        with self.client.websocket_connect(f'/room/{self.room_id}') as websocket:
+            websocket.send_text(self.token['Authorization'].rsplit('Bearer ')[1])
+            assert '200' == websocket.receive_text()
+            self.client.post(url=f'/room/action/start/{self.room_id}', headers=self.token,
+                             json={'matcher_type': 'robin'})
+            self.assertEqual('RoomStartedEvent', websocket.receive_json()['name'])
+            dealt = websocket.receive_json()
+            self.assertEqual('HandDealtEvent', dealt['name'])
+            response = self.client.get(url=f'/room/trick/hand/{self.room_id}',
+                                       headers=self.token)
+            self.assertEqual(response.json(), dealt['event']['hand'])
+            websocket.send_text('ping')
+            self.assertEqual('HeartbeatEvent', websocket.receive_json()['name'])
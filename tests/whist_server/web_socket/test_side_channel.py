@@ -1,34 +1,179 @@
 import asyncio
+import json
 from unittest import TestCase
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock, patch
 
+from whist_core.cards.card import Card, Rank, Suit
+from whist_core.cards.card_container import UnorderedCardContainer
 from whist_core.user.player import Player
 
-from whist_server.web_socket.events.event import PlayerJoinedEvent
+from whist_server.web_socket.events.event import HandDealtEvent, PlayerJoinedEvent
 from whist_server.web_socket.side_channel import SideChannel
 from whist_server.web_socket.subscriber import Subscriber
 
 
 class TestCase(TestCase):
     def setUp(self):
-        self.connection_mock = MagicMock(send_json=AsyncMock())
+        self.connection_mock = MagicMock(send_text=AsyncMock())
         self.subscriber = Subscriber(self.connection_mock)
         player = Player(username='ititus', rating=100)
         self.event = PlayerJoinedEvent(player=player)
         self.side_channel = SideChannel()
 
+    def _notify(self, channel: SideChannel, *subscribers: Subscriber, times: int = 1) -> None:
+        async def notify():
+            for _ in range(times):
+                await channel.notify(self.event)
+            for subscriber in subscribers:
+                await subscriber.flush()
+
+        asyncio.run(notify())
+
     def test_send_joined(self):
         self.side_channel.attach(self.subscriber)
-        asyncio.run(self.side_channel.notify(self.event))
-        self.connection_mock.send_json.assert_called_with(
-            {'name': self.event.name, 'event': self.event.dict()})
+        self._notify(self.side_channel, self.subscriber)
+        self.connection_mock.send_text.assert_called_once()
+        message = self.connection_mock.send_text.call_args.args[0]
+        self.assertEqual({'name': self.event.name, 'sequence': 0,
+                          'event': self.event.dict(exclude={'sequence', 'recipient'})},
+                         json.loads(message))
 
     def test_send_not_joined(self):
-        asyncio.run(self.side_channel.notify(self.event))
-        self.connection_mock.send_json.send_json.assert_not_called()
+        self._notify(self.side_channel, self.subscriber)
+        self.connection_mock.send_text.assert_not_called()
 
     def test_send_left(self):
         self.side_channel.attach(self.subscriber)
         self.side_channel.remove(self.subscriber)
-        asyncio.run(self.side_channel.notify(self.event))
-        self.connection_mock.send_json.send_json.assert_not_called()
+        self._notify(self.side_channel, self.subscriber)
+        self.connection_mock.send_text.assert_not_called()
+
+    def test_channels_separated(self):
+        self.side_channel.attach(self.subscriber)
+        other_channel = SideChannel()
+        self._notify(other_channel, self.subscriber)
+        self.connection_mock.send_text.assert_not_called()
+        self.assertEqual(1, len(self.side_channel))
+        self.assertEqual(0, len(other_channel))
+
+    def test_failed_subscriber_removed(self):
+        failing = Subscriber(MagicMock(send_text=AsyncMock(side_effect=RuntimeError),
+                                       close=AsyncMock()))
+        self.side_channel.attach(failing)
+        self.side_channel.attach(self.subscriber)
+        self._notify(self.side_channel, failing, self.subscriber)
+        self.assertTrue(failing.closed)
+        self._notify(self.side_channel, self.subscriber)
+        self.assertEqual(2, self.connection_mock.send_text.await_count)
+        self.assertEqual(1, len(self.side_channel))
+
+    def test_slow_subscriber_not_waited_for(self):
+        async def block(_):
+            await asyncio.sleep(10)
+
+        slow = Subscriber(MagicMock(send_text=block, close=AsyncMock()), queue_size=2)
+        self.side_channel.attach(slow)
+        self.side_channel.attach(self.subscriber)
+        self._notify(self.side_channel, self.subscriber, times=4)
+        self.assertEqual(4, self.connection_mock.send_text.await_count)
+        self.assertTrue(slow.closed)
+        self.assertEqual([0], self.side_channel.queue_depths())
+
+    def test_encoded_once(self):
+        connections = [MagicMock(send_text=AsyncMock()) for _ in range(3)]
+        subscribers = [Subscriber(connection) for connection in connections]
+        for subscriber in subscribers:
+            self.side_channel.attach(subscriber)
+        with patch.object(PlayerJoinedEvent, 'encode', wraps=self.event.encode) as encode:
+            self._notify(self.side_channel, *subscribers)
+        encode.assert_called_once()
+        frames = [connection.send_text.call_args.args[0] for connection in connections]
+        self.assertTrue(all(frame is frames[0] for frame in frames))
+
+    def _events(self, channel: SideChannel, sequences) -> None:
+        async def notify():
+            for sequence in sequences:
+                await channel.notify(PlayerJoinedEvent(sequence=sequence,
+                                                       player=self.event.player))
+
+        asyncio.run(notify())
+
+    def _resumed(self, channel: SideChannel, last_sequence: int, room_sequence: int):
+        subscriber = MagicMock()
+        resumed = channel.resume(subscriber, last_sequence, room_sequence)
+        sequences = [json.loads(call.args[0])['sequence'] for call in subscriber.put.call_args_list]
+        return resumed, sequences
+
+    def test_close(self):
+        subscribers = [MagicMock(), MagicMock()]
+        for subscriber in subscribers:
+            self.side_channel.attach(subscriber)
+        self.side_channel.close(1001)
+        for subscriber in subscribers:
+            subscriber.finish.assert_called_once_with(1001)
+        self.assertEqual(0, len(self.side_channel))
+
+    def test_resume(self):
+        self._events(self.side_channel, range(1, 6))
+        self.assertEqual((True, [4, 5]), self._resumed(self.side_channel, 3, 5))
+        self.assertEqual((True, []), self._resumed(self.side_channel, 5, 5))
+
+    def test_resume_not_buffered(self):
+        side_channel = SideChannel(replay_size=2)
+        self._events(side_channel, range(1, 6))
+        self.assertEqual((False, []), self._resumed(side_channel, 2, 5))
+        self.assertEqual((True, [5]), self._resumed(side_channel, 4, 5))
+        self.assertEqual((False, []), self._resumed(side_channel, 4, 6))
+        self.assertEqual((False, []), self._resumed(SideChannel(), 4, 5))
+
+    def test_private_event(self):
+        owner_connection = MagicMock(send_text=AsyncMock())
+        owner = Subscriber(owner_connection, Player(username='owner', rating=1200))
+        other = Subscriber(self.connection_mock, Player(username='other', rating=1200))
+        self.side_channel.attach(owner)
+        self.side_channel.attach(other)
+        hand = UnorderedCardContainer.with_cards(Card(suit=Suit.HEARTS, rank=Rank.Q))
+        event = HandDealtEvent(sequence=1, recipient='owner', hand=hand)
+
+        async def notify():
+            await self.side_channel.notify(event)
+            await owner.flush()
+            await other.flush()
+
+        asyncio.run(notify())
+        self.connection_mock.send_text.assert_not_called()
+        message = json.loads(owner_connection.send_text.call_args.args[0])
+        self.assertEqual(json.loads(hand.json()), message['event']['hand'])
+        self.assertNotIn('recipient', message['event'])
+        owner, other = MagicMock(), MagicMock()
+        owner.receives.side_effect = lambda recipient: recipient in (None, 'owner')
+        other.receives.side_effect = lambda recipient: recipient is None
+        self.assertTrue(self.side_channel.resume(owner, 0, 1))
+        self.assertTrue(self.side_channel.resume(other, 0, 1))
+        owner.put.assert_called_once()
+        other.put.assert_not_called()
+
+    def test_acknowledge_after_events(self):
+        subscriber = MagicMock()
+        subscriber.receives.return_value = True
+        self.side_channel.attach(subscriber)
+        self.assertFalse(self.side_channel.acknowledge(subscriber, 'ack', 'ack', 2))
+        self._events(self.side_channel, [1])
+        self.assertFalse(self.side_channel.acknowledge(subscriber, 'next', 'ack', 0))
+        self._events(self.side_channel, [2])
+        frames = [call.args[0] for call in subscriber.put.call_args_list]
+        self.assertEqual([1, 2], [json.loads(frame)['sequence'] for frame in frames[:2]])
+        self.assertEqual(['ack', 'next'], frames[2:])
+        self.assertTrue(self.side_channel.acknowledge(subscriber, 'done', 'ack', 2))
+        subscriber.put.assert_called_with('done', 'ack')
+
+    def test_release_acknowledgement(self):
+        subscriber, other = MagicMock(), MagicMock()
+        self.side_channel.acknowledge(subscriber, 'ack', 'ack', 3)
+        self.side_channel.acknowledge(other, 'other', 'ack', 3)
+        self.side_channel.release(subscriber)
+        subscriber.put.assert_called_once_with('ack', 'ack')
+        other.put.assert_not_called()
+        self.side_channel.remove(other)
+        self._events(self.side_channel, [3])
+        other.put.assert_not_called()
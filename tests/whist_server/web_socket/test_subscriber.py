@@ -1,18 +1,105 @@
 import asyncio
+import json
 from unittest import TestCase
 from unittest.mock import MagicMock, AsyncMock
 
+from whist_core.user.player import Player
+
 from whist_server.web_socket.events.event import Event
-from whist_server.web_socket.subscriber import Subscriber
+from whist_server.web_socket.subscriber import COALESCE, DISCONNECT, DROP_OLDEST, \
+    SLOW_CONSUMER_CLOSE_CODE, Subscriber
 
 
 class SubscriberTestCase(TestCase):
     def setUp(self) -> None:
-        self.connection_mock = MagicMock(send_json=AsyncMock())
+        self.connection_mock = MagicMock(send_text=AsyncMock())
         self.subscriber = Subscriber(self.connection_mock)
 
     def test_send(self):
         event = Event()
         asyncio.run(self.subscriber.send(event))
-        self.connection_mock.send_json.assert_called_with(
-            {'name': event.name, 'event': event.dict()})
+        self.connection_mock.send_text.assert_called_once()
+        message = self.connection_mock.send_text.call_args.args[0]
+        self.assertEqual({'name': event.name, 'sequence': 0,
+                          'event': event.dict(exclude={'sequence', 'recipient'})},
+                         json.loads(message))
+
+    def test_put(self):
+        async def put():
+            self.assertTrue(self.subscriber.put('{}', 'Event'))
+            await self.subscriber.flush()
+
+        asyncio.run(put())
+        self.connection_mock.send_text.assert_awaited_once_with('{}')
+
+    def _overflow(self, policy: str, frames: list[tuple[str, str]]) -> list[str]:
+        subscriber = Subscriber(self.connection_mock, queue_size=2, overflow=policy)
+
+        async def put():
+            results = [subscriber.put(frame, name) for frame, name in frames]
+            await subscriber.flush()
+            return results
+
+        results = asyncio.run(put())
+        self.assertTrue(all(results))
+        return [call.args[0] for call in self.connection_mock.send_text.await_args_list]
+
+    def test_drop_oldest(self):
+        sent = self._overflow(DROP_OLDEST, [('1', 'A'), ('2', 'B'), ('3', 'A')])
+        self.assertEqual(['2', '3'], sent)
+
+    def test_coalesce(self):
+        sent = self._overflow(COALESCE, [('1', 'A'), ('2', 'B'), ('3', 'B')])
+        self.assertEqual(['1', '3'], sent)
+
+    def test_disconnect(self):
+        subscriber = Subscriber(self.connection_mock, queue_size=1, overflow=DISCONNECT)
+
+        async def put():
+            return [subscriber.put('{}', 'Event') for _ in range(2)]
+
+        self.assertEqual([True, False], asyncio.run(put()))
+        self.assertTrue(subscriber.closed)
+        self.assertEqual(0, len(subscriber))
+
+    def test_send_timeout(self):
+        async def block(_):
+            await asyncio.sleep(10)
+
+        connection = MagicMock(send_text=block, close=AsyncMock())
+        subscriber = Subscriber(connection, send_timeout=0.01)
+
+        async def put():
+            subscriber.put('{}', 'Event')
+            await asyncio.sleep(0.1)
+
+        asyncio.run(put())
+        self.assertTrue(subscriber.closed)
+        connection.close.assert_awaited_once_with(code=SLOW_CONSUMER_CLOSE_CODE)
+
+    def test_finish(self):
+        self.connection_mock.close = AsyncMock()
+
+        async def finish():
+            self.subscriber.put('1', 'A')
+            self.subscriber.put('2', 'B')
+            self.subscriber.finish(1001)
+            self.assertFalse(self.subscriber.put('3', 'A'))
+            await asyncio.sleep(0.01)
+
+        asyncio.run(finish())
+        self.assertEqual(['1', '2'], [call.args[0] for call
+                                      in self.connection_mock.send_text.await_args_list])
+        self.assertTrue(self.subscriber.closed)
+        self.connection_mock.close.assert_awaited_once_with(code=1001)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            Subscriber(self.connection_mock, overflow='block')
+
+    def test_receives(self):
+        subscriber = Subscriber(self.connection_mock, Player(username='test', rating=1200))
+        self.assertTrue(subscriber.receives(None))
+        self.assertTrue(subscriber.receives('test'))
+        self.assertFalse(subscriber.receives('other'))
+        self.assertFalse(self.subscriber.receives('test'))
@@ -1,9 +1,10 @@
 """A Whist game server using FastAPI"""
 import whist_core
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
-from whist_server.api import api
+from whist_server.api import api, metrics
 from whist_server.api.oauth2.github import router as github
 from whist_server.api.ranking.leaderboard import router as leaderboard
 from whist_server.api.room.action import router as game_action
@@ -11,24 +12,33 @@ from whist_server.api.room.create import router as game_creation
 from whist_server.api.room.game import router as game_room
 from whist_server.api.room.info import router as game_info
 from whist_server.api.room.join import router as game_join
+from whist_server.api.room.lobby import router as game_lobby
 from whist_server.api.room.trick import router as game_trick
 from whist_server.api.user import auth
 from whist_server.api.user.create import router as user_creation
 from whist_server.api.user.info import router as user_info
+from whist_server.database import db
+from whist_server.services.channel_service import ChannelService
+from whist_server.services.error import RoomVersionConflictError
 from whist_server.services.game_info_service import GameInfoService
+from whist_server.services.index_service import IndexService
+from whist_server.services.metrics_service import MetricsService
+from whist_server.services.room_collector_service import RoomCollectorService
 from whist_server.web_socket.entry import router as ws_router
 
 # remember to also update the version in pyproject.toml!
 __version__ = '0.5.0'
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.include_router(api.router)
+app.include_router(metrics.router)
 app.include_router(github)
 app.include_router(game_action)
 app.include_router(game_creation)
 app.include_router(game_room)
 app.include_router(game_info)
 app.include_router(game_join)
+app.include_router(game_lobby)
 app.include_router(game_trick)
 app.include_router(leaderboard)
 app.include_router(user_creation)
@@ -40,6 +50,61 @@ app.add_middleware(CORSMiddleware,
                    allow_credentials=True,
                    allow_methods=['*'],
                    allow_headers=['*'])
+
+
+@app.on_event('startup')
+async def connect_database():
+    """
+    Connects the database client and its connection pool.
+    """
+    db.connect()
+
+
+@app.on_event('startup')
+async def connect_channels():
+    """
+    Connects the side channels to the other server processes.
+    """
+    await ChannelService().start()
+
+
+@app.on_event('startup')
+async def ensure_indexes():
+    """
+    Creates missing unique indexes before the server starts serving and fails the start if one
+    cannot be created. The other indexes are created in the background.
+    """
+    await IndexService.ensure_unique()
+    IndexService.ensure_in_background()
+
+
+@app.on_event('startup')
+async def collect_rooms():
+    """
+    Starts archiving idle rooms in the background.
+    """
+    RoomCollectorService().start()
+
+
+@app.on_event('shutdown')
+async def close_database():
+    """
+    Closes the database client and its connection pool.
+    """
+    RoomCollectorService().stop()
+    await ChannelService().stop()
+    db.close()
+
+
+@app.exception_handler(RoomVersionConflictError)
+async def room_version_conflict_handler(_: Request, error: RoomVersionConflictError):
+    """
+    Replies with 409 if a room keeps being modified concurrently by other server processes.
+    """
+    return ORJSONResponse(status_code=status.HTTP_409_CONFLICT, content={'detail': str(error)})
+
+
+MetricsService().register('database', lambda: db.stats)
 game_info_db_service = GameInfoService()
 
 game_info = {
@@ -10,7 +10,7 @@ router = APIRouter()
 
 
 @router.get('/')
-def read_root():
+async def read_root():
     """
     Index route of the server.
     :return: The game the server can host.
@@ -0,0 +1,16 @@
+"""'/metrics' api"""
+from fastapi import APIRouter, Depends
+
+from whist_server.services.metrics_service import MetricsService
+
+router = APIRouter()
+
+
+@router.get('/metrics')
+async def read_metrics(metrics_service=Depends(MetricsService)) -> dict:
+    """
+    Returns the runtime metrics of this server process.
+    :param metrics_service: Dependency injection of the metrics service.
+    :return: dictionary of counters, gauges and registered collectors.
+    """
+    return metrics_service.collect()
@@ -38,7 +38,7 @@ async def swap_token(data: SwapTokenRequestData, github_service=Depends(GitHubAP
     """
     auth_token = await github_service.get_github_token(data.code)
     gh_id = await github_service.get_github_id(auth_token)
-    user = user_db_service.get_from_github(gh_id)
+    user = await user_db_service.get_from_github(gh_id)
     token_request = {'sub': user.username}
     token = authentication.create_access_token(token_request)
     return AccessToken(access_token=token, token_type='Bearer')  # nosec B106
@@ -59,11 +59,11 @@ async def device_code_swap(data: SwapDeviceCodeRequestData,
     github_id = await github_service.get_github_id(auth_token)
 
     try:
-        user = user_db_service.get_from_github(github_id)
+        user = await user_db_service.get_from_github(github_id)
     except UserNotFoundError:
         gh_username = await github_service.get_github_username(auth_token)
         user = UserInDb(github_id=github_id, github_username=gh_username, username=gh_username)
-        _ = user_db_service.add(user)
+        _ = await user_db_service.add(user)
     token_request = {'sub': user.username}
     token = authentication.create_access_token(token_request)
     return AccessToken(access_token=token, token_type='Bearer')  # nosec B106
@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Depends, Security
 from whist_core.user.player import Player
 
+from whist_server.api.util import model_response
 from whist_server.services.authentication import get_current_user
 from whist_server.services.ranking_service import RankingService
 
@@ -9,9 +10,9 @@ router = APIRouter(prefix='/leaderboard')
 
 
 @router.get('/', response_model=list[Player])
-def get_ranking_by(order: str, start: int = 0, amount: int = 0,
-                   _: Player = Security(get_current_user),
-                   ranking_service=Depends(RankingService)) -> list[Player]:
+async def get_ranking_by(order: str, start: int = 0, amount: int = 0,
+                         _: Player = Security(get_current_user),
+                         ranking_service=Depends(RankingService)) -> list[Player]:
     """
     Retrieves a ranking of the players by selected order.
     :param order: either 'ascending' or 'descending'
@@ -21,5 +22,5 @@ def get_ranking_by(order: str, start: int = 0, amount: int = 0,
     :param ranking_service: Dependency injection of ranking service.
     :return: sorted list of players in chosen order
     """
-    leaderboard = ranking_service.select(order, amount, start)
-    return leaderboard
+    leaderboard = await ranking_service.select(order, amount, start)
+    return model_response(leaderboard)
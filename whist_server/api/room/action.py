@@ -8,15 +8,15 @@ from whist_core.session.matcher import RandomMatcher, RoundRobinMatcher, Matcher
 from whist_core.user.player import Player
 
 from whist_server.api.util import create_http_error
+from whist_server.database.command import ReadyCommand, StartCommand, UnreadyCommand
 from whist_server.database.error import PlayerNotCreatorError
-from whist_server.database.room import RoomInDb
 from whist_server.services.authentication import get_current_user
 from whist_server.services.channel_service import ChannelService
 from whist_server.services.error import RoomNotFoundError
 from whist_server.services.error import UserNotReadyError
+from whist_server.services.room_actor_service import RoomActorService
 from whist_server.services.room_db_service import RoomDatabaseService
 from whist_server.services.splunk_service import SplunkService, SplunkEvent
-from whist_server.web_socket.events.event import RoomStartedEvent
 
 router = APIRouter(prefix='/room')
 
@@ -38,11 +38,12 @@ class StartModel(BaseModel):
 # Most of them are injections.
 # pylint: disable=too-many-arguments
 @router.post('/action/start/{room_id}', status_code=200)
-def start_room(room_id: str, model: StartModel, background_tasks: BackgroundTasks,
-               user: Player = Security(get_current_user),
-               room_service=Depends(RoomDatabaseService),
-               channel_service: ChannelService = Depends(ChannelService),
-               splunk_service: SplunkService = Depends(SplunkService)) -> dict:
+async def start_room(room_id: str, model: StartModel, background_tasks: BackgroundTasks,
+                     user: Player = Security(get_current_user),
+                     room_service=Depends(RoomDatabaseService),
+                     channel_service: ChannelService = Depends(ChannelService),
+                     splunk_service: SplunkService = Depends(SplunkService),
+                     actor_service: RoomActorService = Depends(RoomActorService)) -> dict:
     """
     Allows the creator of the table to start it.
     :param room_id: unique identifier of the room
@@ -53,21 +54,19 @@ def start_room(room_id: str, model: StartModel, background_tasks: BackgroundTask
     database.
     :param channel_service: Injection of the websocket channel manager.
     :param splunk_service: Injection of the Splunk Service.
+    :param actor_service: Injection of the room actors. Applies the start to the room.
     :return: dictionary containing the status of whether the table has been started or not.
     Raises 403 exception if the user has not the appropriate privileges.
     """
-    room: RoomInDb = room_service.get(room_id)
-
+    command = StartCommand(player=user, matcher_type=model.matcher_type)
     try:
-        room.start(user, model.matcher)
-        room.current_rubber.current_game().next_hand()
-        room_service.save(room)
+        await actor_service.submit(room_id, command, room_service, channel_service)
         if splunk_service.available:
+            room = await room_service.get(room_id)
             event = SplunkEvent(f'Room: {room.room_name}', source='Whist Server',
                                 source_type='Room Started')
 
-            splunk_service.write_event(event)
-        background_tasks.add_task(channel_service.notify, room_id, RoomStartedEvent())
+            background_tasks.add_task(splunk_service.write_event, event)
     except PlayerNotCreatorError as start_exception:
         message = 'Player has not administrator rights at this table.'
         raise create_http_error(message, status.HTTP_403_FORBIDDEN) from start_exception
@@ -79,22 +78,24 @@ def start_room(room_id: str, model: StartModel, background_tasks: BackgroundTask
 
 
 @router.post('/action/ready/{room_id}', status_code=200)
-def ready_player(room_id: str, user: Player = Security(get_current_user),
-                 room_service=Depends(RoomDatabaseService)) -> dict:
+async def ready_player(room_id: str, user: Player = Security(get_current_user),
+                       room_service=Depends(RoomDatabaseService),
+                       channel_service: ChannelService = Depends(ChannelService),
+                       actor_service: RoomActorService = Depends(RoomActorService)) -> dict:
     """
     A player can mark theyself to be ready.
     :param room_id: unique identifier of the room
     :param user: Required to identify the user.
     :param room_service: Injection of the room database service. Requires to interact with the
     database.
+    :param channel_service: Injection of the websocket channel manager.
+    :param actor_service: Injection of the room actors. Applies the change to the room.
     :return: dictionary containing the status of whether the action was successful.
     Raises 403 exception if the user has not be joined yet.
     """
-    room = room_service.get(room_id)
-
+    command = ReadyCommand(player=user)
     try:
-        room.ready_player(user)
-        room_service.save(room)
+        await actor_service.submit(room_id, command, room_service, channel_service)
     except PlayerNotJoinedError as ready_error:
         message = 'Player has not joined the table yet.'
         raise create_http_error(message, status.HTTP_403_FORBIDDEN) from ready_error
@@ -102,24 +103,26 @@ def ready_player(room_id: str, user: Player = Security(get_current_user),
 
 
 @router.post('/action/unready/{room_id}', status_code=200)
-def unready_player(room_id: str, user: Player = Security(get_current_user),
-                   room_service=Depends(RoomDatabaseService)) -> dict:
+async def unready_player(room_id: str, user: Player = Security(get_current_user),
+                         room_service=Depends(RoomDatabaseService),
+                         channel_service: ChannelService = Depends(ChannelService),
+                         actor_service: RoomActorService = Depends(RoomActorService)) -> dict:
     """
     A player can mark themself to be unready.
     :param room_id: unique identifier of the room
     :param user: Required to identify the user.
     :param room_service: Injection of the room database service. Requires to interact with the
     database.
+    :param channel_service: Injection of the websocket channel manager.
+    :param actor_service: Injection of the room actors. Applies the change to the room.
     :return: dictionary containing the status of whether the action was successful.
     Raises 403 exception if the user has not be joined yet.
     Raises 404 exception if room_id is not found
     Raises 400 exception if player is not ready
     """
-    room = room_service.get(room_id)
-
+    command = UnreadyCommand(player=user)
     try:
-        room.unready_player(user)
-        room_service.save(room)
+        await actor_service.submit(room_id, command, room_service, channel_service)
     except PlayerNotJoinedError as join_error:
         message = 'Player not joined yet.'
         raise create_http_error(message, status.HTTP_403_FORBIDDEN) from join_error
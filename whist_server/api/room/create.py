@@ -3,6 +3,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Security
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from whist_core.user.player import Player
 
 from whist_server.services.authentication import get_current_user
@@ -28,10 +29,11 @@ class CreateRoomArgs(BaseModel):
 # Most of them are injections.
 # pylint: disable=too-many-arguments
 @router.post('/create', status_code=200)
-def create_game(request: CreateRoomArgs, user: Player = Security(get_current_user),
-                room_service=Depends(RoomDatabaseService), pwd_service=Depends(PasswordService),
-                channel_service: ChannelService = Depends(ChannelService),
-                splunk_service: SplunkService = Depends(SplunkService)):
+async def create_game(request: CreateRoomArgs, user: Player = Security(get_current_user),
+                      room_service=Depends(RoomDatabaseService),
+                      pwd_service=Depends(PasswordService),
+                      channel_service: ChannelService = Depends(ChannelService),
+                      splunk_service: SplunkService = Depends(SplunkService)):
     """
     Creates a new room of whist with the given name 'room_name' and optional password 'password'.
     The optional 'min_player' parameter controls how many people are required to start a room.
@@ -44,17 +46,19 @@ def create_game(request: CreateRoomArgs, user: Player = Security(get_current_use
     :param splunk_service: Injection of the Splunk Service.
     :return: the ID of the room instance.
     """
-    hashed_password = None if request.password is None else pwd_service.hash(request.password)
+    hashed_password = None
+    if request.password is not None:
+        hashed_password = await run_in_threadpool(pwd_service.hash, request.password)
     room = room_service.create_with_pwd(room_name=request.room_name, creator=user,
                                         hashed_password=hashed_password,
                                         min_player=request.min_player,
                                         max_player=request.max_player)
-    room_id = room_service.add(room)
+    room_id = await room_service.add(room)
     if splunk_service.available:
         event = SplunkEvent(f'Room: {room.room_name}', source='Whist Server',
                             source_type='Room Created')
 
-        splunk_service.write_event(event)
+        await run_in_threadpool(splunk_service.write_event, event)
     channel = SideChannel()
     channel_service.add(room_id, channel)
     return {'room_id': room_id}
@@ -12,36 +12,35 @@ router = APIRouter(prefix='/room')
 
 
 @router.get('/info/ids', status_code=200, response_model=dict[str, list[str]])
-def all_rooms(room_service=Depends(RoomDatabaseService),
-              _: Player = Security(get_current_user)) -> dict[str, list[str]]:
+async def all_rooms(room_service=Depends(RoomDatabaseService),
+                    _: Player = Security(get_current_user)) -> dict[str, list[str]]:
     """
     Returns all room id.
     :param room_service: Dependency injection of the room service
     :param _: not required for logic, but authentication
     :return: a list of all room ids as strings.
     """
-    rooms = room_service.all()
-    return {'rooms': [str(room.id) for room in rooms]}
+    return {'rooms': await room_service.ids()}
 
 
 @router.get('/info/{room_id}', response_model=RoomInfo)
-def room_info(room_id: str, room_service=Depends(RoomDatabaseService)) -> RoomInfo:
+async def room_info(room_id: str, room_service=Depends(RoomDatabaseService)) -> RoomInfo:
     """
-    :param room_id:
+    Returns the meta info of a room without loading the room.
+    :param room_id: of the room
     :param room_service: Dependency injection of the room service
-    :return:
+    :return: the room info
     """
     try:
-        room = room_service.get(room_id)
+        return await room_service.info(room_id)
     except RoomNotFoundError as not_found:
         message = f'Room not found with id: {room_id}'
         raise create_http_error(message, status.HTTP_400_BAD_REQUEST) from not_found
-    return room.get_info()
 
 
 @router.get('/info/id/{room_name}', status_code=200, response_model=dict[str, str])
-def room_id_from_name(room_name: str, room_service=Depends(RoomDatabaseService),
-                      user: Player = Security(get_current_user)) -> dict[str, str]:
+async def room_id_from_name(room_name: str, room_service=Depends(RoomDatabaseService),
+                            user: Player = Security(get_current_user)) -> dict[str, str]:
     """
     Returns the room id for a given room name. Basically it transforms human-readable data to
     computer data.
@@ -52,7 +51,7 @@ def room_id_from_name(room_name: str, room_service=Depends(RoomDatabaseService),
     with that name in the DB it will return RoomNotFoundError.
     """
     try:
-        room: RoomInDb = room_service.get_by_name(room_name)
+        room: RoomInDb = await room_service.get_by_name(room_name)
         if not room.has_joined(user):
             message = 'User has not access.'
             raise create_http_error(message, status.HTTP_403_FORBIDDEN)
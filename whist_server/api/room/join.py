@@ -3,21 +3,27 @@ Route to join a room.
 """
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Security, status, Depends
+from fastapi import APIRouter, Security, status, Depends
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from whist_core.error.table_error import TableFullError
 from whist_core.user.player import Player
 
 from whist_server.api.util import create_http_error
+from whist_server.database.command import JoinCommand, LeaveCommand
 from whist_server.database.error import PlayerNotJoinedError
 from whist_server.database.warning import PlayerAlreadyJoinedWarning
 from whist_server.services.authentication import get_current_user
 from whist_server.services.channel_service import ChannelService
 from whist_server.services.password import PasswordService
+from whist_server.services.room_actor_service import RoomActorService
 from whist_server.services.room_db_service import RoomDatabaseService
-from whist_server.web_socket.events.event import PlayerJoinedEvent, PlayerLeftEvent
 
 router = APIRouter(prefix='/room')
 
+# How often quick join tries another room after the chosen one filled up in the meantime.
+QUICK_JOIN_ATTEMPTS = 3
+
 
 class JoinRoomArgs(BaseModel):
     """
@@ -29,32 +35,33 @@ class JoinRoomArgs(BaseModel):
 # Most of them are injections.
 # pylint: disable=too-many-arguments
 @router.post('/join/{room_id}', status_code=200)
-def join_game(room_id: str, request: JoinRoomArgs, background_tasks: BackgroundTasks,
-              user: Player = Security(get_current_user),
-              pwd_service=Depends(PasswordService), room_service=Depends(RoomDatabaseService),
-              channel_service: ChannelService = Depends(ChannelService)):
+async def join_game(room_id: str, request: JoinRoomArgs,
+                    user: Player = Security(get_current_user),
+                    pwd_service=Depends(PasswordService), room_service=Depends(RoomDatabaseService),
+                    channel_service: ChannelService = Depends(ChannelService),
+                    actor_service: RoomActorService = Depends(RoomActorService)):
     """
     User requests to join a room.
     :param room_id: unique identifier for a room
     :param request: may contain the key 'password'
-    :param background_tasks: asynchronous handler
     :param user: that tries to join the room. Must be authenticated.
     :param pwd_service: Injection of the password service. Required to create and check passwords.
     :param room_service: Injection of the room database service. Requires to interact with the
     database.
     :param channel_service: Injection of the websocket channel manager.
+    :param actor_service: Injection of the room actors. Applies the join to the room.
     :return: the status of the join request. 'joined' for successful join
     """
-    room = room_service.get(room_id)
+    room = await room_service.get(room_id)
     if room.hashed_password is not None and (
-            request.password is None or not pwd_service.verify(request.password,
-                                                               room.hashed_password)):
+            request.password is None or not await run_in_threadpool(
+                pwd_service.verify, request.password, room.hashed_password)):
         message = "Wrong room password."
         raise create_http_error(message, status.HTTP_401_UNAUTHORIZED)
+
     try:
-        room.join(user)
-        room_service.save(room)
-        background_tasks.add_task(channel_service.notify, room_id, PlayerJoinedEvent(player=user))
+        await actor_service.submit(room_id, JoinCommand(player=user), room_service,
+                                   channel_service)
     except PlayerAlreadyJoinedWarning:
         return {'status': 'already joined'}
     return {'status': 'joined'}
@@ -63,25 +70,57 @@ def join_game(room_id: str, request: JoinRoomArgs, background_tasks: BackgroundT
 # Most of them are injections.
 # pylint: disable=too-many-arguments
 @router.post('/leave/{room_id}', status_code=200)
-def leave_game(room_id: str, background_tasks: BackgroundTasks,
-               user: Player = Security(get_current_user), room_service=Depends(RoomDatabaseService),
-               channel_service: ChannelService = Depends(ChannelService)):
+async def leave_game(room_id: str, user: Player = Security(get_current_user),
+                     room_service=Depends(RoomDatabaseService),
+                     channel_service: ChannelService = Depends(ChannelService),
+                     actor_service: RoomActorService = Depends(RoomActorService)):
     """
     User requests to leave a room.
     :param room_id: unique identifier for a room
-    :param background_tasks: asynchronous handler
     :param user: that tries to leave the room. Must be authenticated.
     :param room_service: Injection of the room database service. Requires to interact with the
     database.
     :param channel_service: Injection of the websocket channel manager.
+    :param actor_service: Injection of the room actors. Applies the leave to the room.
     :return: the status of the leave request. 'left' for successful join
     """
-    room = room_service.get(room_id)
-
     try:
-        room.leave(user)
-        room_service.save(room)
-        background_tasks.add_task(channel_service.notify, room_id, PlayerLeftEvent(player=user))
+        await actor_service.submit(room_id, LeaveCommand(player=user), room_service,
+                                   channel_service)
     except PlayerNotJoinedError as joined_error:
         raise create_http_error('Player not joined', status.HTTP_403_FORBIDDEN) from joined_error
     return {'status': 'left'}
+
+
+@router.post('/quick_join', status_code=200)
+async def quick_join(user: Player = Security(get_current_user),
+                     room_service=Depends(RoomDatabaseService),
+                     channel_service: ChannelService = Depends(ChannelService),
+                     actor_service: RoomActorService = Depends(RoomActorService)):
+    """
+    User requests to join any open room. Rooms without password that have not started and have
+    the fewest free seats are chosen first. Rooms the user has already joined are skipped. If
+    the chosen room fills up before the user joins it, another room is tried, up to
+    QUICK_JOIN_ATTEMPTS rooms.
+    :param user: that tries to join a room. Must be authenticated.
+    :param room_service: Injection of the room database service. Requires to interact with the
+    database.
+    :param channel_service: Injection of the websocket channel manager.
+    :param actor_service: Injection of the room actors. Applies the join to the room.
+    :return: the status of the join request and the id of the room. 'joined' for successful join.
+    Fails with 404 if there is no open room or all tried rooms filled up.
+    """
+    skipped_rooms = []
+    for _ in range(QUICK_JOIN_ATTEMPTS):
+        room_id = await room_service.find_open(exclude=skipped_rooms, player=user)
+        if room_id is None:
+            break
+        try:
+            await actor_service.submit(room_id, JoinCommand(player=user), room_service,
+                                       channel_service)
+        except (PlayerAlreadyJoinedWarning, TableFullError):
+            # The room filled up, or the user joined it, since it has been found.
+            skipped_rooms.append(room_id)
+            continue
+        return {'status': 'joined', 'room_id': room_id}
+    raise create_http_error('No open room found.', status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,47 @@
+"""Route of /room/lobby"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Security, status
+from pydantic import BaseModel
+from whist_core.user.player import Player
+
+from whist_server.api.util import create_http_error
+from whist_server.database.room import LobbyFilter, LobbyRoom
+from whist_server.services.authentication import get_current_user
+from whist_server.services.error import RoomNotFoundError
+from whist_server.services.room_db_service import RoomDatabaseService
+
+router = APIRouter(prefix='/room')
+
+
+class LobbyPage(BaseModel):
+    """
+    Page of the lobby listing.
+    rooms: of the page
+    next: pass as 'after' to get the next page. None on the last page.
+    """
+    rooms: list[LobbyRoom]
+    next: Optional[str] = None
+
+
+@router.get('/lobby', status_code=200, response_model=LobbyPage)
+async def lobby(lobby_filter: LobbyFilter = Depends(),
+                after: Optional[str] = None, limit: int = Query(20, ge=1, le=100),
+                room_service=Depends(RoomDatabaseService),
+                _: Player = Security(get_current_user)) -> LobbyPage:
+    """
+    Returns a page of the rooms matching the filters.
+    :param lobby_filter: filters of the rooms
+    :param after: id of the last room of the previous page
+    :param limit: maximum amount of rooms of the page
+    :param room_service: Dependency injection of the room service
+    :param _: not required for logic, but authentication
+    :return: the rooms of the page and the id to continue with
+    """
+    try:
+        rooms = await room_service.lobby(lobby_filter, after=after, limit=limit)
+    except RoomNotFoundError as not_found:
+        message = f'Room not found with id: {after}'
+        raise create_http_error(message, status.HTTP_400_BAD_REQUEST) from not_found
+    next_id = rooms[-1].id if len(rooms) == limit else None
+    return LobbyPage(rooms=rooms, next=next_id)
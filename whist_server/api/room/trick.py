@@ -1,7 +1,7 @@
 """Interaction with the current trick of a room."""
 from typing import Union
 
-from fastapi import APIRouter, BackgroundTasks, Security, Depends
+from fastapi import APIRouter, Security, Depends
 from fastapi import status
 from whist_core.cards.card import Card
 from whist_core.cards.card_container import OrderedCardContainer
@@ -11,18 +11,19 @@ from whist_core.game.player_at_table import PlayerAtTable
 from whist_core.game.warnings import TrickNotDoneWarning
 from whist_core.user.player import Player
 
-from whist_server.api.util import create_http_error
+from whist_server.api.util import create_http_error, model_response
+from whist_server.database.command import PlayCardCommand
 from whist_server.services.authentication import get_current_user
 from whist_server.services.channel_service import ChannelService
+from whist_server.services.room_actor_service import RoomActorService
 from whist_server.services.room_db_service import RoomDatabaseService
-from whist_server.web_socket.events.event import CardPlayedEvent, TrickDoneEvent
 
 router = APIRouter(prefix='/room/trick')
 
 
 @router.get('/hand/{room_id}', status_code=200, response_model=UnorderedCardContainer)
-def hand(room_id: str, user: Player = Security(get_current_user),
-         room_service=Depends(RoomDatabaseService)) -> UnorderedCardContainer:
+async def hand(room_id: str, user: Player = Security(get_current_user),
+               room_service=Depends(RoomDatabaseService)) -> UnorderedCardContainer:
     """
     Returns the current hand of player.
     :param room_id: unique identifier for which the player's hand is requested
@@ -31,52 +32,45 @@ def hand(room_id: str, user: Player = Security(get_current_user),
     database.
     :return: UnorderedCardContainer containing all cards of the player
     """
-    room = room_service.get(room_id)
+    room = await room_service.get(room_id)
 
     player = room.get_player(user)
-    return player.hand
+    return model_response(player.hand)
 
 
 # Most of them are injections.
 # pylint: disable=too-many-arguments
 @router.post('/play_card/{room_id}', status_code=200, response_model=OrderedCardContainer)
-def play_card(room_id: str, card: Card, background_tasks: BackgroundTasks,
-              user: Player = Security(get_current_user),
-              room_service=Depends(RoomDatabaseService),
-              channel_service: ChannelService = Depends(ChannelService)) -> OrderedCardContainer:
+async def play_card(room_id: str, card: Card, user: Player = Security(get_current_user),
+                    room_service=Depends(RoomDatabaseService),
+                    channel_service: ChannelService = Depends(ChannelService),
+                    actor_service: RoomActorService = Depends(RoomActorService)
+                    ) -> OrderedCardContainer:
     """
     Request to play a card for a given room.
     :param room_id: at which table the card is requested to be played
     :param card: which is requested to be played
-    :param background_tasks: asynchronous handler
     :param user: who played a card
     :param room_service: Injection of the room database service. Requires to interact with the
     database.
     :param channel_service: Injection of the websocket channel manager.
+    :param actor_service: Injection of the room actors. Plays the card in the room.
     :return: the stack after card being played if successful. If not the players turn raises error.
     """
-    room = room_service.get(room_id)
-    trick = room.current_trick()
-
+    command = PlayCardCommand(player=user, card=card)
     try:
-        player = room.get_player(user)
-        trick.play_card(player=player, card=card)
-        room_service.save(room)
-        background_tasks.add_task(channel_service.notify, room_id,
-                                  CardPlayedEvent(card=card, player=user))
-        if trick.done:
-            background_tasks.add_task(channel_service.notify, room_id,
-                                      TrickDoneEvent(winner=trick.winner))
+        stack = await actor_service.submit(room_id, command, room_service, channel_service)
     except NotPlayersTurnError as turn_error:
         message = f'It is not {user.username}\'s turn'
         raise create_http_error(message, status.HTTP_400_BAD_REQUEST) from turn_error
-    return trick.stack
+    return stack
 
 
 @router.get('/winner/{room_id}', status_code=200,
             response_model=Union[PlayerAtTable, dict[str, str]])
-def get_winner(room_id: str, user: Player = Security(get_current_user),
-               room_service=Depends(RoomDatabaseService)) -> Union[PlayerAtTable, dict[str, str]]:
+async def get_winner(room_id: str, user: Player = Security(get_current_user),
+                     room_service=Depends(RoomDatabaseService)
+                     ) -> Union[PlayerAtTable, dict[str, str]]:
     """
     Requests the winner of the current stack.
     :param room_id: for which the stack is requested
@@ -86,7 +80,7 @@ def get_winner(room_id: str, user: Player = Security(get_current_user),
     :return: The PlayerAtTable object of the winner. Raises Exception if the user has not joined
     the room yet. Replies with a warning if the trick has not be done.
     """
-    room = room_service.get(room_id)
+    room = await room_service.get(room_id)
     if user not in room.players:
         message = 'You have not joined the table.'
         raise create_http_error(message, status.HTTP_403_FORBIDDEN)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, Depends, status
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from whist_server.api.util import create_http_error
 from whist_server.database.user import UserInDb
@@ -22,9 +23,9 @@ class CreateUserArgs(BaseModel):
 
 
 @router.post('/create')
-def create_user(request: CreateUserArgs, pwd_service=Depends(PasswordService),
-                user_db_service=Depends(UserDatabaseService),
-                splunk_service: SplunkService = Depends(SplunkService)):
+async def create_user(request: CreateUserArgs, pwd_service=Depends(PasswordService),
+                      user_db_service=Depends(UserDatabaseService),
+                      splunk_service: SplunkService = Depends(SplunkService)):
     """
     Creates a new user.
     :param request: Must contain a 'username' and a 'password' field. If one is missing it raises
@@ -34,13 +35,14 @@ def create_user(request: CreateUserArgs, pwd_service=Depends(PasswordService),
     :param splunk_service: Injection of the Splunk Service.
     :return: the ID of the user or an error message.
     """
-    user = UserInDb(username=request.username, hashed_password=pwd_service.hash(request.password))
+    hashed_password = await run_in_threadpool(pwd_service.hash, request.password)
+    user = UserInDb(username=request.username, hashed_password=hashed_password)
     try:
-        user_id = user_db_service.add(user)
+        user_id = await user_db_service.add(user)
         if splunk_service.available:
             event = SplunkEvent(f'Username: {user.username}', source='Whist Server',
                                 source_type='User Created')
-            splunk_service.write_event(event)
+            await run_in_threadpool(splunk_service.write_event, event)
     except UserExistsError as user_error:
         message = 'User already exists.'
         raise create_http_error(message, status.HTTP_400_BAD_REQUEST) from user_error
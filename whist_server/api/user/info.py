@@ -8,7 +8,7 @@ router = APIRouter(prefix='/user')
 
 
 @router.get('/info')
-def user_info(user: Player = Security(get_current_user)) -> Player:
+async def user_info(user: Player = Security(get_current_user)) -> Player:
     """
     Returns the user information of the current user.
     :param user: the currently logged in user.
@@ -1,5 +1,9 @@
 """Utility functions for the API"""
+from typing import Union
+
 from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 
 
 def create_http_error(message: str, status_code: int) -> HTTPException:
@@ -13,3 +17,16 @@ def create_http_error(message: str, status_code: int) -> HTTPException:
         status_code=status_code,
         detail=message,
         headers={'WWW-Authenticate': 'Bearer'})
+
+
+def model_response(content: Union[BaseModel, list[BaseModel]]) -> ORJSONResponse:
+    """
+    Creates a JSON response of models directly, skipping the validation and generic encoding
+    FastAPI applies to returned values. It is meant for large responses of models the server
+    created itself.
+    :param content: a model or a list of models
+    :return: the response
+    """
+    if isinstance(content, BaseModel):
+        return ORJSONResponse(content.dict())
+    return ORJSONResponse([model.dict() for model in content])
@@ -1,11 +1,14 @@
 """CLI entrypoint"""
 import argparse
+import asyncio
+import sys
 
 import uvicorn
 
 from whist_server.const import HOST_ADDR, HOST_PORT, ADMIN_NAME, ADMIN_PASSWORD
 from whist_server.database.user import UserInDb
 from whist_server.services.error import UserExistsError
+from whist_server.services.index_service import IndexService
 from whist_server.services.password import PasswordService
 from whist_server.services.splunk_service import SplunkService, SplunkEvent
 from whist_server.services.user_db_service import UserDatabaseService
@@ -15,6 +18,8 @@ def main():
     """
     Main entrypoint
     """
+    if sys.argv[1:2] == ['indexes']:
+        sys.exit(indexes(sys.argv[2:]))
     parser = argparse.ArgumentParser(description='Whist Server')
     parser.add_argument('host_addr', type=str, help='Local address of the Whist Server.')
     parser.add_argument('host_port', type=int, help='Local port of the Whist Server.')
@@ -35,7 +40,7 @@ def _main(host=HOST_ADDR, port=HOST_PORT, admin_name=ADMIN_NAME, admin_pwd=ADMIN
         password_service = PasswordService()
         admin = UserInDb(username=admin_name, hashed_password=password_service.hash(admin_pwd))
         try:
-            user_service.add(admin)
+            asyncio.run(user_service.add(admin))
         except UserExistsError:
             pass
 
@@ -47,3 +52,29 @@ def _main(host=HOST_ADDR, port=HOST_PORT, admin_name=ADMIN_NAME, admin_pwd=ADMIN
 
     uvicorn.run('whist_server:app', host=host, port=port, debug=reload is not None and reload,
                 reload=reload is not None and reload)
+
+
+def indexes(args: list[str]) -> int:
+    """
+    Subcommand 'whist-server indexes' reporting missing and unused indexes of the database.
+    :param args: command line arguments after the subcommand
+    :return: exit code. 1 if declared indexes are missing.
+    """
+    parser = argparse.ArgumentParser(prog='whist-server indexes',
+                                     description='Reports missing and unused indexes.')
+    parser.add_argument('--ensure', action='store_true',
+                        help='Create the missing indexes before reporting.')
+    args = parser.parse_args(args)
+    report = asyncio.run(_index_report(args.ensure))
+    for name in report.missing:
+        print(f'missing: {name}')
+    for name in report.unused:
+        print(f'unused: {name}')
+    return 1 if report.missing else 0
+
+
+async def _index_report(ensure: bool):
+    index_service = IndexService()
+    if ensure:
+        await index_service.ensure()
+    return await index_service.report()
@@ -14,4 +14,33 @@ ALGORITHM = os.getenv('ALGORITHM', 'HS256')
 DATABASE_NAME = os.getenv('DATABASE_NAME', TEST_DATABASE)
 SECRET_KEY = os.getenv('SECRET_KEY', HEX_32_KEY)
 
+DATABASE_BACKEND = os.getenv('DATABASE_BACKEND', 'mongo')
+CHANNEL_BACKPLANE = os.getenv('CHANNEL_BACKPLANE', 'memory')
+CHANNEL_BACKPLANE_SOCKET = os.getenv('CHANNEL_BACKPLANE_SOCKET', '/tmp/whist-server.sock')
+CHANNEL_SEND_TIMEOUT = float(os.getenv('CHANNEL_SEND_TIMEOUT', '5'))
+CHANNEL_REPLAY_BUFFER_SIZE = int(os.getenv('CHANNEL_REPLAY_BUFFER_SIZE', '256'))
+CHANNEL_ACK_TIMEOUT = float(os.getenv('CHANNEL_ACK_TIMEOUT', '5'))
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv('SUBSCRIBER_QUEUE_SIZE', '64'))
+SUBSCRIBER_OVERFLOW = os.getenv('SUBSCRIBER_OVERFLOW', 'disconnect')
+WEBSOCKET_HEARTBEAT_INTERVAL = float(os.getenv('WEBSOCKET_HEARTBEAT_INTERVAL', '20'))
+WEBSOCKET_IDLE_TIMEOUT = float(os.getenv('WEBSOCKET_IDLE_TIMEOUT', '60'))
+VALIDATE_DOCUMENTS = os.getenv('VALIDATE_DOCUMENTS', 'false').lower() == 'true'
+
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '30000'))
+MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', '')
+
 INITIAL_RATING = 1200
+
+ROOM_CACHE_SIZE = int(os.getenv('ROOM_CACHE_SIZE', '256'))
+ROOM_UPDATE_RETRIES = int(os.getenv('ROOM_UPDATE_RETRIES', '3'))
+ROOM_ACTOR_BATCH_SIZE = int(os.getenv('ROOM_ACTOR_BATCH_SIZE', '32'))
+ROOM_ACTOR_IDLE_TIMEOUT = float(os.getenv('ROOM_ACTOR_IDLE_TIMEOUT', '300'))
+ROOM_SNAPSHOT_INTERVAL = int(os.getenv('ROOM_SNAPSHOT_INTERVAL', '50'))
+ROOM_IDLE_TTL = float(os.getenv('ROOM_IDLE_TTL', '86400'))
+ROOM_EMPTY_TTL = float(os.getenv('ROOM_EMPTY_TTL', '900'))
+ROOM_ARCHIVE_RETENTION = float(os.getenv('ROOM_ARCHIVE_RETENTION', '2592000'))
+ROOM_GC_INTERVAL = float(os.getenv('ROOM_GC_INTERVAL', '300'))
+ROOM_GC_BATCH_SIZE = int(os.getenv('ROOM_GC_BATCH_SIZE', '100'))
@@ -1,6 +1,24 @@
-"""Initializes the mongodb database"""
+"""Initializes the database"""
+from typing import Union
 
-from whist_server.const import DATABASE_NAME
-from whist_server.database.connection import get_database
+from whist_server.const import DATABASE_BACKEND, DATABASE_NAME
+from whist_server.database.connection import Database, get_database
+from whist_server.database.memory import MemoryDatabase
 
-db = get_database(DATABASE_NAME)
+
+def create_database(backend: str, name: str) -> Union[Database, MemoryDatabase]:
+    """
+    Creates the storage backend of the server.
+    :param backend: 'mongo' for a mongodb instance or 'memory' to keep all data in the memory of
+    the server process
+    :param name: of the mongo database
+    :return: the database
+    """
+    if backend == 'mongo':
+        return get_database(name)
+    if backend == 'memory':
+        return MemoryDatabase()
+    raise ValueError(f'Unknown database backend: {backend}')
+
+
+db = create_database(DATABASE_BACKEND, DATABASE_NAME)
@@ -0,0 +1,92 @@
+"""Compact storage encoding of cards"""
+from typing import Any
+
+from whist_core.cards.card import Card
+
+# Cards in their natural order, so sorted card lists have ascending codes.
+_CARDS: list[dict] = [card.dict() for card in sorted(Card.all_cards())]
+_CODES: dict[tuple[str, str], int] = {(card['suit'], card['rank']): code
+                                      for code, card in enumerate(_CARDS)}
+_CARDS_KEY = 'cards'
+
+
+def encode_card(card: dict) -> int:
+    """
+    Encodes a card by its position in a sorted deck.
+    :param card: dictionary of a card
+    :return: the code between 0 and 51
+    """
+    return _CODES[(card['suit'], card['rank'])]
+
+
+def decode_card(code: int) -> dict:
+    """
+    Decodes a card.
+    :param code: between 0 and 51
+    :return: dictionary of the card
+    """
+    return dict(_CARDS[code])
+
+
+def _is_card(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 2 and 'suit' in value and 'rank' in value
+
+
+def _encode_container(cards: list) -> Any:
+    codes = [_CODES[(card['suit'], card['rank'])] for card in cards]
+    if all(first < second for first, second in zip(codes, codes[1:])):
+        mask = 0
+        for code in codes:
+            mask |= 1 << code
+        return mask
+    return codes
+
+
+def _decode_container(cards: Any) -> list:
+    # The card dictionaries are shared, they are only read when the models are created.
+    if isinstance(cards, int):
+        decoded = []
+        while cards:
+            lowest = cards & -cards
+            decoded.append(_CARDS[lowest.bit_length() - 1])
+            cards ^= lowest
+        return decoded
+    return [_CARDS[code] if isinstance(code, int) else code for code in cards]
+
+
+def encode_cards(document: Any) -> Any:
+    """
+    Encodes the cards of all card containers of a document. Sorted containers, like hands, become
+    a 52 bit mask with a bit per card. Other containers, like the stack of a trick, become a list
+    of card codes.
+    :param document: dictionary of a model, e.g. of a room
+    :return: a copy of the document with encoded card containers
+    """
+    if isinstance(document, dict):
+        cards = document.get(_CARDS_KEY)
+        if isinstance(cards, (list, tuple)) and cards and _is_card(cards[0]):
+            return {key: _encode_container(value) if key == _CARDS_KEY else encode_cards(value)
+                    for key, value in document.items()}
+        return {key: encode_cards(value) for key, value in document.items()}
+    if isinstance(document, (list, tuple)):
+        return [encode_cards(value) for value in document]
+    return document
+
+
+def decode_cards(document: Any) -> Any:
+    """
+    Reverts 'encode_cards'. Documents with cards that are not encoded are returned unchanged.
+    :param document: as stored in the database
+    :return: a copy of the document with card dictionaries
+    """
+    if isinstance(document, dict):
+        cards = document.get(_CARDS_KEY)
+        encoded = isinstance(cards, int) or isinstance(cards, list) and bool(cards) and \
+            isinstance(cards[0], int)
+        if encoded:
+            return {key: _decode_container(value) if key == _CARDS_KEY else decode_cards(value)
+                    for key, value in document.items()}
+        return {key: decode_cards(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return [decode_cards(value) for value in document]
+    return document
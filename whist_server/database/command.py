@@ -0,0 +1,181 @@
+"""Commands that change the state of a room."""
+import abc
+from typing import Any, ClassVar, Optional
+
+from pydantic import BaseModel, PrivateAttr
+from whist_core.cards.card import Card
+from whist_core.cards.card_container import OrderedCardContainer
+from whist_core.session.matcher import Matcher, RandomMatcher, RoundRobinMatcher
+from whist_core.user.player import Player
+
+from whist_server.database.room import RoomInDb
+from whist_server.web_socket.events.event import CardPlayedEvent, Event, HandDealtEvent, \
+    NextHandEvent, PlayerJoinedEvent, PlayerLeftEvent, RoomStartedEvent, TrickDoneEvent
+
+
+class RoomCommand(BaseModel, abc.ABC):
+    """
+    A change of a room. Commands check all their preconditions before they mutate the room, so a
+    command that raises an error leaves the room untouched.
+    deterministic: False if replaying the command may lead to a different room, e.g. because
+    cards are shuffled.
+    """
+    deterministic: ClassVar[bool] = True
+    _events: list[Event] = PrivateAttr(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the class name of the command.
+        """
+        return self.__class__.__name__
+
+    @property
+    def events(self) -> list[Event]:
+        """
+        The events caused by the last application of this command.
+        """
+        return self._events
+
+    def apply(self, room: RoomInDb) -> Any:
+        """
+        Applies this command to a room and records it in the pending event log of the room. Its
+        events get the next sequence numbers of the room.
+        :param room: which is changed
+        :return: the result of the command. Raises the errors of the room.
+        """
+        self._events = []
+        result = self._execute(room)
+        for event in self._events:
+            room.stamp(event)
+        room.record(self)
+        return result
+
+    @abc.abstractmethod
+    def _execute(self, room: RoomInDb) -> Any:
+        """
+        Checks the preconditions, changes the room and emits the events of this command.
+        :param room: which is changed
+        :return: the result of the command
+        """
+
+    def _emit(self, event: Event) -> None:
+        self._events.append(event)
+
+    def _emit_hands(self, room: RoomInDb) -> None:
+        for player in room.players:
+            hand = room.get_player(player).hand.copy(deep=True)
+            self._emit(HandDealtEvent(recipient=player.username, hand=hand))
+
+
+class JoinCommand(RoomCommand):
+    """
+    A player joins the room. The password must have been checked before.
+    """
+    player: Player
+
+    def _execute(self, room: RoomInDb) -> bool:
+        joined = room.join(self.player)
+        self._emit(PlayerJoinedEvent(player=self.player))
+        return joined
+
+
+class LeaveCommand(RoomCommand):
+    """
+    A player leaves the room.
+    """
+    player: Player
+
+    def _execute(self, room: RoomInDb) -> bool:
+        left = room.leave(self.player)
+        self._emit(PlayerLeftEvent(player=self.player))
+        return left
+
+
+class ReadyCommand(RoomCommand):
+    """
+    A player marks themself ready.
+    """
+    player: Player
+
+    def _execute(self, room: RoomInDb) -> None:
+        room.ready_player(self.player)
+
+
+class UnreadyCommand(RoomCommand):
+    """
+    A player marks themself unready.
+    """
+    player: Player
+
+    def _execute(self, room: RoomInDb) -> None:
+        room.unready_player(self.player)
+
+
+class StartCommand(RoomCommand):
+    """
+    The creator starts the room and the first hand is dealt. Every player is sent their hand.
+    """
+    deterministic: ClassVar[bool] = False
+    player: Player
+    matcher_type: Optional[str] = None
+
+    @property
+    def matcher(self) -> Matcher:
+        """
+        Gets the matcher that distributes the players to teams.
+        """
+        return RoundRobinMatcher if self.matcher_type == 'robin' else RandomMatcher
+
+    def _execute(self, room: RoomInDb) -> bool:
+        started = room.start(self.player, self.matcher)
+        room.current_rubber.current_game().next_hand()
+        self._emit(RoomStartedEvent())
+        self._emit_hands(room)
+        return started
+
+
+class PlayCardCommand(RoomCommand):
+    """
+    A player plays a card in the current trick.
+    """
+    player: Player
+    card: Card
+
+    def _execute(self, room: RoomInDb) -> OrderedCardContainer:
+        trick = room.current_trick()
+        player = room.get_player(self.player)
+        trick.play_card(player=player, card=self.card)
+        self._emit(CardPlayedEvent(card=self.card, player=self.player))
+        if trick.done:
+            self._emit(TrickDoneEvent(winner=trick.winner.copy(deep=True)))
+        return trick.stack.copy(deep=True)
+
+
+class NextHandCommand(RoomCommand):
+    """
+    The next hand is dealt. Every player is sent their hand.
+    """
+    deterministic: ClassVar[bool] = False
+
+    def _execute(self, room: RoomInDb) -> None:
+        room.next_hand()
+        self._emit(NextHandEvent())
+        self._emit_hands(room)
+
+
+COMMANDS: dict[str, type[RoomCommand]] = {
+    command.__name__: command for command in [JoinCommand, LeaveCommand, ReadyCommand,
+                                              UnreadyCommand, StartCommand, PlayCardCommand,
+                                              NextHandCommand]
+}
+
+
+def parse_command(name: str, data: dict) -> RoomCommand:
+    """
+    Restores a command from an entry of the event log.
+    :param name: class name of the command
+    :param data: dictionary of the command
+    :return: the command
+    """
+    return COMMANDS[name](**data)
@@ -1,10 +1,140 @@
 """Connection to mongodb instance"""
-import pymongo
+import asyncio
+from typing import Optional
 
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, \
+    AsyncIOMotorDatabase
 
-def get_database(database):
+from whist_server.const import MONGO_COMPRESSORS, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, \
+    MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_WAIT_QUEUE_TIMEOUT_MS
+from whist_server.database.pool_listener import PoolListener
+
+
+class Database:
+    """
+    Asynchronous mongo database. Nothing is connected on construction. The server connects the
+    client on startup and closes it on shutdown. Other users, like the CLI or tests, are connected
+    on first use.
+    A motor client cannot be used by more than one event loop, so the client is reconnected if the
+    running event loop changes.
+    """
+
+    def __init__(self, name: str, **client_options):
+        """
+        Constructor.
+        :param name: of the database. Also used as host of the client.
+        :param client_options: keyword arguments of the motor client, e.g. the pool size
+        """
+        self._name = name
+        self._client_options = client_options
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pool_listener = PoolListener()
+
+    def __getattr__(self, name: str) -> 'Collection':
+        """
+        Returns a collection of this database.
+        :param name: of the collection
+        """
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return Collection(self, name)
+
+    def __getitem__(self, name: str) -> 'Collection':
+        """
+        Returns a collection of this database.
+        :param name: of the collection
+        """
+        return Collection(self, name)
+
+    @property
+    def connected(self) -> bool:
+        """
+        True if a client has been connected and not closed since.
+        """
+        return self._client is not None
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the statistics of the connection pool.
+        """
+        return {'pool': self.pool_listener.stats}
+
+    def connect(self) -> None:
+        """
+        Connects a new client for the running event loop. A previous client is closed.
+        :return: None
+        """
+        self.close()
+        self._client = AsyncIOMotorClient(host=self._name,
+                                          event_listeners=[self.pool_listener],
+                                          **self._client_options)
+        self._loop = asyncio.get_running_loop()
+
+    def close(self) -> None:
+        """
+        Closes the client and its connection pool.
+        :return: None
+        """
+        if self._client is not None:
+            self._client.close()
+        self._client = None
+        self._loop = None
+
+    def current(self) -> AsyncIOMotorDatabase:
+        """
+        Returns the motor database of the running event loop.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            self.connect()
+        return self._client[self._name]
+
+
+class Collection:
+    """
+    Asynchronous mongo collection. Forwards all calls to the motor collection of the running event
+    loop, so services can keep a reference to it.
+    """
+
+    def __init__(self, database: Database, name: str):
+        """
+        Constructor.
+        :param database: to which the collection belongs
+        :param name: of the collection
+        """
+        self._database = database
+        self._name = name
+
+    def __getattr__(self, name: str):
+        """
+        Forwards attribute access to the motor collection.
+        :param name: of the attribute
+        """
+        return getattr(self.current(), name)
+
+    def current(self) -> AsyncIOMotorCollection:
+        """
+        Returns the motor collection of the running event loop.
+        """
+        return self._database.current()[self._name]
+
+    async def index_usage(self) -> dict[str, int]:
+        """
+        Returns how often each index has been used by a query since the mongodb instance started.
+        :return: dictionary of the index names and their uses
+        """
+        cursor = self.current().aggregate([{'$indexStats': {}}])
+        return {stats['name']: stats['accesses']['ops'] async for stats in cursor}
+
+
+def get_database(database) -> Database:
     """
-    Returns the mongo database.
+    Returns the mongo database configured by the MONGO_* environment variables.
     """
-    client = pymongo.MongoClient(host=database)
-    return client[database]
+    options = {'maxPoolSize': MONGO_MAX_POOL_SIZE, 'minPoolSize': MONGO_MIN_POOL_SIZE,
+               'waitQueueTimeoutMS': MONGO_WAIT_QUEUE_TIMEOUT_MS or None,
+               'serverSelectionTimeoutMS': MONGO_SERVER_SELECTION_TIMEOUT_MS}
+    if MONGO_COMPRESSORS:
+        options['compressors'] = MONGO_COMPRESSORS
+    return Database(database, **options)
@@ -0,0 +1,76 @@
+"""Computes partial mongodb updates between two versions of a document."""
+from typing import Any
+
+_SET = '$set'
+_UNSET = '$unset'
+_PUSH = '$push'
+
+
+def diff_document(old: dict, new: dict) -> dict:
+    """
+    Computes the update operators that transform the old document into the new one. Appended
+    list elements become '$push' operations, removed keys '$unset' operations and every other
+    change a '$set' of the deepest changed path.
+    :param old: the document as it is stored in the database
+    :param new: the document as it should be stored in the database
+    :return: update operators for 'update_one'. Empty if both documents are equal.
+    """
+    update = {_SET: {}, _UNSET: {}, _PUSH: {}}
+    _diff_dict(old, new, '', update)
+    return {operator: values for operator, values in update.items() if values}
+
+
+def _join(path: str, key: Any) -> str:
+    return f'{path}.{key}' if path else str(key)
+
+
+def _is_safe_key(key: Any) -> bool:
+    """
+    Keys containing dots or starting with a dollar cannot be part of a dotted path.
+    """
+    key = str(key)
+    return '.' not in key and not key.startswith('$')
+
+
+def _operation_count(update: dict) -> int:
+    return sum(len(values) for values in update.values())
+
+
+def _diff(old: Any, new: Any, path: str, update: dict) -> None:
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        if all(_is_safe_key(key) for key in old.keys() | new.keys()):
+            _diff_dict(old, new, path, update)
+        else:
+            update[_SET][path] = new
+    elif isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)) \
+            and len(old) <= len(new):
+        _diff_sequence(old, new, path, update)
+    else:
+        update[_SET][path] = new
+
+
+def _diff_dict(old: dict, new: dict, path: str, update: dict) -> None:
+    for key, value in new.items():
+        if key in old:
+            _diff(old[key], value, _join(path, key), update)
+        else:
+            update[_SET][_join(path, key)] = value
+    for key in old.keys() - new.keys():
+        update[_UNSET][_join(path, key)] = ''
+
+
+def _diff_sequence(old, new, path: str, update: dict) -> None:
+    operations_before = _operation_count(update)
+    for index, (old_item, new_item) in enumerate(zip(old, new)):
+        _diff(old_item, new_item, _join(path, index), update)
+    appended = list(new[len(old):])
+    if not appended:
+        return
+    if _operation_count(update) == operations_before:
+        update[_PUSH][path] = {'$each': appended}
+    else:
+        # A push would conflict with the updates of the existing elements.
+        for index, item in enumerate(appended, start=len(old)):
+            update[_SET][_join(path, index)] = item
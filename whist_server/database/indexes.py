@@ -0,0 +1,47 @@
+"""Registry of the indexes of the hot queries"""
+import pymongo
+from pydantic import BaseModel
+
+
+class Index(BaseModel):
+    """
+    Declares an index of a collection.
+    collection: name of the indexed collection
+    keys: list of field paths with their sort direction, as accepted by 'create_index'
+    unique: if two documents must not share the same key
+    """
+    collection: str
+    keys: list[tuple[str, int]]
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the name mongodb gives the index by default, e.g. 'username_1'.
+        """
+        return '_'.join(f'{field}_{direction}' for field, direction in self.keys)
+
+
+# Each entry backs a query of a service:
+# UserDatabaseService.get, UserDatabaseService.get_from_github, RankingService.select,
+# RoomDatabaseService.get_by_name, RoomDatabaseService.lobby, RoomDatabaseService.find_open,
+# RoomDatabaseService.stale, RoomDatabaseService.purge_archive and the RoomEventService.
+# The unique indexes make user and room names unique even under concurrent creation.
+INDEXES: list[Index] = [
+    Index(collection='user', keys=[('username', pymongo.ASCENDING)], unique=True),
+    Index(collection='user', keys=[('github_id', pymongo.ASCENDING)]),
+    Index(collection='user', keys=[('rating', pymongo.DESCENDING)]),
+    Index(collection='room', keys=[('table.name', pymongo.ASCENDING)], unique=True),
+    Index(collection='room', keys=[('room_summary.started', pymongo.ASCENDING),
+                                   ('room_summary.password', pymongo.ASCENDING),
+                                   ('_id', pymongo.ASCENDING)]),
+    Index(collection='room', keys=[('room_summary.started', pymongo.ASCENDING),
+                                   ('room_summary.password', pymongo.ASCENDING),
+                                   ('room_summary.seats_free', pymongo.ASCENDING)]),
+    Index(collection='room', keys=[('last_activity', pymongo.ASCENDING)]),
+    Index(collection='room_archive', keys=[('archived_at', pymongo.ASCENDING)]),
+    Index(collection='room_events', keys=[('room_id', pymongo.ASCENDING),
+                                          ('sequence', pymongo.ASCENDING)]),
+    Index(collection='room_snapshots', keys=[('room_id', pymongo.ASCENDING),
+                                             ('sequence', pymongo.ASCENDING)]),
+]
@@ -0,0 +1,761 @@
+"""In-memory storage backend"""
+import bisect
+import threading
+from typing import Any, Iterable, Optional, Union
+
+import bson
+from pymongo.errors import DuplicateKeyError
+from pymongo.results import DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+from whist_server.database.indexes import INDEXES, Index
+
+# Order of types when sorting, as in mongodb.
+_TYPE_ORDER = {type(None): 0, int: 1, float: 1, str: 2, dict: 3, list: 4, bson.ObjectId: 7,
+               bool: 8}
+_DATE_ORDER = 9
+
+
+def _values(document: dict, path: str) -> list:
+    """
+    Returns all values at a dotted path. Arrays on the way are expanded like mongodb does.
+    """
+    values = [document]
+    for key in path.split('.'):
+        found = []
+        for value in values:
+            if isinstance(value, dict):
+                if key in value:
+                    found.append(value[key])
+            elif isinstance(value, list):
+                if key.isdigit():
+                    if int(key) < len(value):
+                        found.append(value[int(key)])
+                else:
+                    found.extend(item[key] for item in value
+                                 if isinstance(item, dict) and key in item)
+        values = found
+    return values
+
+
+def _candidates(document: dict, path: str) -> list:
+    """
+    Returns the values a condition is checked against. Arrays match by themselves and by their
+    elements.
+    """
+    candidates = []
+    for value in _values(document, path):
+        candidates.append(value)
+        if isinstance(value, list):
+            candidates.extend(value)
+    return candidates
+
+
+def _first(document: dict, path: str) -> Any:
+    values = _values(document, path)
+    return values[0] if values else None
+
+
+def _sort_value(value: Any) -> tuple:
+    rank = _TYPE_ORDER.get(type(value), _DATE_ORDER)
+    if isinstance(value, (dict, list)):
+        value = bson.encode({'value': value})
+    return rank, value
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    return value
+
+
+def _compare(operator):
+    def compare(candidates: list, argument: Any) -> bool:
+        for candidate in candidates:
+            try:
+                if operator(candidate, argument):
+                    return True
+            except TypeError:
+                continue
+        return False
+
+    return compare
+
+
+def _equals(candidates: list, argument: Any) -> bool:
+    return argument in candidates or (argument is None and not candidates)
+
+
+def _is_in(candidates: list, argument: list) -> bool:
+    return any(_equals(candidates, value) for value in argument)
+
+
+_OPERATORS = {
+    '$eq': _equals,
+    '$ne': lambda candidates, argument: not _equals(candidates, argument),
+    '$in': _is_in,
+    '$nin': lambda candidates, argument: not _is_in(candidates, argument),
+    '$gt': _compare(lambda candidate, argument: candidate > argument),
+    '$gte': _compare(lambda candidate, argument: candidate >= argument),
+    '$lt': _compare(lambda candidate, argument: candidate < argument),
+    '$lte': _compare(lambda candidate, argument: candidate <= argument),
+    '$exists': lambda candidates, argument: bool(candidates) == bool(argument),
+}
+
+
+def _is_operator(condition: Any) -> bool:
+    return isinstance(condition, dict) and len(condition) > 0 and \
+        all(key.startswith('$') for key in condition)
+
+
+def matches(document: dict, query: dict) -> bool:
+    """
+    Checks if a document matches a mongodb query.
+    :param document: to be checked
+    :param query: supports equality, '$and', '$or' and the operators '$eq', '$ne', '$in', '$nin',
+    '$gt', '$gte', '$lt', '$lte' and '$exists'
+    :return: True if the document matches.
+    """
+    for path, condition in query.items():
+        if path == '$and':
+            if not all(matches(document, part) for part in condition):
+                return False
+        elif path == '$or':
+            if not any(matches(document, part) for part in condition):
+                return False
+        elif _is_operator(condition):
+            candidates = _candidates(document, path)
+            if not all(_OPERATORS[operator](candidates, argument)
+                       for operator, argument in condition.items()):
+                return False
+        elif not _equals(_candidates(document, path), condition):
+            return False
+    return True
+
+
+def _parent(document: dict, path: str, create: bool):
+    keys = path.split('.')
+    target = document
+    for key in keys[:-1]:
+        if isinstance(target, list):
+            target = target[int(key)]
+        elif key in target:
+            target = target[key]
+        elif create:
+            target = target.setdefault(key, {})
+        else:
+            return None, keys[-1]
+    return target, keys[-1]
+
+
+def _set(document: dict, path: str, value: Any) -> None:
+    parent, key = _parent(document, path, create=True)
+    if isinstance(parent, list):
+        index = int(key)
+        parent.extend([None] * (index + 1 - len(parent)))
+        parent[index] = value
+    else:
+        parent[key] = value
+
+
+def _unset(document: dict, path: str, _: Any) -> None:
+    parent, key = _parent(document, path, create=False)
+    if isinstance(parent, list):
+        parent[int(key)] = None
+    elif parent is not None:
+        parent.pop(key, None)
+
+
+def _push(document: dict, path: str, value: Any) -> None:
+    parent, key = _parent(document, path, create=True)
+    items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+    if isinstance(parent, list):
+        parent[int(key)].extend(items)
+    else:
+        parent.setdefault(key, []).extend(items)
+
+
+def _inc(document: dict, path: str, value: Any) -> None:
+    _set(document, path, (_first(document, path) or 0) + value)
+
+
+_UPDATES = {'$set': _set, '$unset': _unset, '$push': _push, '$inc': _inc}
+
+
+def apply_update(document: dict, update: dict) -> None:
+    """
+    Applies mongodb update operators to a document.
+    :param document: to be changed in place
+    :param update: supports '$set', '$unset', '$push' with and without '$each' and '$inc'
+    :return: None
+    """
+    for operator, fields in update.items():
+        if operator == '$setOnInsert':
+            continue
+        for path, value in fields.items():
+            _UPDATES[operator](document, path, value)
+
+
+def project(document: dict, projection: Optional[dict]) -> dict:
+    """
+    Applies a mongodb projection to a document.
+    :param document: to be projected
+    :param projection: either includes or excludes dotted paths of embedded documents. '_id' is
+    included unless excluded explicitly.
+    :return: the projected document
+    """
+    if not projection:
+        return document
+    fields = {path: bool(flag) for path, flag in projection.items() if path != '_id'}
+    keep_id = bool(projection.get('_id', True))
+    if fields and all(fields.values()):
+        result = {'_id': document['_id']} if keep_id and '_id' in document else {}
+        for path in fields:
+            value = document
+            for key in path.split('.'):
+                if not isinstance(value, dict) or key not in value:
+                    break
+                value = value[key]
+            else:
+                _set(result, path, value)
+        return result
+    for path in fields:
+        _unset(document, path, None)
+    if not keep_id:
+        document.pop('_id', None)
+    return document
+
+
+class _MemoryIndex:
+    """
+    Index on one or more fields. Keeps a hash of the keys for equality queries and the keys in
+    ascending order for sorted queries. Array values are indexed as a whole.
+    """
+
+    def __init__(self, index: Index):
+        self.fields = [field for field, _ in index.keys]
+        self.keys = index.keys
+        self.unique = index.unique
+        self.name = index.name
+        self.accesses = 0
+        self._rows: dict[tuple, set[int]] = {}
+        self._order: list[tuple] = []
+
+    def key(self, document: dict) -> tuple:
+        """Returns the key of a document in this index."""
+        return tuple(_freeze(_first(document, field)) for field in self.fields)
+
+    def _order_key(self, document: dict) -> tuple:
+        return tuple(_sort_value(_first(document, field)) for field in self.fields)
+
+    def conflicts(self, document: dict, row: int) -> bool:
+        """Checks if another row already uses the key of the document."""
+        return self.unique and bool(self._rows.get(self.key(document), set()) - {row})
+
+    def add(self, document: dict, row: int) -> None:
+        """Adds a row to this index."""
+        self._rows.setdefault(self.key(document), set()).add(row)
+        bisect.insort(self._order, (self._order_key(document), row))
+
+    def remove(self, document: dict, row: int) -> None:
+        """Removes a row from this index."""
+        key = self.key(document)
+        self._rows[key].discard(row)
+        if not self._rows[key]:
+            del self._rows[key]
+        entry = (self._order_key(document), row)
+        del self._order[bisect.bisect_left(self._order, entry)]
+
+    def lookup(self, query: dict) -> Optional[set[int]]:
+        """
+        Returns the rows matching the equality conditions of a query on all fields of this index.
+        None if the query does not restrict all fields by equality.
+        """
+        values = []
+        for field in self.fields:
+            value = query.get(field, _is_operator)
+            if value is _is_operator or isinstance(value, (dict, list)):
+                return None
+            values.append(value)
+        self.accesses += 1
+        return self._rows.get(tuple(values), set())
+
+    def ordered(self, sort: list[tuple[str, int]], query: dict) -> Optional[list[int]]:
+        """
+        Returns the rows in the requested order. The fields of this index in front of the sorted
+        fields must be restricted by equality in the query. Only the rows with these values are
+        returned. None if this index cannot provide the order.
+        """
+        prefix = self.fields[:len(self.fields) - len(sort)]
+        directions = {direction for _, direction in sort}
+        if self.fields[len(prefix):] != [field for field, _ in sort] or len(directions) != 1:
+            return None
+        values = []
+        for field in prefix:
+            value = query.get(field, _is_operator)
+            if value is _is_operator or isinstance(value, (dict, list)):
+                return None
+            values.append(_sort_value(value))
+        prefix_key = tuple(values)
+        rows = []
+        for position in range(bisect.bisect_left(self._order, (prefix_key,)), len(self._order)):
+            key, row = self._order[position]
+            if key[:len(prefix_key)] != prefix_key:
+                break
+            rows.append(row)
+        self.accesses += 1
+        return rows if directions == {1} else rows[::-1]
+
+
+def _sort_spec(key_or_list: Union[str, list], direction: Optional[int] = None) -> list:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, 1 if direction is None else direction)]
+    return list(key_or_list)
+
+
+class MemoryCursor:
+    """
+    Cursor over the result of a query of a memory collection. Like a motor cursor, it is
+    evaluated when it is iterated.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, collection: 'MemoryCollection', query: dict,
+                 projection: Optional[dict] = None, sort=None, skip: int = 0, limit: int = 0):
+        """
+        Constructor.
+        :param collection: that is queried
+        :param query: mongodb query
+        :param projection: mongodb projection
+        :param sort: list of fields and their direction
+        :param skip: amount of documents to skip
+        :param limit: maximum amount of documents. 0 means no limit.
+        """
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = _sort_spec(sort) if sort else None
+        self._skip = skip
+        self._limit = limit
+
+    def sort(self, key_or_list: Union[str, list], direction: Optional[int] = None):
+        """
+        Sorts the result.
+        :param key_or_list: a field or a list of fields and directions
+        :param direction: of a single field
+        :return: this cursor
+        """
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int):
+        """
+        Skips the first documents of the result.
+        :param skip: amount of documents
+        :return: this cursor
+        """
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int):
+        """
+        Limits the amount of documents.
+        :param limit: maximum amount. 0 means no limit.
+        :return: this cursor
+        """
+        self._limit = limit
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> list[dict]:
+        """
+        Returns the documents of the result.
+        :param length: maximum amount of documents. None for all.
+        :return: list of documents
+        """
+        documents = self._collection.query(self._query, self._sort, self._skip, self._limit)
+        if length is not None:
+            documents = documents[:length]
+        return [project(document, self._projection) for document in documents]
+
+    def __aiter__(self):
+        """Iterates over the documents of the result."""
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in await self.to_list():
+            yield document
+
+
+class MemoryCollection:
+    """
+    Collection that keeps its documents in memory. It supports the subset of the motor
+    collection interface used by the services. Documents are stored BSON encoded, so they are
+    validated and copied like by mongodb.
+    """
+
+    def __init__(self, name: str, indexes: Iterable[Index] = ()):
+        """
+        Constructor.
+        :param name: of the collection
+        :param indexes: declared indexes of the collection. They survive dropping the collection.
+        """
+        self.name = name
+        self._lock = threading.RLock()
+        self._documents: dict[int, bytes] = {}
+        self._ids: dict[Any, int] = {}
+        self._next_row = 0
+        self._declared = list(indexes)
+        self._indexes: dict[str, _MemoryIndex] = {}
+        for index in self._declared:
+            self._add_index(index)
+
+    def _add_index(self, index: Index) -> str:
+        memory_index = _MemoryIndex(index)
+        if memory_index.name not in self._indexes:
+            for row, data in self._documents.items():
+                document = bson.decode(data)
+                if memory_index.conflicts(document, row):
+                    raise DuplicateKeyError(f'E11000 duplicate key error collection: {self.name} '
+                                            f'index: {memory_index.name}', 11000)
+                memory_index.add(document, row)
+            self._indexes[memory_index.name] = memory_index
+        return memory_index.name
+
+    async def create_index(self, keys, unique: bool = False, **_) -> str:
+        """
+        Creates an index if it does not exist yet.
+        :param keys: a field or a list of fields and directions
+        :param unique: if two documents must not share the same key
+        :return: the name of the index
+        """
+        with self._lock:
+            return self._add_index(Index(collection=self.name, keys=_sort_spec(keys),
+                                         unique=unique))
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of documents in this collection.
+        """
+        return len(self._documents)
+
+    def index_names(self) -> list[str]:
+        """
+        Returns the names of all indexes except the implicit one on '_id'.
+        """
+        return list(self._indexes)
+
+    async def index_information(self) -> dict:
+        """
+        Returns the indexes of this collection like mongodb does.
+        :return: dictionary of the index names and their keys and uniqueness
+        """
+        information = {'_id_': {'key': [('_id', 1)]}}
+        for index in self._indexes.values():
+            information[index.name] = {'key': list(index.keys)}
+            if index.unique:
+                information[index.name]['unique'] = True
+        return information
+
+    async def index_usage(self) -> dict[str, int]:
+        """
+        Returns how often each index has been used by a query since it was created.
+        :return: dictionary of the index names and their uses
+        """
+        return {index.name: index.accesses for index in self._indexes.values()}
+
+    def _check_unique(self, document: dict, row: int) -> None:
+        for index in self._indexes.values():
+            if index.conflicts(document, row):
+                raise DuplicateKeyError(f'E11000 duplicate key error collection: {self.name} '
+                                        f'index: {index.name} dup key: {index.key(document)}',
+                                        11000)
+
+    def _insert(self, document: dict) -> Any:
+        document.setdefault('_id', bson.ObjectId())
+        if document['_id'] in self._ids:
+            raise DuplicateKeyError(f'E11000 duplicate key error collection: {self.name} '
+                                    f'index: _id_ dup key: {document["_id"]}', 11000)
+        data = bson.encode(document)
+        stored = bson.decode(data)
+        row = self._next_row
+        self._check_unique(stored, row)
+        self._next_row += 1
+        self._documents[row] = data
+        self._ids[stored['_id']] = row
+        for index in self._indexes.values():
+            index.add(stored, row)
+        return stored['_id']
+
+    def _remove(self, row: int) -> None:
+        document = bson.decode(self._documents.pop(row))
+        del self._ids[document['_id']]
+        for index in self._indexes.values():
+            index.remove(document, row)
+
+    def _rows(self, query: dict, sort: Optional[list]) -> tuple[Iterable[int], bool]:
+        """
+        Plans a query. Uses the '_id' or an index for equality conditions and an index for the
+        order if possible.
+        :return: the candidate rows and whether they are in the requested order
+        """
+        rows = None
+        if '_id' in query and not _is_operator(query['_id']):
+            rows = {self._ids[query['_id']]} if query['_id'] in self._ids else set()
+        for index in self._indexes.values():
+            if rows is not None:
+                break
+            rows = index.lookup(query)
+        if sort:
+            for index in self._indexes.values():
+                ordered = index.ordered(sort, query)
+                if ordered is not None:
+                    return [row for row in ordered if rows is None or row in rows], True
+        return (sorted(rows) if rows is not None else list(self._documents)), False
+
+    def query(self, query: Optional[dict], sort: Optional[list] = None, skip: int = 0,
+              limit: int = 0) -> list[dict]:
+        """
+        Returns copies of the documents matching a query.
+        :param query: mongodb query. Other values than dictionaries query the '_id'.
+        :param sort: list of fields and their direction
+        :param skip: amount of documents to skip
+        :param limit: maximum amount of documents. 0 means no limit.
+        :return: list of documents
+        """
+        query = self._normalize(query)
+        with self._lock:
+            rows, ordered = self._rows(query, sort)
+            # Without sorting afterwards, the first matches are the result.
+            wanted = skip + limit if limit and (ordered or not sort) else None
+            documents = []
+            for row in rows:
+                document = bson.decode(self._documents[row])
+                if matches(document, query):
+                    documents.append(document)
+                    if len(documents) == wanted:
+                        break
+        if sort and not ordered:
+            for field, direction in reversed(sort):
+                documents.sort(key=lambda document, path=field: _sort_value(
+                    _first(document, path)), reverse=direction < 0)
+        documents = documents[skip:]
+        return documents[:limit] if limit else documents
+
+    @staticmethod
+    def _normalize(query: Any) -> dict:
+        if query is None:
+            return {}
+        return query if isinstance(query, dict) else {'_id': query}
+
+    async def insert_one(self, document: dict) -> InsertOneResult:
+        """
+        Inserts a document. An '_id' is added to the document if it has none.
+        :param document: to be inserted
+        :return: result containing the inserted id. Raises DuplicateKeyError if a unique index
+        is violated.
+        """
+        with self._lock:
+            return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents: list[dict]) -> InsertManyResult:
+        """
+        Inserts several documents in order.
+        :param documents: to be inserted
+        :return: result containing the inserted ids
+        """
+        with self._lock:
+            return InsertManyResult([self._insert(document) for document in documents], True)
+
+    async def find_one(self, query: Any = None, projection: Optional[dict] = None,
+                       sort: Optional[list] = None) -> Optional[dict]:
+        """
+        Returns the first document matching a query.
+        :param query: mongodb query or an '_id'
+        :param projection: mongodb projection
+        :param sort: list of fields and their direction
+        :return: the document or None
+        """
+        documents = self.query(query, sort=sort, limit=1)
+        return project(documents[0], projection) if documents else None
+
+    # pylint: disable=too-many-arguments
+    def find(self, query: Any = None, projection: Optional[dict] = None, sort=None,
+             skip: int = 0, limit: int = 0) -> MemoryCursor:
+        """
+        Queries documents.
+        :param query: mongodb query or an '_id'
+        :param projection: mongodb projection
+        :param sort: list of fields and their direction
+        :param skip: amount of documents to skip
+        :param limit: maximum amount of documents. 0 means no limit.
+        :return: a cursor over the result
+        """
+        return MemoryCursor(self, query, projection, sort, skip, limit)
+
+    async def update_one(self, query: Any, update: dict, upsert: bool = False) -> UpdateResult:
+        """
+        Updates the first document matching a query.
+        :param query: mongodb query or an '_id'
+        :param update: mongodb update operators
+        :param upsert: inserts a document built from the equality conditions of the query and
+        the update if no document matches
+        :return: result containing the matched and modified counts
+        """
+        query = self._normalize(query)
+        with self._lock:
+            documents = self.query(query, limit=1)
+            if not documents:
+                if not upsert:
+                    return UpdateResult({'n': 0, 'nModified': 0}, True)
+                document = {path: value for path, value in query.items()
+                            if not path.startswith('$') and not _is_operator(value)}
+                apply_update(document, update)
+                apply_update(document, {'$set': update.get('$setOnInsert', {})})
+                inserted_id = self._insert(document)
+                return UpdateResult({'n': 1, 'nModified': 0, 'upserted': inserted_id}, True)
+            modified = self._update(documents[0], update)
+            return UpdateResult({'n': 1, 'nModified': int(modified)}, True)
+
+    async def update_many(self, query: Any, update: dict) -> UpdateResult:
+        """
+        Updates all documents matching a query.
+        :param query: mongodb query or an '_id'
+        :param update: mongodb update operators
+        :return: result containing the matched and modified counts
+        """
+        with self._lock:
+            documents = self.query(query)
+            modified = sum(self._update(document, update) for document in documents)
+            return UpdateResult({'n': len(documents), 'nModified': modified}, True)
+
+    def _update(self, document: dict, update: dict) -> bool:
+        row = self._ids[document['_id']]
+        apply_update(document, update)
+        data = bson.encode(document)
+        if data == self._documents[row]:
+            return False
+        stored = bson.decode(data)
+        self._check_unique(stored, row)
+        self._remove(row)
+        self._documents[row] = data
+        self._ids[stored['_id']] = row
+        for index in self._indexes.values():
+            index.add(stored, row)
+        return True
+
+    async def delete_one(self, query: Any) -> DeleteResult:
+        """
+        Deletes the first document matching a query.
+        :param query: mongodb query or an '_id'
+        :return: result containing the deleted count
+        """
+        with self._lock:
+            documents = self.query(query, limit=1)
+            for document in documents:
+                self._remove(self._ids[document['_id']])
+            return DeleteResult({'n': len(documents)}, True)
+
+    async def delete_many(self, query: Any) -> DeleteResult:
+        """
+        Deletes all documents matching a query.
+        :param query: mongodb query or an '_id'
+        :return: result containing the deleted count
+        """
+        with self._lock:
+            documents = self.query(query)
+            for document in documents:
+                self._remove(self._ids[document['_id']])
+            return DeleteResult({'n': len(documents)}, True)
+
+    async def count_documents(self, query: Any, limit: int = 0, skip: int = 0) -> int:
+        """
+        Counts the documents matching a query.
+        :param query: mongodb query or an '_id'
+        :param limit: maximum count. 0 means no limit.
+        :param skip: amount of documents not to count
+        :return: the count
+        """
+        return len(self.query(query, skip=skip, limit=limit))
+
+    async def estimated_document_count(self) -> int:
+        """
+        Returns the amount of documents in this collection.
+        """
+        return len(self)
+
+    async def drop(self) -> None:
+        """
+        Deletes all documents and the indexes that were not declared on construction.
+        :return: None
+        """
+        with self._lock:
+            self._documents.clear()
+            self._ids.clear()
+            self._indexes.clear()
+            for index in self._declared:
+                self._add_index(index)
+
+
+class MemoryDatabase:
+    """
+    Database that keeps all collections in the memory of the server process. Suited for single
+    process deployments and tests, as nothing is persisted.
+    """
+
+    def __init__(self, indexes: Optional[Iterable[Index]] = None):
+        """
+        Constructor.
+        :param indexes: the declared indexes of all collections. Defaults to the indexes of the
+        hot queries.
+        """
+        self._indexes = list(INDEXES if indexes is None else indexes)
+        self._collections: dict[str, MemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        """
+        Returns a collection of this database.
+        :param name: of the collection
+        """
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        """
+        Returns a collection of this database. It is created if it does not exist.
+        :param name: of the collection
+        """
+        with self._lock:
+            if name not in self._collections:
+                indexes = [index for index in self._indexes if index.collection == name]
+                self._collections[name] = MemoryCollection(name, indexes)
+            return self._collections[name]
+
+    @property
+    def connected(self) -> bool:
+        """
+        Always True.
+        """
+        return True
+
+    def connect(self) -> None:
+        """
+        Nothing to connect.
+        :return: None
+        """
+
+    def close(self) -> None:
+        """
+        Nothing to close. The documents are kept.
+        :return: None
+        """
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the amount of documents per collection.
+        """
+        return {'documents': {name: len(collection)
+                              for name, collection in self._collections.items()}}
@@ -0,0 +1,91 @@
+"""Monitoring of the mongodb connection pool"""
+import threading
+import time
+
+from pymongo import monitoring
+
+
+# pylint: disable=too-many-instance-attributes
+class PoolListener(monitoring.ConnectionPoolListener):
+    """
+    Measures how long operations wait to check out a connection from the pool. Long waits mean
+    the pool is too small for the load of the server.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        # A check out starts and ends on the same thread.
+        self._local = threading.local()
+        self._checkouts = 0
+        self._failures = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._checked_out = 0
+        self._open = 0
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the check out counters and wait times in milliseconds.
+        """
+        with self._lock:
+            average = self._wait_total / self._checkouts if self._checkouts else 0.0
+            return {'checkouts': self._checkouts, 'checkout_failures': self._failures,
+                    'checkout_wait_ms_avg': average * 1000,
+                    'checkout_wait_ms_max': self._wait_max * 1000,
+                    'checked_out': self._checked_out, 'open': self._open}
+
+    def connection_check_out_started(self, event) -> None:
+        """Remembers when the check out started."""
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        """Records the wait time of a successful check out."""
+        wait = self._wait()
+        with self._lock:
+            self._checkouts += 1
+            self._checked_out += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+    def connection_check_out_failed(self, event) -> None:
+        """Counts check outs that failed, e.g. because the wait queue timed out."""
+        self._wait()
+        with self._lock:
+            self._failures += 1
+
+    def connection_checked_in(self, event) -> None:
+        """Counts the connection as available again."""
+        with self._lock:
+            self._checked_out -= 1
+
+    def connection_created(self, event) -> None:
+        """Counts the open connections."""
+        with self._lock:
+            self._open += 1
+
+    def connection_closed(self, event) -> None:
+        """Counts the open connections."""
+        with self._lock:
+            self._open -= 1
+
+    def connection_ready(self, event) -> None:
+        """Not measured."""
+
+    def pool_created(self, event) -> None:
+        """Not measured."""
+
+    def pool_ready(self, event) -> None:
+        """Not measured."""
+
+    def pool_cleared(self, event) -> None:
+        """Not measured."""
+
+    def pool_closed(self, event) -> None:
+        """Not measured."""
+
+    def _wait(self) -> float:
+        started = getattr(self._local, 'started', None)
+        self._local.started = None
+        return 0.0 if started is None else time.perf_counter() - started
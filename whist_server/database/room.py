@@ -1,7 +1,7 @@
 """Room models"""
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from whist_core.game.hand import Hand
 from whist_core.game.player_at_table import PlayerAtTable
 from whist_core.game.rubber import Rubber
@@ -124,6 +124,15 @@ class Room(BaseModel):
         """
         self.table.player_ready(player)
 
+    def unready_player(self, player: Player) -> None:
+        """
+        Marks a player as not ready to play.
+        :param player: The player who wants to mark themself unready.
+        :return: None. Raises PlayerNotJoined if a player tries to get unready without joining a
+        table.
+        """
+        self.table.player_unready(player)
+
     def start(self, player: Player, matcher: Matcher) -> bool:
         """
         Starts the current table, if the player is the creator.
@@ -157,8 +166,64 @@ class Room(BaseModel):
 class RoomInDb(Room):
     """
     room DO
+    version: incremented with every save. Used to detect concurrent modifications.
+    log_sequence: sequence number of the last command recorded in the event log of the room.
+    event_sequence: sequence number of the last event caused by a command of the room.
     """
     hashed_password: Optional[str]
+    version: int = 0
+    log_sequence: int = 0
+    event_sequence: int = 0
+    _persisted_document: Optional[dict] = PrivateAttr(default=None)
+    _pending_log: list[tuple[int, Any]] = PrivateAttr(default_factory=list)
+
+    @property
+    def persisted_document(self) -> Optional[dict]:
+        """
+        The document as it was last loaded from or saved to the database. None if unknown.
+        """
+        return self._persisted_document
+
+    def mark_persisted(self, document: dict) -> None:
+        """
+        Remembers the state of the room in the database in order to compute partial updates.
+        :param document: the dictionary of this room as it is stored in the database.
+        :return: None
+        """
+        self._persisted_document = document
+
+    @property
+    def pending_log(self) -> list[tuple[int, Any]]:
+        """
+        The commands applied since the event log has been written last, with their sequence
+        numbers.
+        """
+        return self._pending_log
+
+    def record(self, command: Any) -> None:
+        """
+        Appends an applied command to the pending entries of the event log.
+        :param command: that has been applied to this room
+        :return: None
+        """
+        self.log_sequence += 1
+        self._pending_log.append((self.log_sequence, command))
+
+    def stamp(self, event: Any) -> None:
+        """
+        Assigns the next sequence number of the room to an event.
+        :param event: caused by a command of this room
+        :return: None
+        """
+        self.event_sequence += 1
+        event.sequence = self.event_sequence
+
+    def clear_log(self) -> None:
+        """
+        Forgets the pending entries of the event log after they have been written.
+        :return: None
+        """
+        self._pending_log = []
 
     def verify_password(self, password: Optional[str]):
         """
@@ -202,8 +267,9 @@ class RoomInfo(BaseModel):
         """
         password_protected = bool(room.hashed_password)
         rubber_number = len(room.table.current_rubber.games) if room.table.started else 0
-        trick_number = len(room.table.current_rubber.current_game().current_hand.tricks) if \
-            room.table.started else 0
+        current_hand = room.table.current_rubber.current_game().current_hand if \
+            room.table.started else None
+        trick_number = len(current_hand.tricks) if current_hand is not None else 0
         return RoomInfo(name=room.room_name,
                         password=password_protected,
                         rubber_number=len(room.table.rubbers),
@@ -213,3 +279,73 @@ class RoomInfo(BaseModel):
                         min_player=room.table.min_player,
                         max_player=room.table.max_player,
                         players=room.table.users.players)
+
+
+class RoomSummary(RoomInfo):
+    """
+    Summary of a room that is stored with the room, so it can be read without loading the whole
+    room and its game history. It is written in the same update as the room, so its counters
+    never disagree with the table.
+    started: if the game of the room has started
+    seats_taken: amount of players that joined the room
+    seats_free: amount of players that can still join the room
+    """
+    started: bool
+    seats_taken: int
+    seats_free: int
+
+    @staticmethod
+    def from_room(room: RoomInDb) -> 'RoomSummary':
+        """
+        Creates a room summary object from a room.
+        :param room: Meta data extracted from
+        :return: RoomSummary
+        """
+        seats_taken = len(room.players)
+        return RoomSummary(**RoomInfo.from_room(room).dict(), started=room.table.started,
+                           seats_taken=seats_taken,
+                           seats_free=max(room.table.max_player - seats_taken, 0))
+
+
+class LobbyRoom(RoomInfo):
+    """
+    Row of the lobby listing.
+    id: of the room
+    """
+    id: str
+
+
+class LobbyFilter(BaseModel):
+    """
+    Filters of the lobby listing. Rooms are matched by their summary.
+    open_seats: only rooms players can still join
+    not_started: only rooms whose game has not started
+    no_password: only rooms without password
+    min_player: only rooms for at least this amount of players
+    max_player: only rooms for at most this amount of players
+    """
+    open_seats: bool = False
+    not_started: bool = False
+    no_password: bool = False
+    min_player: Optional[int] = None
+    max_player: Optional[int] = None
+
+    def query(self) -> dict:
+        """
+        Returns the mongodb query of the filters on the room summary.
+        """
+        query = {}
+        if self.not_started:
+            query['room_summary.started'] = False
+        if self.no_password:
+            query['room_summary.password'] = False
+        if self.open_seats:
+            query['room_summary.seats_free'] = {'$gt': 0}
+        size = {}
+        if self.min_player is not None:
+            size['$gte'] = self.min_player
+        if self.max_player is not None:
+            size['$lte'] = self.max_player
+        if size:
+            query['room_summary.max_player'] = size
+        return query
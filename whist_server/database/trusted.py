@@ -0,0 +1,142 @@
+"""Construction of models from documents the server has written itself"""
+import functools
+from enum import Enum
+from typing import Any, Callable, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import ModelField, SHAPE_DICT, SHAPE_LIST, SHAPE_SET, SHAPE_SINGLETON, \
+    SHAPE_TUPLE_ELLIPSIS
+from whist_core.cards.card import Card
+from whist_core.cards.card_container import UnorderedCardContainer
+
+from whist_server.const import VALIDATE_DOCUMENTS
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+Converter = Callable[[Any], Any]
+
+_PLAIN_TYPES = (str, int, float, bool, dict, list)
+_SEQUENCES: dict[int, Callable[[list], Any]] = {SHAPE_LIST: list, SHAPE_SET: set,
+                                                SHAPE_TUPLE_ELLIPSIS: tuple}
+
+# Cards are immutable, so every room shares the same 52 instances.
+_CARDS: dict[tuple[Any, Any], Card] = {(card.suit.value, card.rank.value): card
+                                       for card in Card.all_cards()}
+
+
+def _sync_cards(container: UnorderedCardContainer) -> None:
+    container._cards_set = set(container.cards)  # pylint: disable=protected-access
+
+
+# Models whose constructor sets up more than their fields. The function restores that state.
+_AFTER_CONSTRUCT: dict[type, Callable[[Any], None]] = {UnorderedCardContainer: _sync_cards}
+
+
+def construct(model: Type[ModelT], document: dict) -> ModelT:
+    """
+    Creates a model and all models nested in it from a document of the database without
+    validating it. Enums, models and containers of them are built directly from the stored
+    values, other types are validated by their field. Documents missing required fields are
+    validated as a whole, so they fail like before. Client input must always be validated.
+    If VALIDATE_DOCUMENTS is set, every document is validated.
+    :param model: class of the model
+    :param document: as written by the server, e.g. the dictionary of a model
+    :return: the model
+    """
+    if VALIDATE_DOCUMENTS:
+        return model(**document)
+    return _construct(model, document)
+
+
+def _construct(model: Type[ModelT], document: dict) -> ModelT:
+    values = {}
+    fields_set = set()
+    for name, field, convert in _plan(model):
+        if field.alias in document:
+            values[name] = convert(document[field.alias])
+            fields_set.add(name)
+        elif name in document:
+            values[name] = convert(document[name])
+            fields_set.add(name)
+        elif field.required:
+            return model(**document)
+        else:
+            values[name] = field.get_default()
+    instance = model.construct(fields_set, **values)
+    for finish in _finishers(model):
+        finish(instance)
+    return instance
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> tuple[tuple[str, ModelField, Converter], ...]:
+    """
+    The fields of a model with the function converting their stored values.
+    """
+    return tuple((name, field, _converter(model, field))
+                 for name, field in model.__fields__.items())
+
+
+@functools.lru_cache(maxsize=None)
+def _finishers(model: Type[BaseModel]) -> tuple[Callable[[Any], None], ...]:
+    return tuple(_AFTER_CONSTRUCT[base] for base in model.__mro__ if base in _AFTER_CONSTRUCT)
+
+
+def _converter(model: Type[BaseModel], field: ModelField) -> Converter:
+    if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        convert = _single_converter(model, field)
+    elif field.shape in _SEQUENCES:
+        convert = _sequence_converter(model, field)
+    elif field.shape == SHAPE_DICT:
+        convert = _dict_converter(model, field)
+    else:
+        convert = functools.partial(_validate, model, field)
+    return lambda value: None if value is None else convert(value)
+
+
+def _single_converter(model: Type[BaseModel], field: ModelField) -> Converter:
+    field_type = field.type_
+    validate = functools.partial(_validate, model, field)
+    if field_type in _CONVERTERS:
+        return _CONVERTERS[field_type]
+    if not isinstance(field_type, type):
+        return validate
+    if issubclass(field_type, BaseModel):
+        return lambda value: value if isinstance(value, field_type) else \
+            _construct(field_type, value)
+    if issubclass(field_type, Enum):
+        return field_type
+    if field_type in _PLAIN_TYPES:
+        return lambda value: value if isinstance(value, field_type) else validate(value)
+    return validate
+
+
+def _card(value: Any) -> Card:
+    if isinstance(value, Card):
+        return value
+    card = _CARDS.get((value['suit'], value['rank']))
+    return _construct(Card, value) if card is None else card
+
+
+_CONVERTERS: dict[Any, Converter] = {Any: lambda value: value, Card: _card}
+
+
+def _sequence_converter(model: Type[BaseModel], field: ModelField) -> Converter:
+    sequence = _SEQUENCES[field.shape]
+    convert_item = _converter(model, field.sub_fields[0])
+    validate = functools.partial(_validate, model, field)
+    return lambda value: sequence([convert_item(item) for item in value]) \
+        if isinstance(value, (list, tuple, set)) else validate(value)
+
+
+def _dict_converter(model: Type[BaseModel], field: ModelField) -> Converter:
+    convert_item = _converter(model, field.sub_fields[0])
+    validate = functools.partial(_validate, model, field)
+    return lambda value: {key: convert_item(item) for key, item in value.items()} \
+        if isinstance(value, dict) else validate(value)
+
+
+def _validate(model: Type[BaseModel], field: ModelField, value: Any) -> Any:
+    value, errors = field.validate(value, {}, loc=field.alias, cls=model)
+    if errors:
+        raise ValidationError([errors], model)
+    return value
@@ -5,6 +5,7 @@ from typing import Optional
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
 from whist_core.user.player import Player
 
 from whist_server.const import SECRET_KEY, ALGORITHM
@@ -42,7 +43,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme),
     :return: DO of User
     """
     token_data = await _get_token_data(token)
-    user = user_db_service.get(token_data.username)
+    user = await user_db_service.get(token_data.username)
     return user.to_player()
 
 
@@ -55,9 +56,9 @@ async def check_credentials(username: str, password: str) -> bool:
     UserNotFoundError.
     """
     user_db_service = UserDatabaseService()
-    user = user_db_service.get(username)
+    user = await user_db_service.get(username)
     password_db_service = PasswordService()
-    return password_db_service.verify(password, user.hashed_password)
+    return await run_in_threadpool(password_db_service.verify, password, user.hashed_password)
 
 
 async def _get_token_data(token):
@@ -1,24 +1,57 @@
 """Side Channel Manager"""
+import asyncio
+from typing import Optional
+
+from starlette import status
+
+from whist_server.const import CHANNEL_ACK_TIMEOUT, CHANNEL_BACKPLANE, CHANNEL_BACKPLANE_SOCKET
 from whist_server.services.error import ChannelAlreadyExistsError, ChannelNotFoundError
-from whist_server.web_socket.events.event import Event
+from whist_server.services.metrics_service import MetricsService
+from whist_server.web_socket.backplane import Backplane, create_backplane
+from whist_server.web_socket.events.event import Event, RoomArchivedEvent
 from whist_server.web_socket.side_channel import SideChannel
 from whist_server.web_socket.subscriber import Subscriber
 
 
 class ChannelService:
     """
-    Manages websocket side-channel clients
+    Manages websocket side-channel clients. Events are published through the backplane
+    configured by CHANNEL_BACKPLANE, so they reach the clients of a room on every server process.
     """
     _instance = None
     _channels: dict[str, SideChannel] = None
+    _backplane: Backplane = None
 
     def __new__(cls):
         """Creates a new instance of this service singleton."""
         if cls._instance is None:
             cls._instance = super(ChannelService, cls).__new__(cls)
             cls._channels = {}
+            cls._backplane = create_backplane(CHANNEL_BACKPLANE, cls.deliver,
+                                              CHANNEL_BACKPLANE_SOCKET)
+            MetricsService().register('channels', cls.stats)
         return cls._instance
 
+    @classmethod
+    async def start(cls, backplane: Optional[Backplane] = None) -> None:
+        """
+        Connects the backplane to the other server processes.
+        :param backplane: replaces the configured backplane if set
+        :return: None
+        """
+        if backplane is not None:
+            await cls._backplane.stop()
+            cls._backplane = backplane
+        await cls._backplane.start()
+
+    @classmethod
+    async def stop(cls) -> None:
+        """
+        Disconnects the backplane from the other server processes.
+        :return: None
+        """
+        await cls._backplane.stop()
+
     @classmethod
     def add(cls, room_id: str, channel: SideChannel) -> None:
         """
@@ -34,13 +67,45 @@ class ChannelService:
     @classmethod
     def attach(cls, room_id: str, subscriber: Subscriber) -> None:
         """
-        Adds a client to a side-channel.
+        Adds a client to a side-channel. The side-channel is created if the room has been
+        created by another server process.
         :param room_id: ID of the room the side-channel is associated with
         :param subscriber: the client wrapper
         :return: None
         """
+        if room_id not in cls._channels.keys():
+            cls._channels.update({room_id: SideChannel()})
         cls._channels.get(room_id).attach(subscriber)
 
+    @classmethod
+    def resume(cls, room_id: str, subscriber: Subscriber, last_sequence: int,
+               room_sequence: int) -> bool:
+        """
+        Queues the buffered events of a room a client missed.
+        :param room_id: ID of the room the side-channel is associated with
+        :param subscriber: the client wrapper
+        :param last_sequence: sequence number of the last event the client received
+        :param room_sequence: sequence number of the last event of the room known to the caller
+        :return: True if all missed events have been queued, False if some are not buffered
+        """
+        channel = cls._channels.get(room_id)
+        if channel is None:
+            return last_sequence >= room_sequence
+        return channel.resume(subscriber, last_sequence, room_sequence)
+
+    @classmethod
+    def detach(cls, room_id: str, subscriber: Subscriber) -> None:
+        """
+        Removes a client from a side-channel and stops writing to it.
+        :param room_id: ID of the room the side-channel is associated with
+        :param subscriber: the client wrapper
+        :return: None
+        """
+        channel = cls._channels.get(room_id)
+        if channel is not None:
+            channel.remove(subscriber)
+        subscriber.close(code=status.WS_1000_NORMAL_CLOSURE)
+
     @classmethod
     def remove(cls, room_id: str) -> None:
         """
@@ -52,14 +117,73 @@ class ChannelService:
             raise ChannelNotFoundError()
         cls._channels.pop(room_id)
 
+    @classmethod
+    async def close(cls, room_id: str) -> None:
+        """
+        Sends a RoomArchivedEvent to the clients of a room on every server process, closes their
+        connections afterwards and removes the side-channels of the room.
+        :param room_id: ID of the room the side-channel is associated with
+        :return: None
+        """
+        await cls._backplane.publish(room_id, RoomArchivedEvent())
+
     @classmethod
     async def notify(cls, room_id: str, event: Event) -> None:
         """
-        Multicast to all clients of a room.
+        Multicast to all clients of a room on every server process.
         :param room_id: ID of the room the side-channel is associated with
         :param event: the wrapped information of what to broadcast
         :return: None
         """
-        if room_id not in cls._channels.keys():
-            raise ChannelNotFoundError()
-        await cls._channels.get(room_id).notify(event)
+        await cls._backplane.publish(room_id, event)
+
+    @classmethod
+    def acknowledge(cls, room_id: str, subscriber: Subscriber, event: Event,
+                    sequence: int) -> None:
+        """
+        Sends the response to a command of a client after the events of the command. Events of
+        a command executed by this process may reach it only later through the backplane, so
+        the response waits for them for at most CHANNEL_ACK_TIMEOUT seconds.
+        :param room_id: ID of the room the side-channel is associated with
+        :param subscriber: client that sent the command
+        :param event: the response
+        :param sequence: sequence number of the last event of the command, 0 if there is none
+        :return: None
+        """
+        frame = event.encode().decode()
+        channel = cls._channels.get(room_id)
+        if channel is None:
+            subscriber.put(frame, event.name)
+        elif not channel.acknowledge(subscriber, frame, event.name, sequence):
+            asyncio.get_running_loop().call_later(CHANNEL_ACK_TIMEOUT, channel.release,
+                                                  subscriber)
+
+    @classmethod
+    async def deliver(cls, room_id: str, event: Event) -> None:
+        """
+        Sends an event published by any server process to the clients of a room connected to
+        this process. A RoomArchivedEvent closes the clients and removes the side-channel.
+        :param room_id: ID of the room the side-channel is associated with
+        :param event: the published event
+        :return: None
+        """
+        channel = cls._channels.get(room_id)
+        if channel is None:
+            return
+        await channel.notify(event)
+        if isinstance(event, RoomArchivedEvent):
+            cls._channels.pop(room_id, None)
+            channel.close(status.WS_1001_GOING_AWAY)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Returns the amount of side-channels and clients of this process, the clients of every
+        room that has any and how many frames are queued for the clients.
+        """
+        depths = [depth for channel in cls._channels.values() for depth in channel.queue_depths()]
+        return {'channels': len(cls._channels), 'subscribers': len(depths),
+                'subscribers_per_room': {room_id: len(channel)
+                                         for room_id, channel in cls._channels.items()
+                                         if len(channel) > 0},
+                'queued_frames': sum(depths), 'max_queue_depth': max(depths, default=0)}
@@ -84,6 +84,35 @@ class RoomNotUpdatedError(Exception):
         super().__init__(message)
 
 
+class RoomVersionConflictError(Exception):
+    """
+    Is raised when a room has been changed by someone else since it was loaded.
+    """
+
+    def __init__(self, game_id: str):
+        """
+        Constructor.
+        :param game_id: ID of the room.
+        """
+        message = f'Room with id "{game_id}" has been modified concurrently.'
+        super().__init__(message)
+
+
+class IndexNotCreatedError(Exception):
+    """
+    Is raised when a unique index the services rely on could not be created.
+    """
+
+    def __init__(self, collection: str, name: str):
+        """
+        Constructor.
+        :param collection: name of the indexed collection
+        :param name: name of the index
+        """
+        message = f'Unique index {name} of {collection} could not be created.'
+        super().__init__(message)
+
+
 class CredentialsException(HTTPException):
     """
     Is raised when the credentials are incorrect.
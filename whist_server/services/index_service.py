@@ -0,0 +1,114 @@
+"""Ensures the indexes of the hot queries"""
+import asyncio
+import logging
+from typing import Optional
+
+from pydantic import BaseModel
+from pymongo.errors import PyMongoError
+
+from whist_server.database import db
+from whist_server.database.indexes import INDEXES, Index
+from whist_server.services.error import IndexNotCreatedError
+
+logger = logging.getLogger(__name__)
+
+
+class IndexReport(BaseModel):
+    """
+    Compares the declared indexes with the indexes of the database. Indexes are named
+    'collection.index', e.g. 'user.username_1'.
+    missing: declared indexes that do not exist or differ in uniqueness
+    unused: existing indexes that have not been used by any query
+    """
+    missing: list[str] = []
+    unused: list[str] = []
+
+
+class IndexService:
+    """
+    Creates the indexes declared in the registry. Creating an index that already exists does
+    nothing, so it is safe to ensure the indexes on every start of the server. The unique indexes
+    keep user and room names unique, so the server must not serve requests without them.
+    """
+    _instance = None
+    _task: Optional[asyncio.Task] = None
+
+    def __new__(cls):
+        """Creates a new instance of this service singleton."""
+        if cls._instance is None:
+            cls._instance = super(IndexService, cls).__new__(cls)
+        return cls._instance
+
+    @classmethod
+    async def ensure(cls, indexes: Optional[list[Index]] = None) -> list[str]:
+        """
+        Creates all declared indexes that do not exist yet. An index that cannot be created, e.g.
+        because existing documents violate its uniqueness, is logged and skipped.
+        :param indexes: to be ensured. Defaults to the registry.
+        :return: the names of the ensured indexes
+        """
+        ensured = []
+        for index in INDEXES if indexes is None else indexes:
+            try:
+                await db[index.collection].create_index(index.keys, unique=index.unique,
+                                                        name=index.name)
+                ensured.append(f'{index.collection}.{index.name}')
+            except PyMongoError:
+                logger.exception('Could not create index %s of %s', index.name,
+                                 index.collection)
+        return ensured
+
+    @classmethod
+    async def ensure_unique(cls, indexes: Optional[list[Index]] = None) -> list[str]:
+        """
+        Creates the declared unique indexes that do not exist yet.
+        :param indexes: whose unique indexes are ensured. Defaults to the registry.
+        :return: the names of the ensured indexes. Raises IndexNotCreatedError if an index cannot
+        be created, e.g. because existing documents violate its uniqueness.
+        """
+        ensured = []
+        for index in INDEXES if indexes is None else indexes:
+            if not index.unique:
+                continue
+            try:
+                await db[index.collection].create_index(index.keys, unique=True, name=index.name)
+            except PyMongoError as error:
+                raise IndexNotCreatedError(index.collection, index.name) from error
+            ensured.append(f'{index.collection}.{index.name}')
+        return ensured
+
+    @classmethod
+    def ensure_in_background(cls) -> asyncio.Task:
+        """
+        Ensures the declared indexes that are not unique without blocking the caller, e.g. the
+        start of the server. They only speed up queries.
+        :return: the task creating the indexes
+        """
+        indexes = [index for index in INDEXES if not index.unique]
+        cls._task = asyncio.get_running_loop().create_task(cls.ensure(indexes))
+        return cls._task
+
+    @classmethod
+    async def report(cls, indexes: Optional[list[Index]] = None) -> IndexReport:
+        """
+        Reports declared indexes that are missing and existing indexes that are unused. Only the
+        collections with declared indexes are inspected.
+        :param indexes: that are declared. Defaults to the registry.
+        :return: the report
+        """
+        indexes = INDEXES if indexes is None else indexes
+        report = IndexReport()
+        for collection in sorted({index.collection for index in indexes}):
+            existing = await db[collection].index_information()
+            declared = [index for index in indexes if index.collection == collection]
+            report.missing.extend(f'{collection}.{index.name}' for index in declared
+                                  if not cls._exists(index, existing))
+            usage = await db[collection].index_usage()
+            report.unused.extend(f'{collection}.{name}' for name in existing
+                                 if name != '_id_' and usage.get(name, 0) == 0)
+        return report
+
+    @staticmethod
+    def _exists(index: Index, existing: dict) -> bool:
+        information = existing.get(index.name)
+        return information is not None and information.get('unique', False) == index.unique
@@ -0,0 +1,84 @@
+"""Runtime metrics of the server"""
+import threading
+from typing import Callable
+
+
+class MetricsService:
+    """
+    Collects counters and gauges of this process.
+    """
+    _instance = None
+    _counters: dict[str, int] = None
+    _gauges: dict[str, float] = None
+    _collectors: dict[str, Callable[[], dict]] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Creates a new instance of this service singleton."""
+        if cls._instance is None:
+            cls._instance = super(MetricsService, cls).__new__(cls)
+            cls._counters = {}
+            cls._gauges = {}
+            cls._collectors = {}
+        return cls._instance
+
+    @classmethod
+    def increment(cls, name: str, amount: int = 1) -> None:
+        """
+        Increases a counter.
+        :param name: of the counter
+        :param amount: to be added
+        :return: None
+        """
+        with cls._lock:
+            cls._counters.update({name: cls._counters.get(name, 0) + amount})
+
+    @classmethod
+    def counter(cls, name: str) -> int:
+        """
+        Current value of a counter.
+        :param name: of the counter
+        :return: the value. Zero if the counter has never been increased.
+        """
+        return cls._counters.get(name, 0)
+
+    @classmethod
+    def set_gauge(cls, name: str, value: float) -> None:
+        """
+        Sets a gauge to a value.
+        :param name: of the gauge
+        :param value: current value
+        :return: None
+        """
+        cls._gauges.update({name: value})
+
+    @classmethod
+    def register(cls, name: str, collector: Callable[[], dict]) -> None:
+        """
+        Registers a callback that is asked for its metrics whenever they are collected.
+        :param name: under which the metrics are reported
+        :param collector: returns a dictionary of metrics
+        :return: None
+        """
+        cls._collectors.update({name: collector})
+
+    @classmethod
+    def collect(cls) -> dict:
+        """
+        Collects all metrics.
+        :return: dictionary of counters, gauges and the metrics of all registered collectors.
+        """
+        with cls._lock:
+            metrics = {'counters': dict(cls._counters), 'gauges': dict(cls._gauges)}
+        metrics.update({name: collector() for name, collector in cls._collectors.items()})
+        return metrics
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Resets all counters and gauges. Registered collectors are kept.
+        :return: None
+        """
+        with cls._lock:
+            cls._counters.clear()
+            cls._gauges.clear()
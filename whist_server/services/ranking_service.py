@@ -2,6 +2,7 @@
 from whist_core.user.player import Player
 
 from whist_server.database import db
+from whist_server.database.trusted import construct
 
 
 class RankingService:
@@ -22,7 +23,7 @@ class RankingService:
         return cls._instance
 
     @classmethod
-    def select(cls, order: str, amount: int, start: int) -> list[Player]:
+    async def select(cls, order: str, amount: int, start: int) -> list[Player]:
         """
         Returns a list of user limited by starting index and amount in order of their rating.
         :param order: Integer either 1 for ascending or -1 for descending order.
@@ -33,7 +34,7 @@ class RankingService:
         user_cursor.skip(start)
         if amount > 0:
             user_cursor.limit(amount)
-        return [Player(**user) for user in user_cursor]
+        return [construct(Player, user) async for user in user_cursor]
 
     @classmethod
     def _get_all_players(cls, order):
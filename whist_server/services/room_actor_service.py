@@ -0,0 +1,250 @@
+"""Per-room actors that apply commands to live rooms."""
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Any, Optional
+
+from whist_server.const import ROOM_ACTOR_BATCH_SIZE, ROOM_ACTOR_IDLE_TIMEOUT, ROOM_UPDATE_RETRIES
+from whist_server.database.command import RoomCommand
+from whist_server.database.room import RoomInDb
+from whist_server.services.error import RoomVersionConflictError
+from whist_server.services.metrics_service import MetricsService
+from whist_server.web_socket.events.event import Event
+
+logger = logging.getLogger(__name__)
+
+
+# pylint: disable=too-many-instance-attributes
+class RoomActor:
+    """
+    Owns the live state of one room. Commands are queued in a mailbox and applied strictly in
+    order by a drain task. All commands that queued up while a batch was processed form the next
+    batch, which is saved with one write. The events of the commands are published in the same
+    order before the commands are acknowledged, so a client that receives its response has been
+    sent every event its command caused.
+    """
+
+    def __init__(self, room_id: str, room_service, channel_service, batch_size: int):
+        """
+        Constructor.
+        :param room_id: ID of the room this actor owns
+        :param room_service: loads and saves the room
+        :param channel_service: publishes the events of the commands
+        :param batch_size: maximum amount of commands saved with one write
+        """
+        self._room_id = room_id
+        self._room_service = room_service
+        self._channel_service = channel_service
+        self._batch_size = batch_size
+        self._room: Optional[RoomInDb] = None
+        self._mailbox: deque[tuple[RoomCommand, asyncio.Future]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self.last_activity = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        """
+        True if there are neither queued nor running commands.
+        """
+        return not self._mailbox and (self._task is None or self._task.done())
+
+    async def submit(self, command: RoomCommand) -> Any:
+        """
+        Queues a command and waits until it has been applied and saved. Commands of all event
+        loops are applied by the same drain task, which resolves each command in the event loop
+        it has been submitted from.
+        :param command: to be applied to the room
+        :return: the result of the command. Raises the error of the command if it failed.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._mailbox.append((command, future))
+        self.last_activity = time.monotonic()
+        self._start(loop)
+        return await future
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._task is None or self._task.done() or self._task.get_loop().is_closed():
+            self._task = loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        batch = []
+        try:
+            while self._mailbox:
+                batch = []
+                while self._mailbox and len(batch) < self._batch_size:
+                    command, future = self._mailbox.popleft()
+                    # Nobody awaits a command whose event loop has been closed.
+                    if not future.done() and not future.get_loop().is_closed():
+                        batch.append((command, future))
+                if batch:
+                    outcomes = await self._process(batch)
+                    if outcomes is not None:
+                        await self._publish(self._events(batch, outcomes))
+                        self._acknowledge(batch, outcomes)
+        except asyncio.CancelledError:
+            # The event loop of the task shuts down. The queued commands of other event loops are
+            # handed over to a new drain task in one of them.
+            self._fail(batch, RuntimeError(f'The actor of room {self._room_id} has been stopped'))
+            self._task = None
+            self._hand_over()
+            raise
+        self.last_activity = time.monotonic()
+
+    def _hand_over(self) -> None:
+        own_loop = asyncio.get_running_loop()
+        for _, future in self._mailbox:
+            loop = future.get_loop()
+            if loop is not own_loop and not loop.is_closed():
+                with contextlib.suppress(RuntimeError):
+                    loop.call_soon_threadsafe(self._start, loop)
+                return
+
+    async def _process(self, batch: list[tuple[RoomCommand, asyncio.Future]]
+                       ) -> Optional[list[tuple[Any, Optional[Exception]]]]:
+        for _ in range(ROOM_UPDATE_RETRIES + 1):
+            try:
+                if self._room is None:
+                    self._room = await self._room_service.get(self._room_id)
+                outcomes = [self._apply(command) for command, _ in batch]
+                if any(error is None for _, error in outcomes):
+                    await self._room_service.save(self._room)
+            except RoomVersionConflictError:
+                # Someone else saved the room. Replay the batch on the latest state.
+                self._room = None
+                continue
+            except Exception as error:  # pylint: disable=broad-except
+                self._room = None
+                self._fail(batch, error)
+                return None
+            return outcomes
+        self._fail(batch, RoomVersionConflictError(self._room_id))
+        return None
+
+    def _apply(self, command: RoomCommand) -> tuple[Any, Optional[Exception]]:
+        try:
+            return command.apply(self._room), None
+        except Exception as error:  # pylint: disable=broad-except
+            return None, error
+
+    @staticmethod
+    def _events(batch, outcomes) -> list[Event]:
+        return [event for (command, _), (_, error) in zip(batch, outcomes) if error is None
+                for event in command.events]
+
+    @classmethod
+    def _acknowledge(cls, batch, outcomes) -> None:
+        for (_, future), (result, error) in zip(batch, outcomes):
+            cls._settle(future, result, error)
+
+    @classmethod
+    def _fail(cls, batch, error: Exception) -> None:
+        for _, future in batch:
+            cls._settle(future, None, error)
+
+    @staticmethod
+    def _settle(future: asyncio.Future, result: Any, error: Optional[Exception]) -> None:
+        """
+        Resolves the future of a command in the event loop it belongs to.
+        """
+        def settle():
+            if future.done():
+                return
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+        loop = future.get_loop()
+        if loop is asyncio.get_running_loop():
+            settle()
+        elif not loop.is_closed():
+            # The loop may be closed in the meantime, then nobody awaits the command anymore.
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(settle)
+
+    async def _publish(self, events: list[Event]) -> None:
+        for event in events:
+            try:
+                await self._channel_service.notify(self._room_id, event)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Could not publish %s of room %s', event.name, self._room_id)
+
+
+class RoomActorService:
+    """
+    Manages one actor per active room. Actors that have been idle for ROOM_ACTOR_IDLE_TIMEOUT
+    seconds are reaped, which releases their live room.
+    """
+    _instance = None
+    _actors: dict[str, RoomActor] = None
+    _last_reap: float = None
+
+    def __new__(cls):
+        """Creates a new instance of this service singleton."""
+        if cls._instance is None:
+            cls._instance = super(RoomActorService, cls).__new__(cls)
+            cls._actors = {}
+            cls._last_reap = time.monotonic()
+            MetricsService().register('room_actors', cls.stats)
+        return cls._instance
+
+    @classmethod
+    async def submit(cls, room_id: str, command: RoomCommand, room_service,
+                     channel_service) -> Any:
+        """
+        Applies a command to a room through the room's actor.
+        :param room_id: ID of the room
+        :param command: to be applied
+        :param room_service: loads and saves the room if a new actor is required
+        :param channel_service: publishes the events if a new actor is required
+        :return: the result of the command. Raises the error of the command if it failed.
+        """
+        if time.monotonic() - cls._last_reap >= ROOM_ACTOR_IDLE_TIMEOUT:
+            cls.reap_idle()
+        actor = cls._actors.get(room_id)
+        if actor is None:
+            actor = RoomActor(room_id, room_service, channel_service, ROOM_ACTOR_BATCH_SIZE)
+            cls._actors.update({room_id: actor})
+        return await actor.submit(command)
+
+    @classmethod
+    def reap_idle(cls, timeout: float = ROOM_ACTOR_IDLE_TIMEOUT) -> int:
+        """
+        Removes all actors that have been idle for a time.
+        :param timeout: in seconds
+        :return: the amount of removed actors
+        """
+        now = time.monotonic()
+        cls._last_reap = now
+        idle = [room_id for room_id, actor in cls._actors.items()
+                if actor.idle and now - actor.last_activity >= timeout]
+        for room_id in idle:
+            cls._actors.pop(room_id)
+        return len(idle)
+
+    @classmethod
+    def remove(cls, room_id: str) -> None:
+        """
+        Removes the actor of a room if there is one.
+        :param room_id: ID of the room
+        :return: None
+        """
+        cls._actors.pop(room_id, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Removes all actors.
+        :return: None
+        """
+        cls._actors.clear()
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        """
+        Returns the amount of live actors.
+        """
+        return {'actors': len(cls._actors)}
@@ -0,0 +1,101 @@
+"""In-process cache of rooms"""
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class RoomCache:
+    """
+    Least recently used cache of room documents keyed by the id of their room. The documents are
+    stored as the server has written them to the database and are shared between all readers, so
+    they must never be changed. Every reader builds its own room from the document, which is
+    much cheaper than copying a room. The cache only sees the saves of its own process, so
+    readers have to check that a document is still current.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Constructor.
+        :param max_size: maximum number of resident rooms. Zero disables the cache.
+        """
+        self._max_size = max_size
+        self._documents: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Amount of resident rooms."""
+        return len(self._documents)
+
+    def __contains__(self, room_id: str) -> bool:
+        """Returns if the room is resident. Does not count as an access."""
+        return str(room_id) in self._documents
+
+    @property
+    def max_size(self) -> int:
+        """
+        The maximum amount of resident rooms.
+        """
+        return self._max_size
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Current counters of the cache.
+        """
+        return {'size': len(self._documents), 'max_size': self._max_size, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    def get(self, room_id: str) -> Optional[dict]:
+        """
+        Retrieves the document of a resident room. It must not be changed.
+        :param room_id: of the room
+        :return: the document if the room is resident else None
+        """
+        with self._lock:
+            document = self._documents.get(str(room_id))
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(str(room_id))
+            self.hits += 1
+        return document
+
+    def put(self, room_id: str, document: dict) -> None:
+        """
+        Stores the document of a room. Evicts the least recently used rooms if the cache is full.
+        :param room_id: of the room
+        :param document: of the room as written to the database. It must not be changed
+        afterwards.
+        :return: None
+        """
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._documents[str(room_id)] = document
+            self._documents.move_to_end(str(room_id))
+            while len(self._documents) > self._max_size:
+                self._documents.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, room_id: str) -> None:
+        """
+        Removes a room from the cache if it is resident.
+        :param room_id: of the room
+        :return: None
+        """
+        with self._lock:
+            self._documents.pop(str(room_id), None)
+
+    def clear(self) -> None:
+        """
+        Removes all rooms and resets the counters.
+        :return: None
+        """
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
@@ -0,0 +1,104 @@
+"""Garbage collection of idle rooms"""
+import asyncio
+import datetime
+import logging
+from typing import Optional
+
+from whist_server.const import ROOM_ARCHIVE_RETENTION, ROOM_EMPTY_TTL, ROOM_GC_BATCH_SIZE, \
+    ROOM_GC_INTERVAL, ROOM_IDLE_TTL
+from whist_server.services.channel_service import ChannelService
+from whist_server.services.metrics_service import MetricsService
+from whist_server.services.room_actor_service import RoomActorService
+from whist_server.services.room_db_service import RoomDatabaseService
+from whist_server.services.room_event_service import RoomEventService
+
+logger = logging.getLogger(__name__)
+
+
+class RoomCollectorService:
+    """
+    Archives rooms that have been idle for ROOM_IDLE_TTL seconds, or that have been left by all
+    players for ROOM_EMPTY_TTL seconds. Their event log, actor and cached copy are dropped. Their
+    websocket clients get a RoomArchivedEvent and are disconnected. Archived rooms are deleted
+    after ROOM_ARCHIVE_RETENTION seconds.
+    """
+    _instance = None
+    _rooms: RoomDatabaseService = None
+    _log: RoomEventService = None
+    _channels: ChannelService = None
+    _actors: RoomActorService = None
+    _metrics: MetricsService = None
+    _task: Optional[asyncio.Task] = None
+
+    def __new__(cls):
+        """Creates a new instance of this service singleton."""
+        if cls._instance is None:
+            cls._instance = super(RoomCollectorService, cls).__new__(cls)
+            cls._rooms = RoomDatabaseService()
+            cls._log = RoomEventService()
+            cls._channels = ChannelService()
+            cls._actors = RoomActorService()
+            cls._metrics = MetricsService()
+        return cls._instance
+
+    @classmethod
+    async def collect(cls, now: Optional[datetime.datetime] = None) -> int:
+        """
+        Archives up to ROOM_GC_BATCH_SIZE stale rooms and deletes expired archived rooms.
+        :param now: current time in UTC. Defaults to the clock.
+        :return: the amount of archived rooms
+        """
+        now = datetime.datetime.utcnow() if now is None else now
+        await cls._rooms.backfill_activity(now)
+        stale = await cls._rooms.stale(now - datetime.timedelta(seconds=ROOM_IDLE_TTL),
+                                       now - datetime.timedelta(seconds=ROOM_EMPTY_TTL),
+                                       ROOM_GC_BATCH_SIZE)
+        archived = 0
+        for document in stale:
+            if await cls._rooms.archive(document):
+                await cls._release(str(document['_id']))
+                archived += 1
+        await cls._rooms.purge_archive(now - datetime.timedelta(seconds=ROOM_ARCHIVE_RETENTION))
+        cls._metrics.increment('rooms_archived', archived)
+        return archived
+
+    @classmethod
+    async def _release(cls, room_id: str) -> None:
+        await cls._log.delete(room_id)
+        cls._actors.remove(room_id)
+        await cls._channels.close(room_id)
+
+    @classmethod
+    async def run(cls, interval: float = ROOM_GC_INTERVAL) -> None:
+        """
+        Collects stale rooms periodically until cancelled.
+        :param interval: seconds between two collections
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await cls.collect()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Could not collect stale rooms')
+
+    @classmethod
+    def start(cls) -> Optional[asyncio.Task]:
+        """
+        Starts collecting in the background every ROOM_GC_INTERVAL seconds.
+        :return: the collecting task. None if ROOM_GC_INTERVAL disables the collection.
+        """
+        if ROOM_GC_INTERVAL <= 0:
+            return None
+        cls._task = asyncio.get_running_loop().create_task(cls.run())
+        return cls._task
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Stops collecting in the background.
+        :return: None
+        """
+        if cls._task is not None:
+            cls._task.cancel()
+        cls._task = None
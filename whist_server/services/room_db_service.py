@@ -1,29 +1,63 @@
 """Room database connector"""
+import datetime
+import logging
 from typing import Optional
 
 import bson.errors
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from whist_core.user.player import Player
 
+from whist_server.const import ROOM_CACHE_SIZE
 from whist_server.database import db
-from whist_server.database.room import RoomInDb
-from whist_server.services.error import RoomNotFoundError, RoomNotUpdatedError
+from whist_server.database.card_codec import decode_cards, encode_cards
+from whist_server.database.diff import diff_document
+from whist_server.database.room import LobbyFilter, LobbyRoom, RoomInDb, RoomInfo, RoomSummary
+from whist_server.database.trusted import construct
+from whist_server.services.error import RoomNotFoundError, RoomNotUpdatedError, \
+    RoomVersionConflictError
+from whist_server.services.metrics_service import MetricsService
+from whist_server.services.room_cache import RoomCache
+from whist_server.services.room_event_service import RoomEventService
+
+logger = logging.getLogger(__name__)
 
 
 class RoomDatabaseService:
     """
-    Handles interactions with the room database.
+    Handles interactions with the room database. Every room document contains a 'room_summary'
+    with the room info, so listings do not need to load the rooms, and the time of its last
+    modification as 'last_activity'. Idle rooms are moved to the 'room_archive'.
     """
     _instance = None
     _rooms = None
+    _archive = None
+    _cache: RoomCache = None
+    _metrics: MetricsService = None
+    _log: RoomEventService = None
+
+    _SUMMARY = 'room_summary'
+    _ACTIVITY = 'last_activity'
 
     def __new__(cls):
         """Creates a new instance of this service singleton."""
         if cls._instance is None:
             cls._instance = super(RoomDatabaseService, cls).__new__(cls)
             cls._rooms = db.room
+            cls._archive = db.room_archive
+            cls._cache = RoomCache(ROOM_CACHE_SIZE)
+            cls._metrics = MetricsService()
+            cls._metrics.register('room_cache', cls.cache_stats)
+            cls._log = RoomEventService()
         return cls._instance
 
+    @classmethod
+    def cache_stats(cls) -> dict[str, int]:
+        """
+        Returns the hit, miss and eviction counters of the room cache.
+        """
+        return cls._cache.stats
+
     # pylint: disable=too-many-arguments
     @classmethod
     def create_with_pwd(cls, room_name: str, creator: Player, hashed_password: Optional[str] = None,
@@ -44,65 +78,293 @@ class RoomDatabaseService:
         return RoomInDb(**room.dict(), hashed_password=hashed_password)
 
     @classmethod
-    def add(cls, room: RoomInDb) -> str:
+    async def add(cls, room: RoomInDb) -> str:
         """
-        Adds a room to the database.
+        Adds a room to the database and writes its first snapshot to the event log. The unique
+        index on the room name rejects duplicates atomically.
         :param room: to be added
-        :return: The id of the successful added room.
+        :return: The id of the successful added room or of the existing room with the same name.
         """
+        document = cls._document(room, exclude={'id'})
+        document[cls._ACTIVITY] = datetime.datetime.utcnow()
         try:
-            room: RoomInDb = cls.get_by_name(room.room_name)
-            return str(room.id)
-        except RoomNotFoundError:
-            room_id = cls._rooms.insert_one(room.dict(exclude={'id'}))
-            return str(room_id.inserted_id)
+            result = await cls._rooms.insert_one(document)
+        except DuplicateKeyError:
+            existing = await cls._rooms.find_one({'table.name': room.room_name}, {'_id': 1})
+            if existing is None:
+                raise
+            return str(existing['_id'])
+        room_id = str(result.inserted_id)
+        await cls._log.snapshot(room_id, room)
+        return room_id
 
     @classmethod
-    def all(cls) -> [RoomInDb]:
+    async def all(cls) -> [RoomInDb]:
         """
         Returns all rooms in the database.
         """
-        return [RoomInDb(**room) for room in cls._rooms.find()]
+        return [construct(RoomInDb, decode_cards(room)) async for room in cls._rooms.find()]
+
+    @classmethod
+    async def ids(cls) -> list[str]:
+        """
+        Returns the ids of all rooms without loading the rooms.
+        """
+        return [str(room['_id']) async for room in cls._rooms.find({}, {'_id': 1})]
+
+    @classmethod
+    async def lobby(cls, lobby_filter: LobbyFilter, after: Optional[str] = None,
+                    limit: int = 20) -> list[LobbyRoom]:
+        """
+        Returns a page of the rooms matching the filters, ordered by their id. The next page
+        starts after the id of the last room of a page, so each page costs the same regardless
+        of its position.
+        :param lobby_filter: filters of the rooms
+        :param after: id of the last room of the previous page. None for the first page.
+        :param limit: maximum amount of rooms of the page
+        :return: the rooms of the page. Raises RoomNotFoundError if 'after' is not a room id.
+        """
+        # Rooms saved before summaries were introduced are not listed until they are saved again.
+        query = {**lobby_filter.query(), cls._SUMMARY: {'$exists': True}}
+        if after is not None:
+            try:
+                query['_id'] = {'$gt': ObjectId(after)}
+            except bson.errors.InvalidId as id_error:
+                raise RoomNotFoundError(after) from id_error
+        cursor = cls._rooms.find(query, {cls._SUMMARY: 1}, sort=[('_id', 1)], limit=limit)
+        return [construct(LobbyRoom, {**room[cls._SUMMARY], 'id': str(room['_id'])})
+                async for room in cursor]
+
+    @classmethod
+    async def find_open(cls, exclude: Optional[list[str]] = None,
+                        player: Optional[Player] = None) -> Optional[str]:
+        """
+        Finds a room without password that has not started and has free seats. Rooms with the
+        fewest free seats are preferred, so they fill up and start sooner.
+        :param exclude: ids of rooms not to be returned
+        :param player: rooms this player has joined are not returned
+        :return: the id of the room or None if there is no open room
+        """
+        query = {f'{cls._SUMMARY}.started': False, f'{cls._SUMMARY}.password': False,
+                 f'{cls._SUMMARY}.seats_free': {'$gt': 0}}
+        if player is not None:
+            query[f'{cls._SUMMARY}.players.username'] = {'$ne': player.username}
+        if exclude:
+            query['_id'] = {'$nin': [ObjectId(room_id) for room_id in exclude]}
+        room = await cls._rooms.find_one(query, {'_id': 1},
+                                         sort=[(f'{cls._SUMMARY}.seats_free', 1)])
+        return None if room is None else str(room['_id'])
 
     @classmethod
-    def get(cls, room_id: str) -> RoomInDb:
+    async def info(cls, room_id: str) -> RoomInfo:
         """
-        Retrieves a room from the database.
+        Retrieves the info of a room from its summary. Rooms stored before summaries have been
+        introduced are loaded as a whole.
+        :param room_id: of the room
+        :return: the room info
+        """
+        try:
+            document = await cls._rooms.find_one(ObjectId(room_id), {cls._SUMMARY: 1})
+        except bson.errors.InvalidId as id_error:
+            raise RoomNotFoundError(room_id) from id_error
+        if document is None:
+            raise RoomNotFoundError(room_id)
+        if cls._SUMMARY not in document:
+            return (await cls.get(room_id)).get_info()
+        return construct(RoomInfo, document[cls._SUMMARY])
+
+    @classmethod
+    async def get(cls, room_id: str) -> RoomInDb:
+        """
+        Retrieves a room from the cache or, if it is not resident, from the database. Other
+        server processes may have saved the room, so a cached room is only used if its version is
+        still the version in the database, which is read without the rest of the room. Every call
+        returns a new room object, which the caller may change.
         :param room_id: of the room
         :return: the room database object
         """
         try:
-            room = cls._rooms.find_one(ObjectId(room_id))
+            object_id = ObjectId(room_id)
         except bson.errors.InvalidId as id_error:
             raise RoomNotFoundError(room_id) from id_error
+        document = cls._cache.get(room_id)
+        if document is not None:
+            stored = await cls._rooms.find_one(object_id, {'version': 1})
+            if stored is not None and stored.get('version', 0) == document.get('version', 0):
+                return cls._restore(document)
+            cls._cache.invalidate(room_id)
+            cls._metrics.increment('room_cache_stale')
+        room = await cls._rooms.find_one(object_id)
         if room is None:
             raise RoomNotFoundError(room_id)
-        return RoomInDb(**room)
+        room = cls._load(room)
+        cls._cache.put(room_id, room.persisted_document)
+        return room
 
     @classmethod
-    def get_by_name(cls, room_name: str) -> RoomInDb:
+    async def get_by_name(cls, room_name: str) -> RoomInDb:
         """
         Similar to 'get(room_id)', but queries by room_name instead of room id.
         :param room_name: of the room
         :return: the room database object
         """
-        room = cls._rooms.find_one({'table.name': room_name})
+        room = await cls._rooms.find_one({'table.name': room_name})
         if room is None:
             raise RoomNotFoundError(game_name=room_name)
-        return RoomInDb(**room)
+        return cls._load(room)
 
     @classmethod
-    def save(cls, room: RoomInDb) -> None:
+    async def save(cls, room: RoomInDb) -> None:
         """
-        Saves an updated room object to the database.
+        Saves an updated room object to the database and writes it through to the cache. Only the
+        paths changed since the room has been loaded are sent to the database. Rooms without a
+        known database state are written as a whole. A save that changes the room refreshes its
+        last activity.
+        The save only succeeds if the version of the room in the database is still the version
+        the room has been loaded with. On success the version is incremented and the commands
+        applied to the room are appended to its event log. The room is saved at that point, so
+        an error writing the event log is only logged and the commands stay pending until the
+        next save of the room.
         :param room: updated room object
         :return: None. Raises RoomNotFoundError if it could not find a room with that ID. Raises
+        RoomVersionConflictError if the room has been saved by someone else in the meantime. Raises
         a general RoomNotUpdatedError if the room could not be saved.
         """
-        query = {'_id': ObjectId(room.id)}
-        values = {'$set': room.dict()}
-        result = cls._rooms.update_one(query, values)
+        document = cls._document(room)
+        if room.persisted_document is None:
+            values = {'$set': document}
+        else:
+            values = diff_document(room.persisted_document, document)
+        if not values:
+            return
+        next_version = room.version + 1
+        document['version'] = next_version
+        values.setdefault('$set', {}).update({'version': next_version,
+                                              cls._ACTIVITY: datetime.datetime.utcnow()})
+        query = {'_id': ObjectId(room.id), 'version': cls._version_query(room.version)}
+        cls._metrics.increment('room_saves')
+        result = await cls._rooms.update_one(query, values)
         if result.matched_count != 1:
-            raise RoomNotFoundError(room.id)
+            cls._cache.invalidate(room.id)
+            if await cls._rooms.count_documents({'_id': ObjectId(room.id)}, limit=1) == 0:
+                raise RoomNotFoundError(room.id)
+            cls._metrics.increment('room_save_conflicts')
+            raise RoomVersionConflictError(room.id)
         if result.modified_count != 1:
+            cls._cache.invalidate(room.id)
             raise RoomNotUpdatedError(room.id)
+        room.version = next_version
+        room.mark_persisted(document)
+        cls._cache.put(str(room.id), document)
+        try:
+            await cls._log.append(room)
+        except Exception:  # pylint: disable=broad-except
+            cls._metrics.increment('room_log_failures')
+            logger.exception('Could not append to the event log of room %s', room.id)
+
+    @classmethod
+    async def stale(cls, idle_before: datetime.datetime, empty_before: datetime.datetime,
+                    limit: int) -> list[dict]:
+        """
+        Finds rooms without recent activity. Only the fields needed for archiving are read.
+        :param idle_before: rooms without activity since then are stale
+        :param empty_before: rooms without players and without activity since then are stale
+        :param limit: maximum amount of rooms
+        :return: the room documents
+        """
+        query = {'$or': [{cls._ACTIVITY: {'$lt': idle_before}},
+                         {cls._ACTIVITY: {'$lt': empty_before},
+                          f'{cls._SUMMARY}.seats_taken': 0}]}
+        projection = {cls._SUMMARY: 1, cls._ACTIVITY: 1, 'creator': 1, 'version': 1}
+        return await cls._rooms.find(query, projection, limit=limit).to_list(length=None)
+
+    @classmethod
+    async def backfill_activity(cls, now: datetime.datetime) -> int:
+        """
+        Sets the last activity of rooms stored before it has been tracked, so they become stale
+        like any other room.
+        :param now: the last activity of these rooms
+        :return: the amount of updated rooms
+        """
+        result = await cls._rooms.update_many({cls._ACTIVITY: {'$exists': False}},
+                                              {'$set': {cls._ACTIVITY: now}})
+        return result.modified_count
+
+    @classmethod
+    async def archive(cls, document: dict) -> bool:
+        """
+        Moves a room into the 'room_archive' collection. Only the summary and the creator of the
+        room are kept. The room is claimed first by incrementing its version, so only one
+        archiver writes the archive record and concurrent saves fail. The room is removed only
+        if it has not been saved since it has been claimed, otherwise the archive record is
+        removed again.
+        :param document: of the room as returned by 'stale'
+        :return: True if the room has been archived. False if it has been modified or claimed
+        meanwhile.
+        """
+        room_id = document['_id']
+        version = document.get('version', 0)
+        claim = await cls._rooms.update_one(
+            {'_id': room_id, 'version': cls._version_query(version)},
+            {'$set': {'version': version + 1, 'archiving': True}})
+        cls._cache.invalidate(str(room_id))
+        if claim.matched_count != 1:
+            return False
+        archived = {cls._SUMMARY: document.get(cls._SUMMARY), 'creator': document.get('creator'),
+                    cls._ACTIVITY: document.get(cls._ACTIVITY),
+                    'archived_at': datetime.datetime.utcnow()}
+        await cls._archive.update_one({'_id': room_id}, {'$set': archived}, upsert=True)
+        result = await cls._rooms.delete_one({'_id': room_id, 'version': version + 1})
+        if result.deleted_count != 1:
+            await cls._archive.delete_one({'_id': room_id})
+            return False
+        return True
+
+    @classmethod
+    async def purge_archive(cls, archived_before: datetime.datetime) -> int:
+        """
+        Deletes archived rooms.
+        :param archived_before: rooms archived before are deleted
+        :return: the amount of deleted rooms
+        """
+        result = await cls._archive.delete_many({'archived_at': {'$lt': archived_before}})
+        return result.deleted_count
+
+    @classmethod
+    def _document(cls, room: RoomInDb, **kwargs) -> dict:
+        """
+        Returns the database document of a room including its summary. Cards are stored encoded.
+        :param room: to be stored
+        :param kwargs: arguments of 'dict' of the room
+        """
+        document = encode_cards(room.dict(**kwargs))
+        document[cls._SUMMARY] = RoomSummary.from_room(room).dict()
+        return document
+
+    @classmethod
+    def _load(cls, document: dict) -> RoomInDb:
+        """
+        Creates a room from its database document. The document itself, without the fields only
+        the database keeps, is remembered for partial updates, so the room is not serialized again.
+        """
+        persisted = {key: value for key, value in document.items()
+                     if key not in ('_id', cls._ACTIVITY)}
+        persisted['id'] = document['_id']
+        return cls._restore(persisted)
+
+    @classmethod
+    def _restore(cls, document: dict) -> RoomInDb:
+        """
+        Creates a room from a document as the server has written it. The document becomes the
+        persisted state of the room, which is only read.
+        """
+        room = construct(RoomInDb, decode_cards(document))
+        room.mark_persisted(document)
+        return room
+
+    @staticmethod
+    def _version_query(version: int):
+        """
+        Rooms stored before versioning was introduced have no version field.
+        """
+        return {'$in': [0, None]} if version == 0 else version
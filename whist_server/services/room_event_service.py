@@ -0,0 +1,108 @@
+"""Event log of rooms"""
+import datetime
+
+import pymongo
+
+from whist_server.const import ROOM_SNAPSHOT_INTERVAL
+from whist_server.database import db
+from whist_server.database.card_codec import decode_cards, encode_cards
+from whist_server.database.command import parse_command
+from whist_server.database.room import RoomInDb
+from whist_server.database.trusted import construct
+from whist_server.services.error import RoomNotFoundError
+
+
+class RoomEventService:
+    """
+    Appends the commands applied to rooms to the 'room_events' collection and writes a snapshot of
+    a room to 'room_snapshots' every ROOM_SNAPSHOT_INTERVAL commands. A room can be rebuilt from
+    its latest snapshot and the commands recorded after it.
+    Commands that are not deterministic, like dealing cards, always trigger a snapshot, because
+    replaying them would not lead to the same room.
+    """
+    _instance = None
+    _events = None
+    _snapshots = None
+
+    def __new__(cls):
+        """Creates a new instance of this service singleton."""
+        if cls._instance is None:
+            cls._instance = super(RoomEventService, cls).__new__(cls)
+            cls._events = db.room_events
+            cls._snapshots = db.room_snapshots
+        return cls._instance
+
+    @classmethod
+    async def append(cls, room: RoomInDb) -> None:
+        """
+        Writes the pending commands of a room to the event log and, if required, a snapshot.
+        :param room: whose pending commands are written
+        :return: None
+        """
+        entries = room.pending_log
+        if not entries:
+            return
+        now = datetime.datetime.utcnow()
+        await cls._events.insert_many([{'room_id': str(room.id), 'sequence': sequence,
+                                        'command': command.name, 'data': command.dict(),
+                                        'created_at': now}
+                                       for sequence, command in entries])
+        first_sequence = entries[0][0]
+        if any(not command.deterministic for _, command in entries) or \
+                (first_sequence - 1) // ROOM_SNAPSHOT_INTERVAL != \
+                room.log_sequence // ROOM_SNAPSHOT_INTERVAL:
+            await cls.snapshot(str(room.id), room)
+        room.clear_log()
+
+    @classmethod
+    async def snapshot(cls, room_id: str, room: RoomInDb) -> None:
+        """
+        Writes the current state of a room as snapshot.
+        :param room_id: ID of the room
+        :param room: to be written
+        :return: None
+        """
+        document = encode_cards(room.dict(exclude={'id', 'version'}))
+        await cls._snapshots.insert_one({'room_id': room_id, 'sequence': room.log_sequence,
+                                         'room': document,
+                                         'created_at': datetime.datetime.utcnow()})
+
+    @classmethod
+    async def delete(cls, room_id: str) -> None:
+        """
+        Deletes the event log and the snapshots of a room.
+        :param room_id: ID of the room
+        :return: None
+        """
+        await cls._events.delete_many({'room_id': room_id})
+        await cls._snapshots.delete_many({'room_id': room_id})
+
+    @classmethod
+    async def rebuild(cls, room_id: str) -> RoomInDb:
+        """
+        Rebuilds a room from its latest snapshot and the commands recorded after it.
+        :param room_id: ID of the room
+        :return: the room. Raises RoomNotFoundError if there is no snapshot of the room.
+        """
+        snapshot = await cls._snapshots.find_one({'room_id': room_id},
+                                                 sort=[('sequence', pymongo.DESCENDING)])
+        if snapshot is None:
+            raise RoomNotFoundError(room_id)
+        cursor = cls._events.find({'room_id': room_id, 'sequence': {'$gt': snapshot['sequence']}},
+                                  sort=[('sequence', pymongo.ASCENDING)])
+        return cls.replay(snapshot, await cursor.to_list(length=None))
+
+    @staticmethod
+    def replay(snapshot: dict, events) -> RoomInDb:
+        """
+        Applies recorded commands to a snapshot.
+        :param snapshot: document of the 'room_snapshots' collection
+        :param events: documents of the 'room_events' collection recorded after the snapshot in
+        ascending order
+        :return: the room
+        """
+        room = construct(RoomInDb, {**decode_cards(snapshot['room']), '_id': snapshot['room_id']})
+        for event in events:
+            parse_command(event['command'], event['data']).apply(room)
+        room.clear_log()
+        return room
@@ -1,6 +1,8 @@
 """User database connector."""
+from pymongo.errors import DuplicateKeyError
 
 from whist_server.database import db
+from whist_server.database.trusted import construct
 from whist_server.database.user import UserInDb
 from whist_server.services.error import UserNotFoundError, UserExistsError
 
@@ -20,40 +22,41 @@ class UserDatabaseService:
         return cls._instance
 
     @classmethod
-    def add(cls, user: UserInDb) -> str:
+    async def add(cls, user: UserInDb) -> str:
         """
-        Adds an user to the database.
+        Adds an user to the database. The unique index on the username rejects duplicates
+        atomically.
         :param user: to be added
-        :return: The id of the successful added user.
+        :return: The id of the successful added user. Raises UserExistsError if the username is
+        taken.
         """
         try:
-            _ = cls.get(user.username)
-        except UserNotFoundError:
-            user_id = cls._users.insert_one(user.dict(exclude={'id'}))
-            return str(user_id.inserted_id)
-        else:
-            raise UserExistsError(f'User with username: "{user.username}" already exists.')
+            user_id = await cls._users.insert_one(user.dict(exclude={'id'}))
+        except DuplicateKeyError as key_error:
+            raise UserExistsError(f'User with username: "{user.username}" already exists.') \
+                from key_error
+        return str(user_id.inserted_id)
 
     @classmethod
-    def get(cls, username: str) -> UserInDb:
+    async def get(cls, username: str) -> UserInDb:
         """
         Gets the user querying the username.
         :param username: of the user
         :return: the user database object
         """
-        user = cls._users.find_one({'username': username})
+        user = await cls._users.find_one({'username': username})
         if user is None:
             raise UserNotFoundError(username=username)
-        return UserInDb(**user)
+        return construct(UserInDb, user)
 
     @classmethod
-    def get_from_github(cls, github_id: str) -> UserInDb:
+    async def get_from_github(cls, github_id: str) -> UserInDb:
         """
         Similar to 'get(username)', but queries by github username instead of application username.
         :param github_id: GitHub id of the user
         :return: the user database object
         """
-        user = cls._users.find_one({'github_id': github_id})
+        user = await cls._users.find_one({'github_id': github_id})
         if user is None:
             raise UserNotFoundError()
-        return UserInDb(**user)
+        return construct(UserInDb, user)
@@ -0,0 +1,308 @@
+"""Distribution of events between the server processes"""
+import abc
+import asyncio
+import contextlib
+import fcntl
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+import orjson
+
+from whist_server.web_socket.events.event import Event, parse_event
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, Event], Awaitable[None]]
+
+
+def encode_message(room_id: str, event: Event) -> bytes:
+    """
+    Encodes an event of a room as one line.
+    :param room_id: ID of the room
+    :param event: to be encoded
+    :return: UTF-8 encoded JSON terminated by a newline
+    """
+    return orjson.dumps({'room_id': room_id, 'name': event.name, 'event': event.dict()}) + b'\n'
+
+
+def decode_message(message: bytes) -> tuple[str, Event]:
+    """
+    Reverts 'encode_message'.
+    :param message: one line
+    :return: the ID of the room and the event
+    """
+    data = orjson.loads(message)
+    return data['room_id'], parse_event(data['name'], data['event'])
+
+
+class Backplane(abc.ABC):
+    """
+    Delivers the events published by any server process to the side channels of every server
+    process.
+    """
+
+    def __init__(self, deliver: Deliver):
+        """
+        Constructor.
+        :param deliver: hands an event of a room to the side channels of this process
+        """
+        self._deliver = deliver
+
+    async def start(self) -> None:
+        """
+        Connects to the other server processes.
+        :return: None
+        """
+
+    async def stop(self) -> None:
+        """
+        Disconnects from the other server processes.
+        :return: None
+        """
+
+    @abc.abstractmethod
+    async def publish(self, room_id: str, event: Event) -> None:
+        """
+        Publishes an event of a room to all server processes including this one.
+        :param room_id: ID of the room
+        :param event: to be published
+        :return: None
+        """
+
+
+class MemoryBackplane(Backplane):
+    """
+    Delivers events only within this process. Suits a server with a single process.
+    """
+
+    async def publish(self, room_id: str, event: Event) -> None:
+        """
+        Delivers an event of a room to the side channels of this process.
+        :param room_id: ID of the room
+        :param event: to be delivered
+        :return: None
+        """
+        await self._deliver(room_id, event)
+
+
+class FakeBackplane(Backplane):
+    """
+    Backplane for tests. All fakes sharing a network behave like the processes of one server.
+    Events are encoded and decoded on their way like between processes. Published events are
+    recorded.
+    """
+
+    def __init__(self, deliver: Deliver, network: Optional[list['FakeBackplane']] = None):
+        """
+        Constructor.
+        :param deliver: hands an event of a room to the side channels of this fake process
+        :param network: the fakes to be connected with. Defaults to a new network.
+        """
+        super().__init__(deliver)
+        self.published: list[tuple[str, Event]] = []
+        self._network = [] if network is None else network
+        self._network.append(self)
+
+    def join(self, deliver: Deliver) -> 'FakeBackplane':
+        """
+        Creates another fake process of the same network.
+        :param deliver: hands an event of a room to the side channels of the new fake process
+        :return: the new fake
+        """
+        return FakeBackplane(deliver, self._network)
+
+    async def stop(self) -> None:
+        """
+        Leaves the network.
+        :return: None
+        """
+        if self in self._network:
+            self._network.remove(self)
+
+    async def publish(self, room_id: str, event: Event) -> None:
+        """
+        Records an event of a room and delivers it to all fakes of the network.
+        :param room_id: ID of the room
+        :param event: to be published
+        :return: None
+        """
+        self.published.append((room_id, event))
+        message = encode_message(room_id, event)
+        for backplane in list(self._network):
+            await backplane._deliver(*decode_message(message))  # pylint: disable=protected-access
+
+
+# pylint: disable=too-many-instance-attributes
+class UnixSocketBackplane(Backplane):
+    """
+    Connects the server processes of one host, e.g. the workers of uvicorn, through a Unix socket.
+    The process holding the lock file next to the socket relays the messages of all processes,
+    the others connect to it. If the relaying process stops, another process takes over.
+    """
+
+    RECONNECT_DELAY = 0.1
+
+    def __init__(self, deliver: Deliver, path: str):
+        """
+        Constructor.
+        :param deliver: hands an event of a room to the side channels of this process
+        :param path: of the Unix socket
+        """
+        super().__init__(deliver)
+        self._path = path
+        self._lock_file = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: set[asyncio.StreamWriter] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._connecting: Optional[asyncio.Lock] = None
+        self._running = False
+
+    @property
+    def relay(self) -> bool:
+        """
+        True if this process relays the messages of all processes.
+        """
+        return self._server is not None
+
+    async def start(self) -> None:
+        """
+        Relays the messages or connects to the relaying process.
+        :return: None
+        """
+        if self._running:
+            return
+        self._running = True
+        self._connecting = asyncio.Lock()
+        await self._connect()
+
+    async def stop(self) -> None:
+        """
+        Closes all connections. A relaying process removes its socket.
+        :return: None
+        """
+        self._running = False
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        for writer in [*self._peers, self._writer]:
+            if writer is not None:
+                writer.close()
+        self._peers.clear()
+        self._writer = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._path)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def publish(self, room_id: str, event: Event) -> None:
+        """
+        Sends an event of a room to the relaying process, which delivers it to every process.
+        :param room_id: ID of the room
+        :param event: to be published
+        :return: None
+        """
+        if not self._running:
+            await self.start()
+        message = encode_message(room_id, event)
+        for _ in range(2):
+            if not self.relay and (self._writer is None or self._writer.is_closing()):
+                await self._connect()
+            if self.relay:
+                await self._relay(message)
+                return
+            try:
+                self._writer.write(message)
+                await self._writer.drain()
+                return
+            except ConnectionError:
+                self._writer.close()
+        raise ConnectionError(f'Could not publish to the backplane at {self._path}')
+
+    async def _connect(self) -> None:
+        async with self._connecting:
+            while self._running and not self.relay and \
+                    (self._writer is None or self._writer.is_closing()):
+                if self._acquire_lock():
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(self._path)
+                    self._server = await asyncio.start_unix_server(self._accept, path=self._path)
+                    return
+                try:
+                    reader, self._writer = await asyncio.open_unix_connection(self._path)
+                except (FileNotFoundError, ConnectionError):
+                    await asyncio.sleep(self.RECONNECT_DELAY)
+                    continue
+                self._listener = asyncio.get_running_loop().create_task(self._listen(reader))
+
+    def _acquire_lock(self) -> bool:
+        if self._lock_file is None:
+            # The lock is held for the lifetime of the backplane, it is closed in 'stop'.
+            # pylint: disable=consider-using-with
+            self._lock_file = open(f'{self._path}.lock', 'a', encoding='utf-8')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    async def _listen(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            message = await reader.readline()
+            if not message:
+                break
+            await self._deliver_message(message)
+        self._writer.close()
+        if self._running:
+            self._listener = None
+            await self._connect()
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._peers.add(writer)
+        try:
+            while True:
+                message = await reader.readline()
+                if not message:
+                    break
+                await self._relay(message)
+        except (ConnectionError, asyncio.CancelledError):
+            # The connection ends either way, cancelling its handler must not be reported.
+            pass
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    async def _relay(self, message: bytes) -> None:
+        for writer in list(self._peers):
+            try:
+                writer.write(message)
+            except ConnectionError:
+                self._peers.discard(writer)
+        await self._deliver_message(message)
+
+    async def _deliver_message(self, message: bytes) -> None:
+        try:
+            await self._deliver(*decode_message(message))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Could not deliver a message of the backplane')
+
+
+def create_backplane(kind: str, deliver: Deliver, path: str) -> Backplane:
+    """
+    Creates the backplane of the side channels.
+    :param kind: 'memory' for a single process or 'unix' for several processes of one host
+    :param deliver: hands an event of a room to the side channels of this process
+    :param path: of the Unix socket
+    :return: the backplane
+    """
+    if kind == 'memory':
+        return MemoryBackplane(deliver)
+    if kind == 'unix':
+        return UnixSocketBackplane(deliver, path)
+    raise ValueError(f'Unknown channel backplane: {kind}')
@@ -0,0 +1,107 @@
+"""Commands sent by clients over the websocket of a room"""
+import abc
+from typing import Literal
+
+import orjson
+from pydantic import BaseModel
+from whist_core.cards.card import Card
+from whist_core.user.player import Player
+
+from whist_server.database.command import NextHandCommand, PlayCardCommand, ReadyCommand, \
+    RoomCommand, UnreadyCommand
+
+
+class ClientRequest(BaseModel, abc.ABC):
+    """
+    A command of a client. The acknowledgement repeats the request ID.
+    """
+    type: str
+    request_id: str
+
+    @abc.abstractmethod
+    def command(self, player: Player) -> RoomCommand:
+        """
+        Creates the command applied to the room.
+        :param player: who sent the request
+        :return: the command
+        """
+
+
+class PlayCardRequest(ClientRequest):
+    """
+    The player plays a card in the current trick.
+    """
+    type: Literal['play_card']
+    card: Card
+
+    def command(self, player: Player) -> RoomCommand:
+        """
+        Creates the PlayCardCommand.
+        :param player: who sent the request
+        :return: the command
+        """
+        return PlayCardCommand(player=player, card=self.card)
+
+
+class ReadyRequest(ClientRequest):
+    """
+    The player marks themself ready.
+    """
+    type: Literal['ready']
+
+    def command(self, player: Player) -> RoomCommand:
+        """
+        Creates the ReadyCommand.
+        :param player: who sent the request
+        :return: the command
+        """
+        return ReadyCommand(player=player)
+
+
+class UnreadyRequest(ClientRequest):
+    """
+    The player marks themself unready.
+    """
+    type: Literal['unready']
+
+    def command(self, player: Player) -> RoomCommand:
+        """
+        Creates the UnreadyCommand.
+        :param player: who sent the request
+        :return: the command
+        """
+        return UnreadyCommand(player=player)
+
+
+class NextHandRequest(ClientRequest):
+    """
+    The next hand is dealt.
+    """
+    type: Literal['next_hand']
+
+    def command(self, player: Player) -> RoomCommand:
+        """
+        Creates the NextHandCommand.
+        :param player: who sent the request
+        :return: the command
+        """
+        return NextHandCommand()
+
+
+REQUESTS: dict[str, type[ClientRequest]] = {
+    'play_card': PlayCardRequest, 'ready': ReadyRequest, 'unready': UnreadyRequest,
+    'next_hand': NextHandRequest
+}
+
+
+def parse_request(message: str) -> ClientRequest:
+    """
+    Parses and validates a command sent by a client.
+    :param message: JSON object with the type of the request, its ID and its arguments
+    :return: the request. Raises ValueError if the message is not a valid request.
+    """
+    data = orjson.loads(message)
+    if not isinstance(data, dict) or not isinstance(data.get('type'), str) or \
+            data['type'] not in REQUESTS:
+        raise ValueError(f'Unknown request: {message}')
+    return REQUESTS[data['type']](**data)
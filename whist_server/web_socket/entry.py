@@ -1,16 +1,32 @@
 """Routes of the websocket communication."""
-from fastapi import APIRouter, Depends, WebSocket
+import asyncio
+import functools
+import time
+from typing import Awaitable, Callable, Optional
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
 from whist_core.error.table_error import PlayerNotJoinedError
+from whist_core.user.player import Player
 
+from whist_server.const import WEBSOCKET_HEARTBEAT_INTERVAL, WEBSOCKET_IDLE_TIMEOUT
 from whist_server.services.authentication import get_current_user
 from whist_server.services.channel_service import ChannelService
 from whist_server.services.error import RoomNotFoundError
+from whist_server.services.metrics_service import MetricsService
+from whist_server.services.room_actor_service import RoomActorService
 from whist_server.services.room_db_service import RoomDatabaseService
 from whist_server.services.user_db_service import UserDatabaseService
+from whist_server.web_socket.client_request import parse_request
+from whist_server.web_socket.events.event import CommandAckEvent, HeartbeatEvent, \
+    RoomSnapshotEvent
 from whist_server.web_socket.subscriber import Subscriber
 
 router = APIRouter()
 
+PING = 'ping'
+PONG = 'pong'
+HEARTBEAT = HeartbeatEvent().encode().decode()
+
 
 @router.websocket('/ping')
 async def ping(websocket: WebSocket):
@@ -19,35 +35,120 @@ async def ping(websocket: WebSocket):
     :param websocket: communication end point of the client
     """
     await websocket.accept()
-    await websocket.send_text('pong')
+    await websocket.send_text(PONG)
 
 
 @router.websocket('/room/{room_id}')
-async def subscribe_room(websocket: WebSocket, room_id: str,
+# pylint: disable=too-many-arguments
+async def subscribe_room(websocket: WebSocket, room_id: str, last_sequence: Optional[int] = None,
                          channel_service: ChannelService = Depends(ChannelService),
                          room_service: RoomDatabaseService = Depends(RoomDatabaseService),
-                         user_service: UserDatabaseService = Depends(UserDatabaseService)):
+                         user_service: UserDatabaseService = Depends(UserDatabaseService),
+                         actor_service: RoomActorService = Depends(RoomActorService)):
     """
-    Clients requests to subscribe to room's side channel.
+    Clients requests to subscribe to room's side channel. The connection is kept until the
+    client disconnects or is idle for WEBSOCKET_IDLE_TIMEOUT seconds. The server sends a
+    HeartbeatEvent after WEBSOCKET_HEARTBEAT_INTERVAL seconds without a message of the client,
+    which the client answers with 'pong', so clients that only listen have to answer as well. A
+    client may send 'ping' to get a HeartbeatEvent. Apart from the initial '200', every frame of
+    the server is an event. The client is detached from the side channel when the connection
+    ends.
+    A reconnecting client passes the sequence number of the last event it received and gets the
+    events it missed. If they are no longer buffered, it gets a snapshot of the room followed by
+    the newer events. Clients ignore events whose sequence number they have already seen.
+    Clients send commands as JSON objects, e.g. {"type": "play_card", "request_id": "1",
+    "card": {...}}, see 'client_request'. They are applied like the HTTP actions and answered
+    with a CommandAckEvent carrying the request ID after the events of the command.
     :param websocket: communication end point of the client. The body of the request must contain
     the bare string token.
     :param room_id: ID of the room to which should be subscribed
+    :param last_sequence: query parameter, sequence number of the last event the client received
     :param channel_service: handles the websocket management.
     :param room_service: handles all request to the db regarding rooms.
     :param user_service: handles all request to the db regarding users.
+    :param actor_service: applies the commands of the client to the room.
     :return: Sends response to the websockets. No return.
     """
     await websocket.accept()
     try:
         token = await websocket.receive_text()
         player = await get_current_user(token, user_service)
-        subscriber = Subscriber(websocket)
-        room = room_service.get(room_id)
+        subscriber = Subscriber(websocket, player)
+        room = await room_service.get(room_id)
         if not room.has_joined(player):
             raise PlayerNotJoinedError()
         channel_service.attach(room_id, subscriber)
-        await websocket.send_text('200')
+        # Queued like the events, so the writer of the client is the only one sending.
+        subscriber.put('200')
+        if last_sequence is not None:
+            _resume(channel_service, room_id, subscriber, room, last_sequence)
     except RoomNotFoundError:
         await websocket.close(reason='Room not found')
+        return
     except PlayerNotJoinedError:
         await websocket.close(reason='User not joined')
+        return
+    execute = functools.partial(_execute, room_id=room_id, player=player, subscriber=subscriber,
+                                actor_service=actor_service, room_service=room_service,
+                                channel_service=channel_service)
+    try:
+        await _listen(websocket, subscriber, execute)
+    except WebSocketDisconnect:
+        MetricsService().increment('websocket_disconnects')
+    finally:
+        channel_service.detach(room_id, subscriber)
+
+
+def _resume(channel_service: ChannelService, room_id: str, subscriber: Subscriber, room,
+            last_sequence: int) -> None:
+    if channel_service.resume(room_id, subscriber, last_sequence, room.event_sequence):
+        MetricsService().increment('websocket_resumes')
+        return
+    MetricsService().increment('websocket_snapshots')
+    snapshot = RoomSnapshotEvent.from_room(room, subscriber.player)
+    subscriber.put(snapshot.encode().decode(), snapshot.name)
+    channel_service.resume(room_id, subscriber, room.event_sequence, room.event_sequence)
+
+
+# pylint: disable=too-many-arguments
+async def _execute(message: str, room_id: str, player: Player, subscriber: Subscriber,
+                   actor_service: RoomActorService, room_service: RoomDatabaseService,
+                   channel_service: ChannelService) -> None:
+    sequence = 0
+    try:
+        request = parse_request(message)
+    except ValueError:
+        ack = CommandAckEvent(ok=False, error='InvalidRequest')
+    else:
+        MetricsService().increment('websocket_commands')
+        command = request.command(player)
+        try:
+            result = await actor_service.submit(room_id, command, room_service, channel_service)
+        except Exception as error:  # pylint: disable=broad-except
+            ack = CommandAckEvent(request_id=request.request_id, ok=False,
+                                  error=error.__class__.__name__)
+        else:
+            ack = CommandAckEvent(request_id=request.request_id, ok=True, result=result)
+            sequence = max((event.sequence for event in command.events), default=0)
+    channel_service.acknowledge(room_id, subscriber, ack, sequence)
+
+
+async def _listen(websocket: WebSocket, subscriber: Subscriber,
+                  execute: Callable[[str], Awaitable[None]]) -> None:
+    last_message = time.monotonic()
+    while not subscriber.closed:
+        try:
+            message = await asyncio.wait_for(websocket.receive_text(),
+                                             WEBSOCKET_HEARTBEAT_INTERVAL)
+        except asyncio.TimeoutError:
+            if time.monotonic() - last_message >= WEBSOCKET_IDLE_TIMEOUT:
+                MetricsService().increment('websocket_idle_timeouts')
+                subscriber.close(code=status.WS_1001_GOING_AWAY)
+                return
+            subscriber.put(HEARTBEAT, HeartbeatEvent.__name__)
+            continue
+        last_message = time.monotonic()
+        if message == PING:
+            subscriber.put(HEARTBEAT, HeartbeatEvent.__name__)
+        elif message != PONG:
+            await execute(message)
@@ -1,15 +1,27 @@
 """Abstraction of events"""
+from typing import Any, Optional
 
+import orjson
 from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
 from whist_core.cards.card import Card
+from whist_core.cards.card_container import OrderedCardContainer, UnorderedCardContainer
 from whist_core.game.player_at_table import PlayerAtTable
 from whist_core.user.player import Player
 
+from whist_server.database.room import RoomInDb, RoomInfo
+from whist_server.database.trusted import construct
+
 
 class Event(BaseModel):
     """
     It is sent via the websocket upon Game State changes.
+    sequence: number of the event within its room, starting at 1. It is assigned when the
+    command causing the event is applied. Zero if it has not been assigned.
+    recipient: username of the only player who receives the event. Everyone if None.
     """
+    sequence: int = 0
+    recipient: Optional[str] = None
 
     @property
     def name(self):
@@ -18,6 +30,16 @@ class Event(BaseModel):
         """
         return self.__class__.__name__
 
+    def encode(self) -> bytes:
+        """
+        Encodes the event as websocket message.
+        :return: UTF-8 encoded JSON with the name of the event, its sequence number and the event
+        itself
+        """
+        return orjson.dumps({'name': self.name, 'sequence': self.sequence,
+                             'event': self.dict(exclude={'sequence', 'recipient'})},
+                            default=pydantic_encoder)
+
 
 class CardPlayedEvent(Event):
     """
@@ -27,6 +49,35 @@ class CardPlayedEvent(Event):
     player: Player
 
 
+class CommandAckEvent(Event):
+    """
+    It is sent to the client that sent a command over the websocket, after the events of the
+    command.
+    request_id: ID of the request of the client
+    ok: if the command has been applied
+    result: of the command if it has been applied
+    error: class name of the error if the command failed
+    """
+    request_id: Optional[str] = None
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+
+
+class HandDealtEvent(Event):
+    """
+    It is sent to a player only, when a hand has been dealt. It contains the player's cards.
+    """
+    hand: UnorderedCardContainer
+
+
+class HeartbeatEvent(Event):
+    """
+    It is sent to a websocket client that has not sent a message for a while. The client has to
+    answer with 'pong', or any other message, to stay connected.
+    """
+
+
 class NextHandEvent(Event):
     """
     It is send when the next hand has been started.
@@ -53,6 +104,37 @@ class RoomStartedEvent(Event):
     """
 
 
+class RoomArchivedEvent(Event):
+    """
+    It is sent when an idle room has been archived. The connections to the room are closed
+    afterwards.
+    """
+
+
+class RoomSnapshotEvent(Event):
+    """
+    It is sent to a reconnecting client that missed more events than are buffered. It carries
+    the state of the room after the event with its sequence number and the client's hand.
+    """
+    room: RoomInfo
+    stack: Optional[OrderedCardContainer] = None
+    hand: Optional[UnorderedCardContainer] = None
+
+    @staticmethod
+    def from_room(room: RoomInDb, player: Player) -> 'RoomSnapshotEvent':
+        """
+        Creates the snapshot of a room for one of its players.
+        :param room: of which the snapshot is created
+        :param player: who receives the snapshot
+        :return: the snapshot with the sequence number of the last event of the room
+        """
+        if not room.table.started:
+            return RoomSnapshotEvent(sequence=room.event_sequence, room=room.get_info())
+        return RoomSnapshotEvent(sequence=room.event_sequence, room=room.get_info(),
+                                 stack=room.current_trick().stack,
+                                 hand=room.get_player(player).hand)
+
+
 class TrickDoneEvent(Event):
     """
     It is sent when a trick is done.
@@ -64,3 +146,21 @@ class TrickStartedEvent(Event):
     """
     It is sent when a trick has been started.
     """
+
+
+EVENTS: dict[str, type[Event]] = {
+    event.__name__: event for event in [CardPlayedEvent, CommandAckEvent, HandDealtEvent,
+                                        HeartbeatEvent, NextHandEvent, PlayerJoinedEvent,
+                                        PlayerLeftEvent, RoomArchivedEvent, RoomSnapshotEvent,
+                                        RoomStartedEvent, TrickDoneEvent, TrickStartedEvent]
+}
+
+
+def parse_event(name: str, data: dict) -> Event:
+    """
+    Restores an event published by a server process.
+    :param name: class name of the event
+    :param data: dictionary of the event
+    :return: the event
+    """
+    return construct(EVENTS[name], data)
@@ -1,22 +1,50 @@
 """Handles push of events"""
+import logging
+from collections import deque
+from typing import Optional
 
+from whist_server.const import CHANNEL_REPLAY_BUFFER_SIZE
+from whist_server.services.metrics_service import MetricsService
 from whist_server.web_socket.events.event import Event
 from whist_server.web_socket.subscriber import Subscriber
 
+logger = logging.getLogger(__name__)
+
 
 class SideChannel:
     """
-    Connection to a client that pushes event regarding Game State Changes.
+    Connection to the clients of one room that pushes events regarding Game State Changes.
+    An event is encoded once per notification and the same frame is queued for every client.
+    Each client writes its queue on its own, so a slow client cannot stall the room. Clients
+    that are closed, because they could not keep up, are removed.
+    The most recent events are buffered, so a reconnecting client can receive the events it
+    missed. Events with a recipient are only sent to the clients of that player.
+    The response to a command of a client is held back until the events of the command have been
+    queued, since they may arrive later through the backplane.
     """
-    subscriber = []
+
+    def __init__(self, replay_size: int = CHANNEL_REPLAY_BUFFER_SIZE):
+        """
+        Constructor.
+        :param replay_size: amount of recent events that are buffered
+        """
+        self._subscribers: set[Subscriber] = set()
+        self._recent: deque[tuple[int, str, str, Optional[str]]] = deque(maxlen=replay_size)
+        self._delivered = 0
+        self._acks: list[tuple[int, Subscriber, str, str]] = []
+
+    def __len__(self) -> int:
+        """Amount of clients."""
+        return len(self._subscribers)
 
     def attach(self, subscriber: Subscriber) -> None:
         """
-        Adds a client to this channel.
+        Adds a client to this channel. Its writer is started in the running event loop.
         :param subscriber: client that wants to listen on the stream.
         :return: None.
         """
-        self.subscriber.append(subscriber)
+        self._subscribers.add(subscriber)
+        subscriber.start()
 
     def remove(self, subscriber: Subscriber) -> None:
         """
@@ -24,13 +52,97 @@ class SideChannel:
         :param subscriber: client that does not want to listen on the stream anymore.
         :return: None.
         """
-        self.subscriber.remove(subscriber)
+        self._subscribers.discard(subscriber)
+        self._acks = [entry for entry in self._acks if entry[1] is not subscriber]
+
+    def close(self, code: int) -> None:
+        """
+        Removes all clients and closes them after their queued frames have been written.
+        :param code: websocket close code sent to the clients
+        :return: None
+        """
+        for subscriber in self._subscribers:
+            subscriber.finish(code)
+        self._subscribers.clear()
+
+    def resume(self, subscriber: Subscriber, last_sequence: int, room_sequence: int) -> bool:
+        """
+        Queues the buffered events a client missed.
+        :param subscriber: client that has received the events up to last_sequence
+        :param last_sequence: sequence number of the last event the client received
+        :param room_sequence: sequence number of the last event of the room known to the caller
+        :return: True if all missed events have been queued, False if some are not buffered
+        """
+        latest = max(room_sequence, self._recent[-1][0]) if self._recent else room_sequence
+        if last_sequence >= latest:
+            return True
+        if not self._recent or self._recent[0][0] > last_sequence + 1 or \
+                self._recent[-1][0] < latest:
+            return False
+        for sequence, name, frame, recipient in self._recent:
+            if sequence > last_sequence and subscriber.receives(recipient):
+                subscriber.put(frame, name)
+        return True
+
+    def acknowledge(self, subscriber: Subscriber, frame: str, name: str, sequence: int) -> bool:
+        """
+        Queues the response to a command of a client once the events of the command up to the
+        given sequence number have been queued.
+        :param subscriber: client that sent the command
+        :param frame: the encoded response
+        :param name: of the response event
+        :param sequence: sequence number of the last event of the command, 0 if there is none
+        :return: True if the response has been queued, False if it waits for the events
+        """
+        if sequence <= self._delivered and \
+                not any(held is subscriber for _, held, _, _ in self._acks):
+            subscriber.put(frame, name)
+            return True
+        self._acks.append((sequence, subscriber, frame, name))
+        return False
+
+    def release(self, subscriber: Subscriber) -> None:
+        """
+        Queues the held back responses of a client even if the events of their commands have not
+        arrived.
+        :param subscriber: client whose responses are queued
+        :return: None
+        """
+        self._release(lambda sequence, held: held is subscriber)
+
+    def queue_depths(self) -> list[int]:
+        """
+        Amount of queued frames of every client.
+        """
+        return [len(subscriber) for subscriber in self._subscribers]
 
     async def notify(self, event: Event) -> None:
         """
-        Sends one event to all client that have subscribed.
+        Queues one event for all client that have subscribed and buffers it.
         :param event: Event to be sent to all clients.
         :return: None
         """
-        for subscriber in self.subscriber:
-            await subscriber.send(event)
+        frame = event.encode().decode()
+        if event.sequence > 0:
+            self._recent.append((event.sequence, event.name, frame, event.recipient))
+            self._delivered = max(self._delivered, event.sequence)
+        for subscriber in list(self._subscribers):
+            if not subscriber.receives(event.recipient):
+                continue
+            if not subscriber.put(frame, event.name):
+                logger.info('Removed a client that could not receive %s', event.name)
+                self.remove(subscriber)
+                MetricsService().increment('channel_subscribers_removed')
+        if self._acks:
+            self._release(lambda sequence, _: sequence <= self._delivered)
+
+    def _release(self, due) -> None:
+        # Responses of one client stay in the order of its commands.
+        waiting = set()
+        for entry in list(self._acks):
+            sequence, subscriber, frame, name = entry
+            if subscriber in waiting or not due(sequence, subscriber):
+                waiting.add(subscriber)
+                continue
+            self._acks.remove(entry)
+            subscriber.put(frame, name)
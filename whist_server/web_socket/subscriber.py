@@ -1,27 +1,229 @@
 """Client abstraction"""
+import asyncio
+import contextlib
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
 from fastapi import WebSocket
+from whist_core.user.player import Player
 
+from whist_server.const import CHANNEL_SEND_TIMEOUT, SUBSCRIBER_OVERFLOW, SUBSCRIBER_QUEUE_SIZE
+from whist_server.services.metrics_service import MetricsService
 from whist_server.web_socket.events.event import Event
 
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = 'drop_oldest'
+COALESCE = 'coalesce'
+DISCONNECT = 'disconnect'
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+# Close code 'Try Again Later' of RFC 6455 sent to clients that could not keep up.
+SLOW_CONSUMER_CLOSE_CODE = 1013
 
-# pylint: disable=too-few-public-methods
+
+# pylint: disable=too-many-instance-attributes
 class Subscriber:
     """
-    A subscriber represents one client.
+    A subscriber represents one client of a player. Frames are queued and written to the client
+    by a writer task of the event loop that accepted the client, so a slow client only delays
+    itself.
+    If the queue is full, the overflow policy decides:
+    'drop_oldest' drops the oldest frame, 'coalesce' drops the oldest frame of the same event or
+    else the oldest frame, and 'disconnect' closes the client, which has to resynchronise.
+    A client that does not receive a frame within the send timeout is closed as well.
     """
 
-    def __init__(self, connection: WebSocket):
+    # pylint: disable=too-many-arguments
+    def __init__(self, connection: WebSocket, player: Optional[Player] = None,
+                 queue_size: int = SUBSCRIBER_QUEUE_SIZE, overflow: str = SUBSCRIBER_OVERFLOW,
+                 send_timeout: float = CHANNEL_SEND_TIMEOUT):
         """
         Constructor
         :param connection: Implementation of the web socket connection.
+        :param player: to whom the client belongs. Receives the events of all players if None.
+        :param queue_size: maximum amount of frames waiting to be written
+        :param overflow: policy if the queue is full, one of OVERFLOW_POLICIES
+        :param send_timeout: seconds the client may take to receive a frame
         """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Unknown overflow policy: {overflow}')
         self._connection = connection
+        self.player = player
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._send_timeout = send_timeout
+        self._queue: deque[tuple[str, str]] = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Event] = None
+        self._closing: Optional[int] = None
+        self.closed = False
+
+    def __len__(self) -> int:
+        """Amount of queued frames."""
+        return len(self._queue)
+
+    def receives(self, recipient: Optional[str]) -> bool:
+        """
+        Checks if this client may receive an event.
+        :param recipient: username of the only player who receives the event, None for everyone
+        :return: True if the event is public or addressed to the player of this client
+        """
+        if recipient is None:
+            return True
+        return self.player is not None and self.player.username == recipient
+
+    def start(self) -> None:
+        """
+        Starts the writer task in the running event loop if it is not running yet. Without a
+        running event loop, it is started by the first 'put'.
+        :return: None
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            return
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._writer = self._loop.create_task(self._write())
+        if self._queue:
+            self._wake()
+
+    def put(self, frame: str, name: str = '') -> bool:
+        """
+        Queues a frame to be written to this client. It can be called from any thread.
+        :param frame: JSON, e.g. of 'Event.encode'
+        :param name: of the event, identifies the frames that can be coalesced
+        :return: False if the client is closed and must be removed, True otherwise
+        """
+        if self.closed or self._closing is not None:
+            return False
+        with self._lock:
+            if len(self._queue) >= self._queue_size:
+                if self._overflow == DISCONNECT:
+                    self.closed = True
+                else:
+                    self._drop(name)
+            if not self.closed:
+                self._queue.append((name, frame))
+        if self.closed:
+            MetricsService().increment('subscriber_frames_dropped', len(self._queue) + 1)
+            self.close()
+            return False
+        if self._loop is None or self._loop.is_closed():
+            self.start()
+        elif self._running_in_own_loop():
+            self._wake()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)
+        return True
+
+    def close(self, code: int = SLOW_CONSUMER_CLOSE_CODE) -> None:
+        """
+        Stops writing to this client and closes its connection.
+        :param code: websocket close code sent to the client
+        :return: None
+        """
+        self.closed = True
+        self._queue.clear()
+        if self._loop is None or self._loop.is_closed():
+            return
+        if self._running_in_own_loop():
+            self._shutdown(code)
+        else:
+            self._loop.call_soon_threadsafe(self._shutdown, code)
+
+    def finish(self, code: int) -> None:
+        """
+        Closes the connection of this client after the queued frames have been written. No more
+        frames are queued. It can be called from any thread.
+        :param code: websocket close code sent to the client
+        :return: None
+        """
+        self._closing = code
+        if self._loop is None or self._loop.is_closed():
+            self.close(code)
+        elif self._running_in_own_loop():
+            self._wake()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    async def flush(self) -> None:
+        """
+        Waits until all queued frames have been written or the client has been closed.
+        :return: None
+        """
+        if self._drained is not None and not self.closed:
+            await self._drained.wait()
 
     async def send(self, event: Event) -> None:
         """
-        Sends one event to this client.
+        Sends one event to this client immediately.
         :param event: Any type of event.
         :return: None
         """
-        wrapped_event = {'name': event.name, 'event': event.dict()}
-        await self._connection.send_json(wrapped_event)
+        await self.send_frame(event.encode().decode())
+
+    async def send_frame(self, frame: str) -> None:
+        """
+        Sends an already encoded event to this client as text frame immediately. The same frame
+        can be sent to many clients.
+        :param frame: JSON, e.g. of 'Event.encode'
+        :return: None
+        """
+        await self._connection.send_text(frame)
+
+    def _drop(self, name: str) -> None:
+        index = 0
+        if self._overflow == COALESCE:
+            index = next((index for index, (queued, _) in enumerate(self._queue)
+                          if queued == name), 0)
+        del self._queue[index]
+        MetricsService().increment('subscriber_frames_dropped')
+
+    def _running_in_own_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _wake(self) -> None:
+        self._drained.clear()
+        self._wakeup.set()
+
+    def _shutdown(self, code: int) -> None:
+        self._drained.set()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._loop.create_task(self._close_connection(code))
+
+    async def _close_connection(self, code: int) -> None:
+        # The client may have disconnected already.
+        with contextlib.suppress(Exception):
+            await self._connection.close(code=code)
+
+    async def _write(self) -> None:
+        while not self.closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue and not self.closed:
+                with self._lock:
+                    _, frame = self._queue.popleft()
+                try:
+                    await asyncio.wait_for(self.send_frame(frame), self._send_timeout)
+                except Exception:  # pylint: disable=broad-except
+                    logger.info('Closed a client that could not receive a frame', exc_info=True)
+                    self.close()
+                    return
+            self._drained.set()
+            if self._closing is not None:
+                self.close(self._closing)
+                return